@@ -0,0 +1,54 @@
+"""
+Archive-scale benchmark for ChiBoardElectionsSpider._prev_meetings using a
+synthesized minutes and videos page covering many years of meetings.
+
+Run from the project root with ``python -m benchmarks.bench_chi_board_elections``
+"""
+from datetime import date, timedelta
+from timeit import timeit
+
+from scrapy.http import HtmlResponse
+from scrapy.settings import Settings
+
+from city_scrapers.spiders.chi_board_elections import ChiBoardElectionsSpider
+
+URL = "https://app.chicagoelections.com/pages/en/meeting-minutes-and-videos.aspx"
+
+
+def make_response(years):
+    """Build a page with two meetings a month, each with minutes and a video"""
+    entries = []
+    day = date(2018, 12, 28)
+    for _ in range(years * 24):
+        date_str = "{} {}, {}".format(day.strftime("%b."), day.day, day.year)
+        entries.append(
+            '<p><a href="/documents/general/BoardMeetingMinutes-{}.pdf">'
+            "Board Meeting Minutes - {}</a></p>".format(day.isoformat(), date_str)
+        )
+        entries.append(
+            '<p><a href="https://youtu.be/{}">Board Meeting Video - {}</a></p>'.format(
+                day.strftime("%Y%m%d"), date_str
+            )
+        )
+        entries.append("<p><span>\xa0</span></p>")
+        day -= timedelta(days=15)
+    body = "<html><body>{}</body></html>".format("".join(entries))
+    return HtmlResponse(url=URL, body=body.encode("utf-8"), encoding="utf-8")
+
+
+def main(number=5):
+    spider = ChiBoardElectionsSpider()
+    spider.settings = Settings(values={"CITY_SCRAPERS_ARCHIVE": True})
+    for years in (5, 20, 80):
+        response = make_response(years)
+        count = len(list(spider._prev_meetings(response)))
+        seconds = timeit(lambda: list(spider._prev_meetings(response)), number=number)
+        print(
+            "{:>3} years {:>6} meetings{:>10.2f} ms".format(
+                years, count, seconds * 1000 / number
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Memory benchmark for holding meetings from an archive crawl as Meeting items and as
+interned CompactMeeting records.
+
+Meetings are synthesized so that each one has its own copies of repeated strings,
+locations and links the way they would be when parsed from separate responses.
+
+Run from the project root with ``python -m benchmarks.bench_compact``
+"""
+import tracemalloc
+from datetime import datetime, timedelta
+from time import perf_counter
+
+from city_scrapers_core.constants import BOARD, PASSED
+from city_scrapers_core.items import Meeting
+
+from city_scrapers.compact import MeetingInterner
+
+LOCATIONS = [
+    ("Board Room", "60 E Van Buren St, 7th Floor, Chicago, IL 60605"),
+    ("Polsky Center", "1452 E 53rd St, Chicago, IL 60615"),
+    ("RTA Board Room", "175 W Jackson Blvd, Suite 1650, Chicago, IL 60604"),
+]
+
+
+def copy_str(value):
+    """Return an equal string that isn't the same object, like a parsed value"""
+    return "".join(list(value))
+
+
+def make_meeting(idx):
+    start = datetime(2000, 1, 1, 10) + timedelta(days=idx % 7000)
+    name, address = LOCATIONS[idx % len(LOCATIONS)]
+    meeting = Meeting(
+        title=copy_str("Board of Directors"),
+        description=copy_str(""),
+        classification=copy_str(BOARD),
+        start=start,
+        end=None,
+        all_day=False,
+        time_notes=copy_str("See agenda to confirm details"),
+        location={"name": copy_str(name), "address": copy_str(address)},
+        links=[
+            {
+                "href": "https://example.com/{}/agenda.pdf".format(idx),
+                "title": copy_str("Agenda"),
+            }
+        ],
+        source=copy_str("https://example.com/meetings"),
+    )
+    meeting["status"] = copy_str(PASSED)
+    meeting["id"] = "archive/{:%Y%m%d%H%M}/{}/board_of_directors".format(start, idx)
+    return meeting
+
+
+def hold_meetings(count):
+    return [make_meeting(idx) for idx in range(count)]
+
+
+def hold_compact(count):
+    interner = MeetingInterner()
+    return [interner.compact(make_meeting(idx)) for idx in range(count)]
+
+
+def measure(func, count):
+    tracemalloc.start()
+    start = perf_counter()
+    held = func(count)
+    seconds = perf_counter() - start
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return held, seconds, current
+
+
+def main(count=100000):
+    for name, func in (("Meeting", hold_meetings), ("CompactMeeting", hold_compact)):
+        held, seconds, current = measure(func, count)
+        print(
+            "{:<16}{:>8} held{:>10.1f} MB{:>10.2f} s".format(
+                name, len(held), current / 1024 / 1024, seconds
+            )
+        )
+        del held
+    records = hold_compact(count)
+    start = perf_counter()
+    for record in records:
+        record.to_meeting()
+    print("{:<16}{:>28.2f} s".format("to_meeting", perf_counter() - start))
+
+
+if __name__ == "__main__":
+    main()
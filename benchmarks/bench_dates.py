@@ -0,0 +1,70 @@
+"""
+Microbenchmark comparing city_scrapers.dates with parsing strings the way spiders did
+before, looping through strptime formats and compiling patterns on each call.
+
+Run from the project root with ``python -m benchmarks.bench_dates``
+"""
+import re
+from datetime import datetime
+from timeit import timeit
+
+from city_scrapers.dates import parse_datetime, search_date
+
+FORMATS = ("%B %d, %Y", "%B %d %Y", "%m/%d/%Y", "%m/%d/%y", "%B %d, %Y %I:%M%p")
+
+# Archive pages repeat a small set of dates many times
+VALUES = [
+    "January 17, 2019",
+    "March 5 2020",
+    "10/03/2019",
+    "4/1/20",
+    "September 12, 2018 6:30PM",
+] * 200
+
+TEXT = "Board meeting agenda for Thursday, August 1, 2019 from 10:30am-12:30pm " * 20
+
+
+def strptime_loop(value):
+    for fmt in FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+
+
+def compile_and_search(text):
+    pattern = re.compile(r"[A-Z][a-z]{2,8} \d{1,2},? \d{4}")
+    if pattern.search(text) is not None:
+        return datetime.strptime(
+            pattern.search(text).group().replace(",", ""), "%B %d %Y"
+        )
+
+
+def main(number=20):
+    results = [
+        (
+            "strptime format loop",
+            timeit(lambda: list(map(strptime_loop, VALUES)), number=number),
+        ),
+        (
+            "parse_datetime",
+            timeit(lambda: list(map(parse_datetime, VALUES)), number=number),
+        ),
+        (
+            "parse_datetime uncached",
+            timeit(
+                lambda: list(map(parse_datetime.__wrapped__, VALUES)), number=number
+            ),
+        ),
+        (
+            "compile and search",
+            timeit(lambda: compile_and_search(TEXT), number=number * 100),
+        ),
+        ("search_date", timeit(lambda: search_date(TEXT), number=number * 100)),
+    ]
+    for name, seconds in results:
+        print("{:<28}{:>10.2f} ms".format(name, seconds * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark comparing peak memory and time for filtering events from a large JSON
+calendar response with json.loads and with city_scrapers.jsonstream, using the
+chi_police fixture repeated to simulate a larger payload.
+
+Run from the project root with ``python -m benchmarks.bench_jsonstream``
+"""
+import json
+import tracemalloc
+from os.path import dirname, join
+from time import perf_counter
+
+from scrapy.http import TextResponse
+
+from city_scrapers.jsonstream import iter_json_items
+
+FIXTURE = join(dirname(dirname(__file__)), "tests", "files", "chi_police.json")
+
+
+def make_response(repeat):
+    with open(FIXTURE) as f:
+        events = json.load(f)
+    body = json.dumps(events * repeat).encode("utf-8")
+    return TextResponse(url="https://example.com", body=body, encoding="utf-8")
+
+
+def is_recent(item):
+    return item["start"] >= "2017-12-01"
+
+
+def load_all(response):
+    return [item for item in json.loads(response.text) if is_recent(item)]
+
+
+def iterate(response):
+    return [item for item in iter_json_items(response) if is_recent(item)]
+
+
+def measure(func, response):
+    # Decode the body up front so both approaches start from the same cached text
+    response.text
+    tracemalloc.start()
+    start = perf_counter()
+    count = len(func(response))
+    seconds = perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return count, seconds, peak
+
+
+def main(repeat=10):
+    response = make_response(repeat)
+    print("Payload {:.1f} MB".format(len(response.body) / 1024 / 1024))
+    for name, func in (("json.loads", load_all), ("iter_json_items", iterate)):
+        count, seconds, peak = measure(func, response)
+        print(
+            "{:<18}{:>7} items{:>10.2f} ms{:>10.1f} MB peak".format(
+                name, count, seconds * 1000, peak / 1024 / 1024
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
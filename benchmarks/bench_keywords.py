@@ -0,0 +1,113 @@
+"""
+Microbenchmark comparing city_scrapers.keywords with the chains of ``in`` checks
+spiders used for classification and status, and with a single alternation pattern.
+
+Run from the project root with ``python -m benchmarks.bench_keywords``
+"""
+import re
+from timeit import timeit
+
+from city_scrapers_core.constants import (
+    ADVISORY_COMMITTEE,
+    BOARD,
+    COMMISSION,
+    COMMITTEE,
+    NOT_CLASSIFIED,
+)
+
+from city_scrapers.keywords import STATUS_KEYWORDS, KeywordMatcher
+
+TITLES = [
+    "Board of Commissioners",
+    "Economic Development Advisory Committee",
+    "Finance Subcommittee on Litigation",
+    "Justice Advisory Council",
+    "Commission on Human Relations",
+    "Public Hearing",
+] * 200
+
+# Full text of a schedule PDF, as passed to _get_status
+TEXT = "Regular meeting of the board held at the office of the council. " * 2000
+
+CLASSIFICATIONS = KeywordMatcher(
+    [
+        (re.compile(r"a(c|dvisory) (committee|council)"), ADVISORY_COMMITTEE),
+        ("board", BOARD),
+        ("committee", COMMITTEE),
+        ("commission", COMMISSION),
+    ],
+    default=NOT_CLASSIFIED,
+)
+
+ALTERNATION = re.compile(
+    r"(?P<advisory>a(c|dvisory) (committee|council))|(?P<board>board)|"
+    r"(?P<committee>committee)|(?P<commission>commission)",
+    flags=re.IGNORECASE,
+)
+GROUP_VALUES = {
+    "advisory": ADVISORY_COMMITTEE,
+    "board": BOARD,
+    "committee": COMMITTEE,
+    "commission": COMMISSION,
+}
+STATUS_ALTERNATION = re.compile("cancel|rescheduled|postpone", flags=re.IGNORECASE)
+
+
+def if_chain(name):
+    name = name.upper()
+    if re.search(r"A(C|(DVISORY)) (COMMITTEE|COUNCIL)", name):
+        return ADVISORY_COMMITTEE
+    if "BOARD" in name:
+        return BOARD
+    if "COMMITTEE" in name:
+        return COMMITTEE
+    if "COMMISSION" in name:
+        return COMMISSION
+    return NOT_CLASSIFIED
+
+
+def alternation(name):
+    values = [GROUP_VALUES[match.lastgroup] for match in ALTERNATION.finditer(name)]
+    for value in GROUP_VALUES.values():
+        if value in values:
+            return value
+    return NOT_CLASSIFIED
+
+
+def joined_status(title, description, text):
+    meeting_text = " ".join([title, description, text]).lower()
+    return any(word in meeting_text for word in ["cancel", "rescheduled", "postpone"])
+
+
+def main(number=20):
+    results = [
+        ("if chain", timeit(lambda: list(map(if_chain, TITLES)), number=number)),
+        (
+            "alternation pattern",
+            timeit(lambda: list(map(alternation, TITLES)), number=number),
+        ),
+        (
+            "KeywordMatcher",
+            timeit(lambda: list(map(CLASSIFICATIONS.match, TITLES)), number=number),
+        ),
+        (
+            "status joined text",
+            timeit(lambda: joined_status("Board", "", TEXT), number=number * 10),
+        ),
+        (
+            "status alternation",
+            timeit(lambda: STATUS_ALTERNATION.search(TEXT), number=number * 10),
+        ),
+        (
+            "status KeywordMatcher",
+            timeit(
+                lambda: STATUS_KEYWORDS.match("Board", "", TEXT), number=number * 10
+            ),
+        ),
+    ]
+    for name, seconds in results:
+        print("{:<28}{:>10.2f} ms".format(name, seconds * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Microbenchmark for expanding meeting schedules with city_scrapers.recurrence compared
+with re-parsing the schedule text for each month the way spiders did before.
+
+Run from the project root with ``python -m benchmarks.bench_recurrence``
+"""
+import re
+from datetime import date, datetime
+from timeit import timeit
+
+from city_scrapers.recurrence import parse_recurrence
+
+TEXT = "When: 3rd Thursday of the month 6 p.m. Where: 1438 W. 63rd St."
+
+
+def parse_each_month(text, years):
+    """Match the weekday, week count and time again for every month"""
+    starts = []
+    for year in range(2020, 2020 + years):
+        for month in range(1, 13):
+            weekday = re.search(r"\d[a-z]{2} ([A-Z][a-z]+day)", text).group(1)
+            week_count = int(re.search(r"(\d)[a-z]{2} [A-Z][a-z]+day", text).group(1))
+            time_obj = datetime.strptime(
+                re.search(r"\d{1,2} ?[apm\.]{2,4}", text).group().replace(".", ""),
+                "%I %p",
+            ).time()
+            week_counter = 0
+            for day in range(1, 32):
+                try:
+                    current = date(year, month, day)
+                except ValueError:
+                    break
+                if current.strftime("%A") == weekday:
+                    week_counter += 1
+                    if week_counter == week_count:
+                        starts.append(datetime.combine(current, time_obj))
+                        break
+    return starts
+
+
+def expand(text, years):
+    return list(
+        parse_recurrence(text).between(date(2020, 1, 1), date(2019 + years, 12, 31))
+    )
+
+
+def main(number=20):
+    for years in (1, 10):
+        assert parse_each_month(TEXT, years) == expand(TEXT, years)
+        for name, func in (("parse each month", parse_each_month), ("rrule", expand)):
+            seconds = timeit(lambda: func(TEXT, years), number=number)
+            print(
+                "{:>3} years {:<20}{:>10.2f} ms".format(
+                    years, name, seconds * 1000 / number
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
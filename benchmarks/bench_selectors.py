@@ -0,0 +1,56 @@
+"""
+Microbenchmark comparing parsel with the optional lexbor selector backend and with
+only parsing a region of the page, on the largest pages in tests/files. Each run
+parses a page and runs the spider's main query. The lexbor rows require the
+selectolax package.
+
+Run from the project root with ``python -m benchmarks.bench_selectors``
+"""
+from os.path import dirname, join
+from timeit import timeit
+
+from parsel import Selector
+
+from city_scrapers.selectors import LexborSelector, extract_region, lexbor_available
+
+FILES_DIR = join(dirname(dirname(__file__)), "tests", "files")
+
+PAGES = [
+    ("chi_housing_authority_minutes.html", None, "table.table-striped tbody tr"),
+    ("chi_ssa_61.html", ".about-tabs", ".about-tabs *::text"),
+    ("chi_lsc_advisory.html", None, "#main-content p *::text"),
+    ("chi_school_community_action_council.html", None, ".smaller-headings .block"),
+    ("chi_library.html", "#content", "div.entry-content p"),
+    (
+        "il_sex_offender_management.html",
+        ".soi-article-content",
+        ".soi-article-content a",
+    ),
+]
+
+
+def main(number=10):
+    backends = [("parsel", Selector)]
+    if lexbor_available():
+        backends.append(("lexbor", LexborSelector))
+    for name, region, query in PAGES:
+        with open(join(FILES_DIR, name), encoding="utf-8") as f:
+            text = f.read()
+        for backend, selector_cls in backends:
+            runs = [(backend, lambda: selector_cls(text=text).css(query).getall())]
+            if region:
+                runs.append(
+                    (
+                        backend + " region",
+                        lambda: selector_cls(text=extract_region(text, region))
+                        .css(query)
+                        .getall(),
+                    )
+                )
+            for label, run in runs:
+                seconds = timeit(run, number=number)
+                print("{:<45}{:<16}{:>10.2f} ms".format(name, label, seconds * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import json
+import os
+
+
+class ChangeFeed:
+    """JSON lines file of change records from a :class:`MeetingWarehouse`.
+
+    Records are appended after every run, so the file holds a spider's full change
+    history in sequence order. Consumers keep track of the last sequence number they
+    processed and read only the records after it instead of re-ingesting every
+    meeting in each run's feed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def append(self, changes):
+        """Append change records to the feed, returning the number written"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        count = 0
+        with open(self.path, "a") as f:
+            for change in changes:
+                f.write(json.dumps(change, sort_keys=True) + "\n")
+                count += 1
+        return count
+
+    def read(self, since=0):
+        """Generate change records with sequence numbers greater than ``since``"""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                change = json.loads(line)
+                if change["seq"] > since:
+                    yield change
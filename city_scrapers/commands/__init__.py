@@ -0,0 +1,3 @@
+# Scrapy only loads commands from one COMMANDS_MODULE, so commands from
+# city_scrapers_core are subclassed here to keep them available alongside project
+# commands
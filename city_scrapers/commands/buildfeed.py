@@ -0,0 +1,31 @@
+from scrapy.commands import ScrapyCommand
+from scrapy.exceptions import UsageError
+
+from city_scrapers.feeds import PartitionedFeedBuilder, latest_feed_paths
+
+
+class Command(ScrapyCommand):
+    requires_project = True
+
+    def syntax(self):
+        return "<feed_dir> <output_dir>"
+
+    def short_desc(self):
+        return (
+            "Merge the latest feed for each spider into a feed partitioned by month "
+            "and agency"
+        )
+
+    def run(self, args, opts):
+        if len(args) != 2:
+            raise UsageError()
+        feed_dir, output_dir = args
+        feed_paths = latest_feed_paths(
+            feed_dir, self.crawler_process.spider_loader.list()
+        )
+        rebuilt = PartitionedFeedBuilder(output_dir).build(feed_paths)
+        print(
+            "Merged {} feeds, rebuilt {} partitions".format(
+                len(feed_paths), len(rebuilt)
+            )
+        )
@@ -0,0 +1,41 @@
+from urllib.parse import urlparse
+
+from city_scrapers_core.commands.combinefeeds import Command as CombineFeedsCommand
+from scrapy.utils.misc import load_object
+
+from city_scrapers.feedstorage import DigestFeedStorage
+
+
+class Command(CombineFeedsCommand):
+    def get_spider_paths(self, path_list):
+        """Get a list of the most recent results for each spider, including feeds
+        that weren't stored again because they were unchanged
+        """
+        spider_paths = super().get_spider_paths(path_list)
+        storage = self.get_digest_storage()
+        if storage is None:
+            return spider_paths
+        spider_names = {path.split("/")[-1].split(".")[0] for path in spider_paths}
+        for spider_name in self.crawler_process.spider_loader.list():
+            if spider_name in spider_names:
+                continue
+            manifest = storage.load_manifest(spider_name)
+            if manifest:
+                spider_paths.append(manifest["path"])
+        return spider_paths
+
+    def get_digest_storage(self):
+        """Return a feed storage for reading manifests if FEED_URI skips storing
+        unchanged feeds, otherwise None
+        """
+        feed_uri = self.settings.get("FEED_URI")
+        storages = self.settings.getwithbase("FEED_STORAGES")
+        storage_path = storages.get(urlparse(feed_uri or "").scheme)
+        if not storage_path:
+            return None
+        storage_cls = load_object(storage_path)
+        if not issubclass(storage_cls, DigestFeedStorage):
+            return None
+        if hasattr(storage_cls, "from_settings"):
+            return storage_cls.from_settings(self.settings, feed_uri)
+        return storage_cls(feed_uri)
@@ -0,0 +1,44 @@
+from datetime import datetime
+
+from scrapy.commands import ScrapyCommand
+from scrapy.exceptions import UsageError
+
+from city_scrapers.feeds import FeedCompactor
+
+
+class Command(ScrapyCommand):
+    requires_project = True
+
+    def syntax(self):
+        return "[options] <feed_dir>"
+
+    def short_desc(self):
+        return "Compact per-run feeds into daily and monthly gzipped partitions"
+
+    def add_options(self, parser):
+        ScrapyCommand.add_options(self, parser)
+        parser.add_option(
+            "--before",
+            metavar="YYYY-MM-DD",
+            help="compact feeds from days before this date (default: today)",
+        )
+        parser.add_option(
+            "--delete-sources",
+            action="store_true",
+            help="delete per-run feeds once they've been compacted, except the latest "
+            "feed for each spider",
+        )
+
+    def run(self, args, opts):
+        if len(args) != 1:
+            raise UsageError()
+        before = None
+        if opts.before:
+            try:
+                before = datetime.strptime(opts.before, "%Y-%m-%d").date()
+            except ValueError:
+                raise UsageError("--before must be formatted as YYYY-MM-DD")
+        compacted = FeedCompactor(args[0]).compact(
+            before=before, delete_sources=opts.delete_sources
+        )
+        print("Compacted {} days".format(len(compacted)))
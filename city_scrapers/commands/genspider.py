@@ -0,0 +1,5 @@
+from city_scrapers_core.commands.genspider import Command as GenspiderCommand
+
+
+class Command(GenspiderCommand):
+    pass
@@ -0,0 +1,32 @@
+import os
+
+from scrapy.commands import ScrapyCommand
+from scrapy.exceptions import NotConfigured, UsageError
+
+from city_scrapers.extensions import StatusCollector, get_status_backend
+
+
+class Command(ScrapyCommand):
+    requires_project = True
+
+    def syntax(self):
+        return "<shard_dir>"
+
+    def short_desc(self):
+        return "Publish spider statuses recorded in shard files in one batch"
+
+    def run(self, args, opts):
+        if len(args) != 1:
+            raise UsageError()
+        try:
+            backend = get_status_backend(self.settings)
+        except NotConfigured:
+            raise UsageError("CITY_SCRAPERS_STATUS_BACKEND must be configured")
+        status_collector = StatusCollector()
+        paths = status_collector.load_shards(args[0])
+        count = len(status_collector)
+        if count > 0:
+            status_collector.publish(backend)
+        for path in paths:
+            os.remove(path)
+        print("Published statuses for {} spiders".format(count))
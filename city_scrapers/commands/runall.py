@@ -0,0 +1,17 @@
+from city_scrapers_core.commands.runall import Command as RunAllCommand
+from scrapy.exceptions import NotConfigured
+
+from city_scrapers.extensions import collector, get_status_backend
+
+
+class Command(RunAllCommand):
+    default_settings = {"CITY_SCRAPERS_STATUS_BATCH": True}
+
+    def run(self, args, opts):
+        """Run all spiders, then publish their statuses together"""
+        super().run(args, opts)
+        if len(collector) > 0:
+            try:
+                collector.publish(get_status_backend(self.settings))
+            except NotConfigured:
+                pass
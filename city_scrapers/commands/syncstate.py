@@ -0,0 +1,28 @@
+from scrapy.commands import ScrapyCommand
+from scrapy.exceptions import NotConfigured, UsageError
+
+from city_scrapers.state import download_state, get_state_backend, upload_state
+
+
+class Command(ScrapyCommand):
+    requires_project = True
+
+    def syntax(self):
+        return "<download|upload>"
+
+    def short_desc(self):
+        return "Download or upload state kept between runs, like the meeting warehouse"
+
+    def run(self, args, opts):
+        if len(args) != 1 or args[0] not in ("download", "upload"):
+            raise UsageError()
+        try:
+            backend = get_state_backend(self.settings)
+        except NotConfigured:
+            raise UsageError("CITY_SCRAPERS_STATE_BACKEND must be configured")
+        if args[0] == "download":
+            names = download_state(backend, self.settings)
+            print("Downloaded {} state files".format(len(names)))
+        else:
+            names = upload_state(backend, self.settings)
+            print("Uploaded {} state files".format(len(names)))
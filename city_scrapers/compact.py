@@ -0,0 +1,74 @@
+import sys
+
+from city_scrapers_core.items import Meeting
+
+MEETING_FIELDS = tuple(Meeting.fields)
+# Fields likely to repeat across meetings from the same spider
+INTERNED_FIELDS = ("title", "classification", "status", "time_notes", "source")
+
+
+class CompactMeeting:
+    """Memory-lean record of a meeting for holding large numbers of them at once.
+
+    Repeated strings are interned, and locations and links are stored as tuples of
+    key-value pairs shared between every record with the same values. Records are
+    converted back to :class:`Meeting` items with :meth:`to_meeting` before they're
+    returned from a spider or middleware.
+    """
+
+    __slots__ = MEETING_FIELDS
+
+    def to_meeting(self):
+        """Return a new Meeting item with its own location and link dicts"""
+        meeting = Meeting()
+        for field in MEETING_FIELDS:
+            try:
+                value = getattr(self, field)
+            except AttributeError:
+                continue
+            if field == "location" and isinstance(value, tuple):
+                value = dict(value)
+            elif field == "links" and isinstance(value, tuple):
+                value = [
+                    dict(link) if isinstance(link, tuple) else link for link in value
+                ]
+            meeting[field] = value
+        return meeting
+
+
+class MeetingInterner:
+    """Converts meetings to :class:`CompactMeeting` records, sharing locations and
+    links between every record it creates.
+    """
+
+    def __init__(self):
+        self.shared = {}
+
+    def compact(self, meeting):
+        record = CompactMeeting()
+        for field in MEETING_FIELDS:
+            if field not in meeting:
+                continue
+            value = meeting[field]
+            if field in INTERNED_FIELDS and isinstance(value, str):
+                value = sys.intern(value)
+            elif field == "location":
+                value = self._share(value)
+            elif field == "links" and isinstance(value, list):
+                value = tuple(self._share(link) for link in value)
+            setattr(record, field, value)
+        return record
+
+    def _share(self, value):
+        """Return a shared tuple of key-value pairs for a dict of strings, or the
+        original value if it can't be shared
+        """
+        if not isinstance(value, dict) or not all(
+            isinstance(v, str) or v is None for v in value.values()
+        ):
+            return value
+        pairs = tuple(
+            (sys.intern(k), sys.intern(v) if isinstance(v, str) else v)
+            for k, v in value.items()
+        )
+        return self.shared.setdefault(pairs, pairs)
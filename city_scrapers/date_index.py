@@ -0,0 +1,40 @@
+from collections import defaultdict
+from datetime import datetime
+
+
+class DateIndex:
+    """Values like documents or minutes grouped by the date they're associated with,
+    for matching them to meetings without scanning every value for each meeting.
+    """
+
+    def __init__(self):
+        self._index = defaultdict(list)
+
+    def __contains__(self, date_obj):
+        return self._key(date_obj) in self._index
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def add(self, date_obj, value):
+        """Add a value for a date or datetime"""
+        self._index[self._key(date_obj)].append(value)
+
+    def get(self, date_obj):
+        """Return all values for a date or datetime, or an empty list if there aren't
+        any
+        """
+        return self._index.get(self._key(date_obj), [])
+
+    def values(self):
+        """Iterate through all values in the index"""
+        for values in self._index.values():
+            yield from values
+
+    def _key(self, date_obj):
+        if isinstance(date_obj, datetime):
+            return date_obj.date()
+        return date_obj
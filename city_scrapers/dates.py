@@ -0,0 +1,152 @@
+import re
+from datetime import datetime, time
+from functools import lru_cache
+
+MONTHS = {
+    name: idx
+    for idx, names in enumerate(
+        [
+            ("january", "jan"),
+            ("february", "feb"),
+            ("march", "mar"),
+            ("april", "apr"),
+            ("may",),
+            ("june", "jun"),
+            ("july", "jul"),
+            ("august", "aug"),
+            ("september", "sept", "sep"),
+            ("october", "oct"),
+            ("november", "nov"),
+            ("december", "dec"),
+        ],
+        1,
+    )
+    for name in names
+}
+
+MONTH_DATE_RE = re.compile(
+    r"(?P<month>[A-Za-z]{3,9})\.?\s+(?P<day>\d{1,2})(?:st|nd|rd|th)?,?\s+"
+    r"(?P<year>\d{4})"
+)
+NUMERIC_DATE_RE = re.compile(
+    r"(?P<month>\d{1,2})(?P<sep>[/.-])(?P<day>\d{1,2})(?P=sep)(?P<year>\d{4}|\d{2})\b"
+)
+TIME_RE = re.compile(
+    r"(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?P<meridian>[AaPp])\.?\s*[Mm]\b\.?"
+)
+DATETIME_SEP_RE = re.compile(r"[\s,@]+(?:at\s+)?")
+
+
+def _year(year_str):
+    """Expand two digit years the same way as strptime's %y"""
+    year = int(year_str)
+    if len(year_str) == 2:
+        return year + (2000 if year < 69 else 1900)
+    return year
+
+
+def _match_date(match):
+    if match.re is MONTH_DATE_RE:
+        month = MONTHS.get(match.group("month").lower())
+    else:
+        month = int(match.group("month"))
+    if not month:
+        return
+    try:
+        return datetime(_year(match.group("year")), month, int(match.group("day")))
+    except ValueError:
+        return
+
+
+def _match_time(match):
+    hour = int(match.group("hour")) % 12
+    if match.group("meridian").lower() == "p":
+        hour += 12
+    try:
+        return time(hour, int(match.group("minute") or 0))
+    except ValueError:
+        return
+
+
+def _parse_us_datetime(value):
+    """Parse the most common US formats like "January 2, 2020", "Jan 2 2020 6:30 PM",
+    "1/2/20" and "01-02-2020 10am" without looping through strptime formats
+    """
+    value = value.strip()
+    for date_re in (MONTH_DATE_RE, NUMERIC_DATE_RE):
+        date_match = date_re.match(value)
+        if date_match:
+            break
+    else:
+        return
+    dt = _match_date(date_match)
+    rest = value[date_match.end() :]
+    if dt is None or not rest:
+        return dt
+    sep_match = DATETIME_SEP_RE.match(rest)
+    if not sep_match:
+        return
+    time_match = TIME_RE.fullmatch(rest[sep_match.end() :])
+    if not time_match:
+        return
+    time_obj = _match_time(time_match)
+    if time_obj:
+        return datetime.combine(dt.date(), time_obj)
+
+
+@lru_cache(maxsize=4096)
+def parse_datetime(value, formats=None):
+    """Parse a datetime from a string, returning None if it can't be parsed.
+
+    :param value: String containing only a date and optional time
+    :param formats: Optional tuple of strptime formats to try in order, otherwise common
+                    US formats like "January 2, 2020 6:30pm" and "1/2/2020" are parsed
+    :return: Naive datetime or None
+    """
+    if formats is None:
+        return _parse_us_datetime(value)
+    for fmt in formats:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+
+
+def parse_date(value, formats=None):
+    """Parse a date from a string, returning None if it can't be parsed. Accepts the
+    same arguments as :func:`parse_datetime`.
+    """
+    dt = parse_datetime(value, formats)
+    if dt is not None:
+        return dt.date()
+
+
+@lru_cache(maxsize=1024)
+def parse_time(value):
+    """Parse a time like "6:30pm", "10 a.m." or "9:00 AM", returning None if it can't
+    be parsed
+    """
+    time_match = TIME_RE.fullmatch(value.strip())
+    if time_match:
+        return _match_time(time_match)
+
+
+def search_date(text):
+    """Return the first date found in text like "January 2, 2020" or "1/2/20" as a
+    datetime, or None if there isn't one
+    """
+    for date_re in (MONTH_DATE_RE, NUMERIC_DATE_RE):
+        for date_match in date_re.finditer(text):
+            dt = _match_date(date_match)
+            if dt is not None:
+                return dt
+
+
+def search_time(text):
+    """Return the first time found in text like "6:30pm" or "10 a.m.", or None if
+    there isn't one
+    """
+    for time_match in TIME_RE.finditer(text):
+        time_obj = _match_time(time_match)
+        if time_obj is not None:
+            return time_obj
@@ -0,0 +1,357 @@
+import inspect
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytz
+from city_scrapers_core.extensions.status import (
+    FAILING,
+    RUNNING,
+    STATUS_COLOR_MAP,
+    STATUS_ICON,
+)
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
+from scrapy.utils.misc import load_object
+from twisted.internet import task
+
+logger = logging.getLogger(__name__)
+
+STATUS_DOCUMENT = "status.json"
+
+
+class StatusCollector:
+    """Outcomes of spiders run in the same process or recorded in shard files, for
+    publishing every status at once instead of one upload per spider.
+    """
+
+    def __init__(self):
+        self.outcomes = {}
+
+    def __len__(self):
+        return len(self.outcomes)
+
+    def record(self, spider_name, outcome):
+        self.outcomes[spider_name] = outcome
+
+    def write_shard(self, shard_dir, spider_name):
+        os.makedirs(shard_dir, exist_ok=True)
+        path = os.path.join(shard_dir, "{}.json".format(spider_name))
+        tmp_path = "{}.tmp".format(path)
+        with open(tmp_path, "w") as f:
+            json.dump(self.outcomes[spider_name], f, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def load_shards(self, shard_dir):
+        """Record outcomes from every shard file in a directory, returning the shard
+        paths that were loaded
+        """
+        paths = []
+        if not os.path.isdir(shard_dir):
+            return paths
+        for file_name in sorted(os.listdir(shard_dir)):
+            if not file_name.endswith(".json"):
+                continue
+            path = os.path.join(shard_dir, file_name)
+            with open(path) as f:
+                self.record(file_name[: -len(".json")], json.load(f))
+            paths.append(path)
+        return paths
+
+    def publish(self, backend):
+        """Write a status document for all recorded spiders and a badge for each of
+        them with a single batch of writes, then clear the recorded outcomes
+        """
+        document = {
+            "updated": datetime.now().isoformat()[:19],
+            "spiders": dict(sorted(self.outcomes.items())),
+        }
+        blobs = {STATUS_DOCUMENT: (json.dumps(document, sort_keys=True), "json")}
+        for spider_name, outcome in self.outcomes.items():
+            blobs["{}.svg".format(spider_name)] = (create_badge(outcome), "svg")
+        backend.write_batch(blobs)
+        self.outcomes = {}
+
+
+# Shared by every crawler in a process, so runs with multiple spiders publish once
+collector = StatusCollector()
+
+
+def create_badge(outcome):
+    return STATUS_ICON.format(
+        color=STATUS_COLOR_MAP[outcome["status"]],
+        status=outcome["status"],
+        date=outcome["date"],
+    )
+
+
+def get_status_backend(settings):
+    """Return the backend for writing statuses from the CITY_SCRAPERS_STATUS_BACKEND
+    setting, raising NotConfigured if it isn't set
+    """
+    backend_path = settings.get("CITY_SCRAPERS_STATUS_BACKEND")
+    if not backend_path:
+        raise NotConfigured
+    return load_object(backend_path).from_settings(settings)
+
+
+class BatchedStatusExtension:
+    """Scrapy extension for reporting each spider's status in batches.
+
+    Outcomes are collected instead of being written as each spider closes. If the
+    ``CITY_SCRAPERS_STATUS_SHARD_DIR`` setting is set, each spider's outcome is
+    written to a shard file there and published later with the ``publishstatus``
+    command. If ``CITY_SCRAPERS_STATUS_BATCH`` is set, like in the ``runall``
+    command, outcomes are published together once every spider has finished.
+    Otherwise each spider's badge is written when it closes.
+    """
+
+    def __init__(self, crawler, backend):
+        self.crawler = crawler
+        self.backend = backend
+        self.shard_dir = crawler.settings.get("CITY_SCRAPERS_STATUS_SHARD_DIR")
+        self.batch = crawler.settings.getbool("CITY_SCRAPERS_STATUS_BATCH")
+        self.has_error = False
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        ext = cls(crawler, get_status_backend(crawler.settings))
+        crawler.signals.connect(ext.spider_closed, signal=signals.spider_closed)
+        crawler.signals.connect(ext.spider_error, signal=signals.spider_error)
+        return ext
+
+    def spider_error(self):
+        self.has_error = True
+
+    def spider_closed(self, spider, reason):
+        """Records the spider as failing if it encountered an error or scraped zero
+        items, and as running otherwise
+        """
+        stats = self.crawler.stats
+        item_count = stats.get_value("item_scraped_count", 0)
+        status = FAILING if self.has_error or item_count == 0 else RUNNING
+        tz = pytz.timezone(spider.timezone)
+        collector.record(
+            spider.name,
+            {
+                "status": status,
+                "date": tz.localize(datetime.now()).strftime("%Y-%m-%d"),
+                "items": item_count,
+                "errors": stats.get_value("log_count/ERROR", 0),
+                "reason": reason,
+            },
+        )
+        if self.shard_dir:
+            collector.write_shard(self.shard_dir, spider.name)
+        elif not self.batch:
+            outcome = collector.outcomes.pop(spider.name)
+            self.backend.write_batch(
+                {"{}.svg".format(spider.name): (create_badge(outcome), "svg")}
+            )
+
+
+class LocalStatusBackend:
+    """Writes statuses to the local directory in the CITY_SCRAPERS_STATUS_DIR setting,
+    standing in for a blob container
+    """
+
+    def __init__(self, status_dir):
+        self.status_dir = status_dir
+
+    @classmethod
+    def from_settings(cls, settings):
+        status_dir = settings.get("CITY_SCRAPERS_STATUS_DIR")
+        if not status_dir:
+            raise NotConfigured
+        return cls(status_dir)
+
+    def write_batch(self, blobs):
+        os.makedirs(self.status_dir, exist_ok=True)
+        for name, (content, _) in blobs.items():
+            with open(os.path.join(self.status_dir, name), "w") as f:
+                f.write(content)
+
+
+class AzureStatusBackend:
+    """Writes statuses to the Azure Blob Storage container in the
+    CITY_SCRAPERS_STATUS_CONTAINER setting, uploading each batch concurrently over one
+    container client
+    """
+
+    content_types = {"json": "application/json", "svg": "image/svg+xml"}
+    max_workers = 8
+
+    def __init__(self, account_name, account_key, container):
+        from azure.storage.blob import ContainerClient
+
+        self.container_client = ContainerClient(
+            "{}.blob.core.windows.net".format(account_name),
+            container,
+            credential=account_key,
+        )
+
+    @classmethod
+    def from_settings(cls, settings):
+        container = settings.get("CITY_SCRAPERS_STATUS_CONTAINER")
+        if not container:
+            raise NotConfigured
+        return cls(
+            settings.get("AZURE_ACCOUNT_NAME"),
+            settings.get("AZURE_ACCOUNT_KEY"),
+            container,
+        )
+
+    def write_batch(self, blobs):
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for future in [
+                executor.submit(self._upload, name, content, content_type)
+                for name, (content, content_type) in blobs.items()
+            ]:
+                future.result()
+
+    def _upload(self, name, content, content_type):
+        from azure.storage.blob import ContentSettings
+
+        self.container_client.upload_blob(
+            name,
+            content,
+            content_settings=ContentSettings(
+                content_type=self.content_types[content_type], cache_control="no-cache"
+            ),
+            overwrite=True,
+        )
+
+
+class ReactorWatchdogExtension:
+    """Scrapy extension that detects synchronous work blocking the Twisted reactor for
+    longer than the ``CITY_SCRAPERS_WATCHDOG_THRESHOLD`` setting in seconds.
+
+    A looping call records each time the reactor gets a chance to run, and a
+    background thread checks that it has run recently. When the reactor has been
+    blocked for longer than the threshold, the thread captures the reactor thread's
+    stack and attributes it to the innermost spider method in it. Once the reactor
+    runs again the block is logged with its stack and counted in the
+    ``watchdog/blocked_count``, ``watchdog/blocked_seconds``,
+    ``watchdog/max_blocked_seconds`` and ``watchdog/blocked_count/<method>`` stats.
+
+    Blocks outside of spider code, like in pipelines, are only recorded by the
+    first spider running in the process so they aren't counted more than once.
+    """
+
+    running = []
+    stack_limit = 15
+
+    def __init__(self, crawler, threshold):
+        self.crawler = crawler
+        self.threshold = threshold
+        self.interval = max(threshold / 4, 0.01)
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.spider = None
+        self.spider_methods = {}
+        self.reactor_thread_id = None
+        self.last_tick = None
+        self.blocked = None
+        self.loop = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        threshold = crawler.settings.getfloat("CITY_SCRAPERS_WATCHDOG_THRESHOLD")
+        if threshold <= 0:
+            raise NotConfigured
+        ext = cls(crawler, threshold)
+        crawler.signals.connect(ext.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(ext.spider_closed, signal=signals.spider_closed)
+        return ext
+
+    def spider_opened(self, spider):
+        self.start(spider)
+        self.loop = task.LoopingCall(self.tick)
+        self.loop.start(self.interval, now=False)
+        threading.Thread(
+            target=self.watch, name="reactor-watchdog", daemon=True
+        ).start()
+
+    def spider_closed(self, spider):
+        self.tick()
+        self.stopped.set()
+        if self.loop is not None and self.loop.running:
+            self.loop.stop()
+        if self in self.running:
+            self.running.remove(self)
+
+    def start(self, spider):
+        """Start tracking the reactor in the current thread for a spider"""
+        self.spider = spider
+        self.spider_methods = {
+            inspect.unwrap(method).__code__: "{}.{}".format(type(spider).__name__, name)
+            for name, method in inspect.getmembers(
+                type(spider), predicate=inspect.isfunction
+            )
+        }
+        self.reactor_thread_id = threading.get_ident()
+        self.last_tick = time.monotonic()
+        self.running.append(self)
+
+    def tick(self):
+        """Called from the reactor, recording a block if one was detected since the
+        last tick
+        """
+        now = time.monotonic()
+        with self.lock:
+            blocked, self.blocked = self.blocked, None
+            duration = now - self.last_tick
+            self.last_tick = now
+        if blocked is not None:
+            self.record(duration, *blocked)
+
+    def watch(self):
+        while not self.stopped.wait(self.interval):
+            self.check()
+
+    def check(self):
+        """Capture the reactor thread's stack if it's been blocked for longer than the
+        threshold and a block hasn't already been captured
+        """
+        with self.lock:
+            if self.blocked is not None:
+                return
+            if time.monotonic() - self.last_tick < self.threshold:
+                return
+            frame = sys._current_frames().get(self.reactor_thread_id)
+            if frame is None:
+                return
+            self.blocked = (
+                self.get_method(frame),
+                traceback.format_stack(frame, limit=self.stack_limit),
+            )
+
+    def get_method(self, frame):
+        """Return the name of the innermost spider method in a stack, or None"""
+        while frame is not None:
+            if frame.f_code in self.spider_methods:
+                return self.spider_methods[frame.f_code]
+            frame = frame.f_back
+
+    def record(self, duration, method, stack):
+        if method is None and self.running and self.running[0] is not self:
+            return
+        method = method or "unattributed"
+        stats = self.crawler.stats
+        stats.inc_value("watchdog/blocked_count", spider=self.spider)
+        stats.inc_value("watchdog/blocked_count/{}".format(method), spider=self.spider)
+        stats.inc_value(
+            "watchdog/blocked_seconds", round(duration, 3), spider=self.spider
+        )
+        stats.max_value(
+            "watchdog/max_blocked_seconds", round(duration, 3), spider=self.spider
+        )
+        logger.warning(
+            "Reactor blocked for %.2fs in %s\n%s", duration, method, "".join(stack)
+        )
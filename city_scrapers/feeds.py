@@ -0,0 +1,403 @@
+import gzip
+import hashlib
+import heapq
+import json
+import os
+import re
+import shutil
+from collections import OrderedDict, defaultdict
+from datetime import date
+
+AGENCY_KEYS = ("cityscrapers/agency", "cityscrapers.org/agency")
+ID_KEYS = ("cityscrapers/id", "cityscrapers.org/id")
+FEED_EXTENSIONS = (".json", ".jsonl", ".json.gz", ".jsonl.gz")
+# Per-run feeds in a directory laid out like FEED_URI
+RUN_FEED_RE = re.compile(
+    r"^(?P<day>\d{4}/\d{2}/\d{2})/\d{4}/(?P<spider>[^/.]+)\.jsonl?(\.gz)?$"
+)
+
+
+def get_start(item):
+    """Return the local start of a feed item in OCD or Meeting format as a sortable
+    string without a UTC offset
+    """
+    return (item.get("start_time") or item.get("start") or "")[:19]
+
+
+def _get_extra(item, keys):
+    extras = item.get("extras") or item.get("extra") or {}
+    for key in keys:
+        if extras.get(key):
+            return extras[key]
+
+
+def get_agency(item):
+    return _get_extra(item, AGENCY_KEYS) or item.get("agency")
+
+
+def get_meeting_id(item):
+    """Return the City Scrapers ID of a feed item, which stays the same across runs"""
+    return _get_extra(item, ID_KEYS) or item.get("id")
+
+
+def slugify(value):
+    return re.sub(r"[^a-z0-9]+", "-", value.lower()).strip("-")
+
+
+def open_feed(path, mode="rt"):
+    """Open a feed file, decompressing it if it's gzipped"""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode, encoding="utf-8" if "t" in mode else None)
+    return open(path, mode)
+
+
+def iter_feed(path):
+    """Generate items from a JSON lines feed one line at a time"""
+    with open_feed(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def file_digest(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def latest_feed_paths(root, spider_names):
+    """Return a dict of spider names to the path of the latest feed for each spider
+    in a directory laid out like FEED_URI, where later runs sort after earlier ones
+    """
+    spider_names = set(spider_names)
+    feed_paths = {}
+    for dir_path, dir_names, file_names in os.walk(root):
+        dir_names.sort()
+        for file_name in file_names:
+            spider_name = file_name.split(".")[0]
+            if spider_name not in spider_names or not file_name.endswith(
+                FEED_EXTENSIONS
+            ):
+                continue
+            path = os.path.join(dir_path, file_name)
+            rel_path = os.path.relpath(path, root)
+            if rel_path > feed_paths.get(spider_name, ("", ""))[0]:
+                feed_paths[spider_name] = (rel_path, path)
+    return {spider_name: path for spider_name, (_, path) in feed_paths.items()}
+
+
+class PartitionedFeedBuilder:
+    """Builds a combined feed for all spiders, partitioned by month and agency.
+
+    Each spider's feed is split into sorted fragments for each month and agency.
+    Partitions are built by merging the fragments for a month and agency, and a feed
+    for each month is built by merging its partitions. Merges read one line at a time
+    from each input, so only one spider's feed is ever held in memory.
+
+    An index of the inputs, partitions and byte offsets of each day in the month feeds
+    is written to ``index.json``. Only partitions with inputs that changed since the
+    last build are rebuilt, along with the month feeds that contain them.
+    """
+
+    index_name = "index.json"
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+
+    def build(self, feed_paths):
+        """Update the combined feed from a dict of spider names to feed paths,
+        returning a sorted list of the partitions that were rebuilt
+        """
+        index = self.load_index()
+        spiders = {}
+        dirty = set()
+        for spider_name, path in sorted(feed_paths.items()):
+            digest = file_digest(path)
+            previous = index["spiders"].pop(spider_name, None)
+            if previous is not None:
+                if previous["digest"] == digest:
+                    spiders[spider_name] = previous
+                    continue
+                self._remove_fragments(spider_name, previous["partitions"])
+                dirty.update(previous["partitions"])
+            partitions = self._split(spider_name, path)
+            dirty.update(partitions)
+            spiders[spider_name] = {"digest": digest, "partitions": partitions}
+        # Remove partitions for spiders without a feed anymore
+        for spider_name, previous in index["spiders"].items():
+            self._remove_fragments(spider_name, previous["partitions"])
+            dirty.update(previous["partitions"])
+
+        partitions = index["partitions"]
+        for key in dirty:
+            count = self._merge_partition(key)
+            if count:
+                partitions[key] = {"path": self._partition_path(key), "count": count}
+            else:
+                partitions.pop(key, None)
+        months = index["months"]
+        for month in {key.split("/")[0] for key in dirty}:
+            keys = sorted(key for key in partitions if key.startswith(month + "/"))
+            if keys:
+                months[month] = self._merge_month(month, keys)
+            else:
+                months.pop(month, None)
+                os.remove(os.path.join(self.output_dir, "{}.jsonl".format(month)))
+
+        self.save_index(
+            {
+                "spiders": spiders,
+                "partitions": dict(sorted(partitions.items())),
+                "months": dict(sorted(months.items())),
+            }
+        )
+        return sorted(dirty)
+
+    def load_index(self):
+        path = os.path.join(self.output_dir, self.index_name)
+        if not os.path.exists(path):
+            return {"spiders": {}, "partitions": {}, "months": {}}
+        with open(path) as f:
+            return json.load(f)
+
+    def save_index(self, index):
+        path = os.path.join(self.output_dir, self.index_name)
+        tmp_path = "{}.tmp".format(path)
+        with open(tmp_path, "w") as f:
+            json.dump(index, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def _fragment_dir(self, key):
+        return os.path.join(self.output_dir, "fragments", *key.split("/"))
+
+    def _partition_path(self, key):
+        return os.path.join("partitions", *key.split("/")) + ".jsonl"
+
+    def _split(self, spider_name, path):
+        """Write sorted fragments of a spider's feed for each month and agency,
+        returning a sorted list of partition keys
+        """
+        fragments = defaultdict(list)
+        for item in iter_feed(path):
+            start = get_start(item)
+            if not start:
+                continue
+            agency = slugify(get_agency(item) or spider_name)
+            fragments["{}/{}".format(start[:7], agency)].append(
+                (start, json.dumps(item, sort_keys=True))
+            )
+        for key, lines in fragments.items():
+            fragment_dir = self._fragment_dir(key)
+            os.makedirs(fragment_dir, exist_ok=True)
+            with open(os.path.join(fragment_dir, spider_name + ".jsonl"), "w") as f:
+                for _, line in sorted(lines):
+                    f.write(line + "\n")
+        return sorted(fragments)
+
+    def _remove_fragments(self, spider_name, keys):
+        for key in keys:
+            path = os.path.join(self._fragment_dir(key), spider_name + ".jsonl")
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _merge_partition(self, key):
+        """Merge all fragments for a partition, returning the number of items"""
+        fragment_dir = self._fragment_dir(key)
+        path = os.path.join(self.output_dir, self._partition_path(key))
+        fragment_paths = []
+        if os.path.isdir(fragment_dir):
+            fragment_paths = [
+                os.path.join(fragment_dir, name)
+                for name in sorted(os.listdir(fragment_dir))
+            ]
+        if not fragment_paths:
+            shutil.rmtree(fragment_dir, ignore_errors=True)
+            if os.path.exists(path):
+                os.remove(path)
+            return 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        count = 0
+        with open(path, "w") as f:
+            for _, line in _merge_sorted(fragment_paths):
+                f.write(line)
+                count += 1
+        return count
+
+    def _merge_month(self, month, keys):
+        """Merge all partitions for a month into one feed sorted by start, returning
+        its index entry with the byte offset of the first item on each day
+        """
+        path = "{}.jsonl".format(month)
+        offsets = {}
+        count = 0
+        with open(os.path.join(self.output_dir, path), "wb") as f:
+            for start, line in _merge_sorted(
+                [
+                    os.path.join(self.output_dir, self._partition_path(key))
+                    for key in keys
+                ]
+            ):
+                offsets.setdefault(start[:10], f.tell())
+                f.write(line.encode("utf-8"))
+                count += 1
+        return {"path": path, "count": count, "offsets": offsets}
+
+
+class FeedCompactor:
+    """Rolls the per-run feeds in a directory laid out like FEED_URI into gzipped
+    partitions for each day and month.
+
+    Items are deduplicated by their City Scrapers ID, keeping the item from the latest
+    run. Partitions are written under ``compacted/daily`` and ``compacted/monthly``,
+    and a manifest of the feeds each partition was built from is written to
+    ``compacted/manifest.json`` so only days with new or changed feeds are compacted
+    again.
+    """
+
+    output_name = "compacted"
+    manifest_name = "manifest.json"
+
+    def __init__(self, root):
+        self.root = root
+        self.output_dir = os.path.join(root, self.output_name)
+
+    def compact(self, before=None, delete_sources=False):
+        """Compact feeds from days before a date (today by default), returning a
+        sorted list of the days that were compacted
+
+        :param before: Date to compact feeds before, since later runs may still add
+                       feeds for the current day
+        :param delete_sources: Whether to remove per-run feeds after compacting them.
+                               Each spider's latest feed is kept, since feeds that
+                               weren't stored again because they were unchanged
+                               still point to it in digest manifests.
+        """
+        before = (before or date.today()).strftime("%Y/%m/%d")
+        manifest = self.load_manifest()
+        day_feeds = defaultdict(list)
+        latest_feeds = {}
+        for rel_path in self._list_run_feeds():
+            match = RUN_FEED_RE.match(rel_path)
+            latest_feeds[match.group("spider")] = rel_path
+            if match.group("day") < before:
+                day_feeds[match.group("day")].append(rel_path)
+
+        compacted = []
+        for day, rel_paths in sorted(day_feeds.items()):
+            day_key = day.replace("/", "-")
+            sources = self._sources(rel_paths)
+            previous = manifest["daily"].get(day_key)
+            if previous:
+                deleted = {
+                    rel_path: digest
+                    for rel_path, digest in previous["sources"].items()
+                    if rel_path not in sources
+                }
+                if deleted:
+                    # Feeds deleted after they were compacted are only in the previous
+                    # partition, so it's included before any new feeds
+                    rel_paths = [
+                        os.path.join(self.output_name, previous["path"])
+                    ] + rel_paths
+                    sources = {**deleted, **sources}
+                if previous["sources"] == sources:
+                    continue
+            path = "daily/{}.jsonl.gz".format(day)
+            count = self._write_partition(path, rel_paths)
+            manifest["daily"][day_key] = {
+                "path": path,
+                "count": count,
+                "sources": sources,
+            }
+            compacted.append(day_key)
+
+        for month in sorted({day_key[:7] for day_key in compacted}):
+            days = sorted(key for key in manifest["daily"] if key.startswith(month))
+            path = "monthly/{}.jsonl.gz".format(month.replace("-", "/"))
+            count = self._write_partition(
+                path,
+                [
+                    os.path.join(self.output_name, manifest["daily"][day]["path"])
+                    for day in days
+                ],
+            )
+            manifest["monthly"][month] = {"path": path, "count": count, "days": days}
+
+        self.save_manifest(manifest)
+        if delete_sources:
+            keep = set(latest_feeds.values())
+            for day in day_feeds:
+                for rel_path in manifest["daily"][day.replace("/", "-")]["sources"]:
+                    if rel_path in keep:
+                        continue
+                    path = os.path.join(self.root, rel_path)
+                    if os.path.exists(path):
+                        os.remove(path)
+        return compacted
+
+    def load_manifest(self):
+        path = os.path.join(self.output_dir, self.manifest_name)
+        if not os.path.exists(path):
+            return {"daily": {}, "monthly": {}}
+        with open(path) as f:
+            return json.load(f)
+
+    def save_manifest(self, manifest):
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, self.manifest_name)
+        tmp_path = "{}.tmp".format(path)
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def _list_run_feeds(self):
+        rel_paths = []
+        for dir_path, dir_names, file_names in os.walk(self.root):
+            if dir_path == self.root and self.output_name in dir_names:
+                dir_names.remove(self.output_name)
+            for file_name in file_names:
+                rel_path = os.path.relpath(os.path.join(dir_path, file_name), self.root)
+                rel_path = rel_path.replace(os.sep, "/")
+                if RUN_FEED_RE.match(rel_path):
+                    rel_paths.append(rel_path)
+        return sorted(rel_paths)
+
+    def _sources(self, rel_paths):
+        return {
+            rel_path: file_digest(os.path.join(self.root, rel_path))
+            for rel_path in rel_paths
+        }
+
+    def _write_partition(self, path, rel_paths):
+        """Write items from feeds to a gzipped partition sorted by start, keeping only
+        the item from the last feed for each ID. Returns the number of items written.
+        """
+        items = OrderedDict()
+        for rel_path in rel_paths:
+            for item in iter_feed(os.path.join(self.root, rel_path)):
+                key = get_meeting_id(item) or json.dumps(item, sort_keys=True)
+                items.pop(key, None)
+                items[key] = item
+        full_path = os.path.join(self.output_dir, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        tmp_path = "{}.tmp".format(full_path)
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            for _, item in sorted(
+                items.items(), key=lambda pair: (get_start(pair[1]), pair[0])
+            ):
+                f.write(json.dumps(item, sort_keys=True) + "\n")
+        os.replace(tmp_path, full_path)
+        return len(items)
+
+
+def _iter_sorted_lines(path):
+    with open(path) as f:
+        for line in f:
+            yield get_start(json.loads(line)), line
+
+
+def _merge_sorted(paths):
+    """Merge sorted JSON lines files by start, yielding (start, line) tuples"""
+    yield from heapq.merge(*[_iter_sorted_lines(path) for path in paths])
@@ -0,0 +1,391 @@
+import base64
+import gzip
+import hashlib
+import io
+import json
+import os
+import shutil
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from city_scrapers_core.extensions import AzureBlobFeedStorage
+from scrapy.exceptions import NotConfigured
+from scrapy.extensions.feedexport import BlockingFeedStorage
+from twisted.internet import threads
+
+DEFAULT_BLOCK_SIZE = 4 * 1024 * 1024
+COMPRESSIONS = ("gzip", "zstd", "none")
+# Fields set to the time a feed was exported, which change even if nothing else does
+VOLATILE_FIELDS = ("updated_at",)
+
+
+def feed_digest(file):
+    """Return a digest of the items in a JSON lines feed that doesn't depend on their
+    order or on fields that change in every run. Feeds that aren't JSON lines are
+    digested as raw bytes.
+    """
+    file.seek(0)
+    item_digests = []
+    for line in file:
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError:
+            item_digests = None
+            break
+        if isinstance(item, dict):
+            for field in VOLATILE_FIELDS:
+                item.pop(field, None)
+        item_digests.append(
+            hashlib.sha1(json.dumps(item, sort_keys=True).encode("utf-8")).digest()
+        )
+    digest = hashlib.sha1()
+    if item_digests is None:
+        file.seek(0)
+        for chunk in iter(lambda: file.read(1 << 16), b""):
+            digest.update(chunk)
+    else:
+        for item_digest in sorted(item_digests):
+            digest.update(item_digest)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+class BlockSink(io.RawIOBase):
+    """Writable stream that stages bytes with a backend in fixed-size blocks as
+    they're written, uploading blocks in a background thread so only blocks that
+    are waiting to be staged are held in memory. Once ``max_pending`` blocks are
+    waiting, writes block until the oldest one is staged, so memory stays bounded
+    if uploads fall behind.
+    """
+
+    def __init__(self, backend, block_size=DEFAULT_BLOCK_SIZE, max_pending=2):
+        self.backend = backend
+        self.block_size = block_size
+        self.max_pending = max_pending
+        self.buffer = bytearray()
+        self.block_ids = []
+        self.pending = deque()
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.buffer.extend(data)
+        while len(self.buffer) >= self.block_size:
+            self._stage(bytes(self.buffer[: self.block_size]))
+            del self.buffer[: self.block_size]
+        return len(data)
+
+    def finish(self):
+        """Stage any remaining bytes, wait for every block to be staged, and commit
+        the blocks in the order they were written
+        """
+        if self.buffer or not self.block_ids:
+            self._stage(bytes(self.buffer))
+            self.buffer = bytearray()
+        try:
+            while self.pending:
+                self.pending.popleft().result()
+        finally:
+            self.executor.shutdown()
+        self.backend.commit(self.block_ids)
+
+    def _stage(self, data):
+        while len(self.pending) >= self.max_pending:
+            self.pending[0].result()
+            self.pending.popleft()
+        block_id = len(self.block_ids)
+        self.block_ids.append(block_id)
+        self.pending.append(self.executor.submit(self.backend.stage, block_id, data))
+
+
+class LocalBlockBackend:
+    """Stages blocks as files next to a local path and concatenates them on commit,
+    standing in for a block blob container
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.blocks_dir = "{}.blocks".format(path)
+
+    def stage(self, block_id, data):
+        os.makedirs(self.blocks_dir, exist_ok=True)
+        with open(self._block_path(block_id), "wb") as f:
+            f.write(data)
+
+    def commit(self, block_ids):
+        tmp_path = "{}.tmp".format(self.path)
+        with open(tmp_path, "wb") as f:
+            for block_id in block_ids:
+                with open(self._block_path(block_id), "rb") as block:
+                    shutil.copyfileobj(block, f)
+        os.replace(tmp_path, self.path)
+        shutil.rmtree(self.blocks_dir)
+
+    def _block_path(self, block_id):
+        return os.path.join(self.blocks_dir, "{:08d}".format(block_id))
+
+
+class AzureBlockBackend:
+    """Stages blocks of a block blob in Azure Blob Storage and commits the block list
+    once the feed is finished
+    """
+
+    def __init__(self, account_name, account_key, container, filename):
+        from azure.storage.blob import ContainerClient
+
+        self.blob_client = ContainerClient(
+            "{}.blob.core.windows.net".format(account_name),
+            container,
+            credential=account_key,
+        ).get_blob_client(filename)
+
+    def stage(self, block_id, data):
+        self.blob_client.stage_block(self._encode(block_id), data)
+
+    def commit(self, block_ids):
+        from azure.storage.blob import BlobBlock
+
+        self.blob_client.commit_block_list(
+            [BlobBlock(block_id=self._encode(block_id)) for block_id in block_ids]
+        )
+
+    def _encode(self, block_id):
+        # Block IDs must be base64-encoded strings of the same length within a blob
+        return base64.b64encode("{:08d}".format(block_id).encode()).decode()
+
+
+class ChunkedFeedStorage:
+    """Feed storage that compresses feeds and streams them to a backend in fixed-size
+    blocks while the crawl is running, instead of writing the whole feed to a
+    temporary file and uploading it once the spider closes.
+
+    Compression is set with ``CITY_SCRAPERS_FEED_COMPRESSION`` as "gzip" (default),
+    "zstd" (requires the ``zstandard`` package) or "none", and the block size in
+    bytes with ``CITY_SCRAPERS_FEED_BLOCK_SIZE``. Subclasses implement
+    :meth:`get_backend` for a storage provider.
+    """
+
+    def __init__(
+        self,
+        uri,
+        *,
+        feed_options=None,
+        compression="gzip",
+        block_size=DEFAULT_BLOCK_SIZE,
+    ):
+        if compression not in COMPRESSIONS:
+            raise NotConfigured("Unknown feed compression: {}".format(compression))
+        if compression == "zstd":
+            try:
+                import zstandard  # noqa
+            except ImportError:
+                raise NotConfigured("zstandard is required for zstd compression")
+        self.uri = uri
+        self.compression = compression
+        self.block_size = block_size
+        self.sink = None
+
+    @classmethod
+    def from_crawler(cls, crawler, uri, *, feed_options=None):
+        return cls(
+            uri,
+            feed_options=feed_options,
+            compression=crawler.settings.get("CITY_SCRAPERS_FEED_COMPRESSION", "gzip"),
+            block_size=crawler.settings.getint(
+                "CITY_SCRAPERS_FEED_BLOCK_SIZE", DEFAULT_BLOCK_SIZE
+            ),
+        )
+
+    def get_backend(self):
+        raise NotImplementedError
+
+    def open(self, spider):
+        self.sink = BlockSink(self.get_backend(), block_size=self.block_size)
+        if self.compression == "gzip":
+            return gzip.GzipFile(fileobj=self.sink, mode="wb")
+        if self.compression == "zstd":
+            import zstandard
+
+            return zstandard.ZstdCompressor().stream_writer(self.sink, closefd=False)
+        return self.sink
+
+    def store(self, file):
+        return threads.deferToThread(self._store_in_thread, file)
+
+    def _store_in_thread(self, file):
+        if file is not self.sink:
+            # Flushes compressed data to the sink without closing it
+            file.close()
+        self.sink.finish()
+
+
+class LocalChunkedFeedStorage(ChunkedFeedStorage):
+    """Implements :class:`ChunkedFeedStorage` for a local directory, with URIs like
+    ``chunked-file:///path/to/feed.json.gz``
+    """
+
+    def get_backend(self):
+        path = self.uri.split("://", 1)[1]
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        return LocalBlockBackend(path)
+
+
+class AzureChunkedFeedStorage(ChunkedFeedStorage):
+    """Implements :class:`ChunkedFeedStorage` for Azure Blob Storage, with URIs
+    formatted like the ``azure`` feed storage
+    """
+
+    def get_backend(self):
+        account_name, account_key = self.uri.split("://", 1)[1].split("@")[0].split(":")
+        container, filename = self.uri.split("@")[1].split("/", 1)
+        return AzureBlockBackend(account_name, account_key, container, filename)
+
+
+class DigestFeedStorage:
+    """Mixin for :class:`BlockingFeedStorage` subclasses that skips storing feeds with
+    the same items as the last feed stored for a spider.
+
+    A manifest for each spider records the digest of its last stored feed and where
+    it was stored. When a new feed has the same digest, only the manifest is updated,
+    so the previous feed stays the latest one. Subclasses implement
+    :meth:`load_manifest`, :meth:`save_manifest` and the ``feed_path`` property.
+
+    Feeds are still stored if the last one is at least
+    ``CITY_SCRAPERS_FEED_MAX_SKIP_DAYS`` old (2 by default). ``AzureDiffPipeline``
+    only looks for previous feeds in the last 3 days of prefixes, and without one
+    every meeting would get a new OCD ID and upcoming meetings that disappeared
+    wouldn't be marked cancelled.
+    """
+
+    spider_name = None
+    max_skip_days = 2
+
+    def open(self, spider):
+        self.spider_name = spider.name
+        self.max_skip_days = spider.crawler.settings.getfloat(
+            "CITY_SCRAPERS_FEED_MAX_SKIP_DAYS", self.max_skip_days
+        )
+        return super().open(spider)
+
+    def _store_in_thread(self, file):
+        digest = feed_digest(file)
+        now = datetime.now().isoformat()[:19]
+        manifest = self.load_manifest(self.spider_name) or {}
+        if manifest.get("digest") == digest and not self._is_stale(manifest):
+            manifest["checked"] = now
+        else:
+            super()._store_in_thread(file)
+            manifest = {
+                "digest": digest,
+                "path": self.feed_path,
+                "updated": now,
+                "checked": now,
+            }
+        self.save_manifest(self.spider_name, manifest)
+
+    def _is_stale(self, manifest):
+        updated = datetime.strptime(manifest["updated"], "%Y-%m-%dT%H:%M:%S")
+        return datetime.now() - updated >= timedelta(days=self.max_skip_days)
+
+    @property
+    def feed_path(self):
+        raise NotImplementedError
+
+    def load_manifest(self, spider_name):
+        """Return the manifest for a spider's last stored feed, or None"""
+        raise NotImplementedError
+
+    def save_manifest(self, spider_name, manifest):
+        raise NotImplementedError
+
+
+class LocalFeedStorage(BlockingFeedStorage):
+    """Feed storage for a local directory standing in for a blob container, with URIs
+    like ``digest-file:///path/to/feed.json``
+    """
+
+    def __init__(self, uri, *, feed_options=None):
+        self.path = uri.split("://", 1)[1]
+
+    def _store_in_thread(self, file):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        file.seek(0)
+        with open(self.path, "wb") as f:
+            shutil.copyfileobj(file, f)
+
+
+class LocalDigestFeedStorage(DigestFeedStorage, LocalFeedStorage):
+    """Implements :class:`DigestFeedStorage` for a local directory, with manifests
+    stored in the ``CITY_SCRAPERS_FEED_MANIFEST_DIR`` setting
+    """
+
+    def __init__(self, uri, *, feed_options=None, manifest_dir=None):
+        if not manifest_dir:
+            raise NotConfigured("CITY_SCRAPERS_FEED_MANIFEST_DIR must be set")
+        super().__init__(uri, feed_options=feed_options)
+        self.manifest_dir = manifest_dir
+
+    @classmethod
+    def from_settings(cls, settings, uri, *, feed_options=None):
+        return cls(
+            uri,
+            feed_options=feed_options,
+            manifest_dir=settings.get("CITY_SCRAPERS_FEED_MANIFEST_DIR"),
+        )
+
+    @property
+    def feed_path(self):
+        return self.path
+
+    def load_manifest(self, spider_name):
+        path = self._manifest_path(spider_name)
+        if os.path.exists(path):
+            with open(path) as f:
+                return json.load(f)
+
+    def save_manifest(self, spider_name, manifest):
+        os.makedirs(self.manifest_dir, exist_ok=True)
+        path = self._manifest_path(spider_name)
+        tmp_path = "{}.tmp".format(path)
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def _manifest_path(self, spider_name):
+        return os.path.join(self.manifest_dir, "{}.json".format(spider_name))
+
+
+class AzureDigestFeedStorage(DigestFeedStorage, AzureBlobFeedStorage):
+    """Implements :class:`DigestFeedStorage` for Azure Blob Storage, with manifests
+    stored as ``manifests/<spider>.json`` blobs in the feed container
+    """
+
+    @property
+    def feed_path(self):
+        return self.filename
+
+    def load_manifest(self, spider_name):
+        from azure.core.exceptions import ResourceNotFoundError
+
+        blob_client = self.container_client.get_blob_client(
+            "manifests/{}.json".format(spider_name)
+        )
+        try:
+            return json.loads(blob_client.download_blob().content_as_text())
+        except ResourceNotFoundError:
+            return None
+
+    def save_manifest(self, spider_name, manifest):
+        from azure.storage.blob import ContentSettings
+
+        self.container_client.upload_blob(
+            "manifests/{}.json".format(spider_name),
+            json.dumps(manifest, sort_keys=True),
+            content_settings=ContentSettings(cache_control="no-cache"),
+            overwrite=True,
+        )
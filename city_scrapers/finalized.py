@@ -0,0 +1,56 @@
+import json
+import os
+
+from city_scrapers_core.constants import PASSED
+
+from city_scrapers.items import deserialize_meeting, serialize_meeting
+
+
+def is_finalized(meeting):
+    """Meetings that have passed and have minutes posted aren't expected to change"""
+    return meeting.get("status") == PASSED and any(
+        "minutes" in (link.get("title") or "").lower()
+        for link in meeting.get("links") or []
+    )
+
+
+class FinalizedStore:
+    """Meetings scraped from pages that aren't expected to change anymore, stored by
+    page URL in a JSON file so later crawls can skip requesting them.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.pages = {}
+        self.changed = False
+
+    def __contains__(self, url):
+        return url in self.pages
+
+    def __len__(self):
+        return len(self.pages)
+
+    def load(self):
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                self.pages = json.load(f)
+        return self
+
+    def save(self):
+        """Write the store if any pages were added, replacing the file atomically"""
+        if not self.changed:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = "{}.tmp".format(self.path)
+        with open(tmp_path, "w") as f:
+            json.dump(self.pages, f, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self.changed = False
+
+    def add(self, url, meetings):
+        self.pages[url] = [serialize_meeting(meeting) for meeting in meetings]
+        self.changed = True
+
+    def get(self, url):
+        """Return new Meeting items for a finalized page, or an empty list"""
+        return [deserialize_meeting(data) for data in self.pages.get(url, [])]
@@ -0,0 +1,60 @@
+from functools import partial
+
+
+class _Gather:
+    """Collects responses for a group of requests and calls the combining callback
+    with all of them once the last one is parsed
+    """
+
+    def __init__(self, count, callback, cb_kwargs):
+        self.responses = [None] * count
+        self.remaining = count
+        self.failed = False
+        self.callback = callback
+        self.cb_kwargs = cb_kwargs
+
+    def parse(self, response, gather_index):
+        self.responses[gather_index] = response
+        return self._finish()
+
+    def errback(self, gather_index, failure):
+        self.failed = True
+        self._finish()
+        return failure
+
+    def _finish(self):
+        self.remaining -= 1
+        if self.remaining > 0:
+            return []
+        responses, self.responses = self.responses, None
+        if self.failed:
+            return []
+        return self.callback(responses, **self.cb_kwargs) or []
+
+
+def gather_requests(requests, callback, cb_kwargs=None):
+    """Issue independent requests concurrently and call a single callback with all of
+    their responses, for spiders that combine several pages into one set of meetings.
+
+    The combining callback is called once with a list of responses in the same order
+    as the requests, and its output is treated like any other callback's. If any of
+    the requests fail it isn't called, and the failure is handled like any other
+    request error. Requests are never filtered as duplicates, since that would
+    prevent the callback from being called.
+
+    :param requests: Iterable of requests without callbacks
+    :param callback: Callable accepting a list of responses and any cb_kwargs
+    :param cb_kwargs: Optional dict of keyword arguments for the callback
+    :return: List of requests to yield from a callback or start_requests
+    """
+    requests = list(requests)
+    gather = _Gather(len(requests), callback, cb_kwargs or {})
+    return [
+        request.replace(
+            callback=gather.parse,
+            errback=partial(gather.errback, idx),
+            cb_kwargs={"gather_index": idx},
+            dont_filter=True,
+        )
+        for idx, request in enumerate(requests)
+    ]
@@ -0,0 +1,43 @@
+from datetime import datetime
+
+import scrapy
+from city_scrapers_core.items import Meeting
+
+DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S"
+DATETIME_FIELDS = ("start", "end")
+
+
+class MeetingLinks(scrapy.Item):
+    """Links for a meeting that may not have been scraped yet, matched to meetings by
+    date with :class:`city_scrapers.middleware.MeetingLinkJoinMiddleware`.
+
+    Setting ``final`` indicates that no more links will be found for that date, so any
+    meetings on that date can be returned without waiting for the spider to finish.
+    """
+
+    start = scrapy.Field()
+    links = scrapy.Field()
+    final = scrapy.Field()
+
+
+def serialize_meeting(meeting):
+    """Return a JSON-serializable dict of a meeting with ISO 8601 start and end"""
+    data = dict(meeting)
+    for field in DATETIME_FIELDS:
+        if isinstance(data.get(field), datetime):
+            data[field] = data[field].strftime(DATETIME_FORMAT)
+    return data
+
+
+def deserialize_meeting(data):
+    """Return a Meeting item from a dict created with :func:`serialize_meeting`"""
+    data = dict(data)
+    for field in DATETIME_FIELDS:
+        if data.get(field):
+            data[field] = datetime.strptime(data[field], DATETIME_FORMAT)
+    meeting = Meeting(**{k: v for k, v in data.items() if k in Meeting.fields})
+    # Bypass __setitem__ for values added by pipelines, like "_id" from DiffPipeline
+    for key, value in data.items():
+        if key not in Meeting.fields:
+            meeting._values[key] = value
+    return meeting
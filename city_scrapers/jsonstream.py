@@ -0,0 +1,99 @@
+import json
+import logging
+from io import BytesIO
+
+logger = logging.getLogger(__name__)
+
+WHITESPACE = " \t\n\r"
+
+
+def iter_json_items(response, prefix="item"):
+    """Iterate through items in a JSON array from a response as they're decoded,
+    without loading the whole document into a list first. Callers filtering items as
+    they're yielded only ever hold one item at a time.
+
+    Uses ijson if it's installed, and otherwise decodes one array element at a time
+    with the standard library.
+
+    :param response: Response with a JSON body
+    :param prefix: ijson-style path to the array, like "item" for a top-level array or
+                   "data.events.item" for an array nested in objects
+    :return: Generator of decoded items
+    :raises ValueError: If the response isn't valid JSON
+    """
+    try:
+        import ijson
+    except ImportError:
+        yield from _iter_raw_decode(response.text, prefix)
+        return
+
+    try:
+        yield from ijson.items(BytesIO(response.body), prefix, use_float=True)
+    except ijson.JSONError as e:
+        raise ValueError(str(e)) from e
+
+
+def iter_json_outputs(response, parse_item, prefix="item"):
+    """Parse each item in a JSON array from a response as it's decoded, yielding
+    everything ``parse_item`` returned once the whole array has been decoded.
+
+    Only the parsed outputs are held rather than the whole document, but nothing is
+    yielded if the response is invalid or truncated partway through, since a partial
+    list of meetings would make the missing ones look cancelled. The error is logged
+    and re-raised so that it's still reported as a spider error.
+
+    :param response: Response with a JSON body
+    :param parse_item: Function returning an iterable of outputs for an item
+    :param prefix: ijson-style path to the array, see :func:`iter_json_items`
+    :return: Generator of outputs
+    :raises ValueError: If the response isn't valid JSON
+    """
+    outputs = []
+    items = iter_json_items(response, prefix)
+    while True:
+        try:
+            item = next(items)
+        except StopIteration:
+            break
+        except ValueError as e:
+            logger.error("Invalid JSON in %s: %s", response.url, e)
+            raise
+        outputs.extend(parse_item(item))
+    yield from outputs
+
+
+def _iter_raw_decode(text, prefix):
+    """Decode top-level array elements one at a time, falling back to decoding the
+    whole document for nested arrays
+    """
+    path = prefix.split(".")
+    if path != ["item"]:
+        data = json.loads(text)
+        for key in path[:-1]:
+            data = data[key]
+        yield from data
+        return
+
+    decoder = json.JSONDecoder()
+    idx = _skip_whitespace(text, 0)
+    if text[idx : idx + 1] != "[":
+        raise ValueError("Expected a JSON array")
+    idx = _skip_whitespace(text, idx + 1)
+    if text[idx : idx + 1] == "]":
+        return
+    while True:
+        item, idx = decoder.raw_decode(text, idx)
+        yield item
+        idx = _skip_whitespace(text, idx)
+        delimiter = text[idx : idx + 1]
+        if delimiter == "]":
+            return
+        if delimiter != ",":
+            raise ValueError("Expected ',' or ']' at position {}".format(idx))
+        idx = _skip_whitespace(text, idx + 1)
+
+
+def _skip_whitespace(text, idx):
+    while idx < len(text) and text[idx] in WHITESPACE:
+        idx += 1
+    return idx
@@ -0,0 +1,65 @@
+from datetime import datetime
+
+from city_scrapers_core.constants import CANCELLED, PASSED, TENTATIVE
+
+
+class KeywordMatcher:
+    """Maps text to a value with a table of keywords, for spiders to declare how
+    titles map to classifications instead of writing chains of ``in`` checks.
+
+    The table is a sequence of ``(keywords, value)`` rows checked in order, and the
+    value of the first row with any keyword in the text is returned, or ``default``
+    if none match. Keywords are strings or compiled patterns. If ``ignore_case`` is
+    set (the default) the text is lowercased once before every row is checked, and
+    patterns should be written to match lowercase text.
+
+    Keywords are checked with substring searches rather than one combined
+    alternation pattern because CPython's substring search is much faster, especially
+    on long texts like PDFs, see ``benchmarks/bench_keywords.py``.
+    """
+
+    def __init__(self, table, default=None, ignore_case=True):
+        self.default = default
+        self.ignore_case = ignore_case
+        # Flattened to (substring, pattern search, value) checks in table order
+        self.checks = []
+        for keywords, value in table:
+            if isinstance(keywords, str) or hasattr(keywords, "search"):
+                keywords = (keywords,)
+            for keyword in keywords:
+                if isinstance(keyword, str):
+                    if ignore_case:
+                        keyword = keyword.lower()
+                    self.checks.append((keyword, None, value))
+                else:
+                    self.checks.append((None, keyword.search, value))
+
+    def match(self, *texts):
+        """Return the value for the first row with a keyword in the texts"""
+        text = texts[0] if len(texts) == 1 else " ".join(texts)
+        if self.ignore_case:
+            text = text.lower()
+        for substring, search, value in self.checks:
+            if search is None:
+                if substring in text:
+                    return value
+            elif search(text):
+                return value
+        return self.default
+
+
+STATUS_KEYWORDS = KeywordMatcher([(("cancel", "rescheduled", "postpone"), CANCELLED)])
+
+
+def get_status(item, text=""):
+    """Return the status of a meeting the same way as ``CityScrapersSpider._get_status``
+    with the shared cancellation keywords
+    """
+    status = STATUS_KEYWORDS.match(
+        item.get("title", ""), item.get("description", ""), text
+    )
+    if status:
+        return status
+    if item["start"] < datetime.now():
+        return PASSED
+    return TENTATIVE
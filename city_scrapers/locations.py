@@ -0,0 +1,111 @@
+import re
+from functools import lru_cache
+
+# Known venues for meetings, keyed by a short name. Aliases are landmark strings that
+# identify a venue in page text, compared ignoring case and punctuation.
+VENUES = {
+    "virtual": {"name": "Virtual", "address": "", "aliases": ("virtual",)},
+    "zoom": {
+        "name": "Zoom (see website for details)",
+        "address": "",
+        "aliases": ("zoom",),
+    },
+    "cchr": {
+        "name": "",
+        "address": "740 N Sedgwick St, 4th Floor Boardroom, Chicago, IL 60654",
+        "aliases": ("740 N Sedgwick",),
+    },
+    "cook_county_911": {
+        "name": "Conference Room",
+        "address": "1401 S. Maybrook Drive, Maywood, IL 60153",
+        "aliases": ("Maybrook Dr", "Maybrook Drive"),
+    },
+    "harold_washington_library": {
+        "name": "Harold Washington Library Center",
+        "address": "400 S State St, Chicago, IL 60605",
+        "aliases": ("Harold Washington Library", "400 S State St"),
+    },
+    "polsky_center": {
+        "name": "Polsky Center for Innovation",
+        "address": "1452 East 53rd Street, 2nd Floor, Chicago, IL 60615",
+        "aliases": ("Polsky Center",),
+    },
+}
+
+
+def get_location(key):
+    """Return the location of a venue in the registry"""
+    venue = VENUES[key]
+    return {"name": venue["name"], "address": venue["address"]}
+
+
+@lru_cache(maxsize=4096)
+def canonical_address(address):
+    """Return an address with whitespace collapsed and stray separators removed.
+    Results are cached since the same address is usually repeated for every meeting.
+    """
+    address = re.sub(r"\s+", " ", address)
+    address = re.sub(r"\s+,", ",", address)
+    address = re.sub(r",(?:\s*,)+", ",", address)
+    return address.strip(" ,")
+
+
+@lru_cache(maxsize=4096)
+def chicago_address(street):
+    """Return the canonical address for a street address in Chicago"""
+    return canonical_address("{} Chicago, IL".format(street))
+
+
+def _match_key(text):
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+@lru_cache(maxsize=None)
+def _venue_matcher(keys):
+    """Return a single compiled pattern matching any alias of the venues in keys,
+    and a mapping of each normalized alias to its venue key
+    """
+    alias_map = {}
+    for key in keys:
+        for alias in VENUES[key]["aliases"]:
+            alias_map[_match_key(alias)] = key
+    # Longest aliases first so more specific landmarks win
+    pattern = r"\b(?:{})\b".format(
+        "|".join(re.escape(alias) for alias in sorted(alias_map, key=len, reverse=True))
+    )
+    return re.compile(pattern), alias_map
+
+
+def find_venue(text, keys=None):
+    """Return the key of the first known venue mentioned in text, or None. Only the
+    venues in keys are checked if provided.
+    """
+    pattern, alias_map = _venue_matcher(tuple(keys or VENUES))
+    match = pattern.search(_match_key(text))
+    if match:
+        return alias_map[match.group()]
+
+
+def validate_venue(text, *keys):
+    """Raise a ValueError if none of the venues in keys are mentioned in text, for
+    spiders that use a fixed location as long as the page still mentions it
+    """
+    if find_venue(text, keys) is None:
+        raise ValueError("Meeting location has changed")
+
+
+@lru_cache(maxsize=4096)
+def _normalize_location(name, address):
+    venue_key = find_venue("{} {}".format(name, address))
+    if venue_key:
+        venue = VENUES[venue_key]
+        return venue["name"], venue["address"]
+    return canonical_address(name), canonical_address(address)
+
+
+def normalize_location(location):
+    """Return a location with a canonical name and address, replaced with the
+    registry's location if it mentions a known venue
+    """
+    name, address = _normalize_location(location["name"], location["address"])
+    return {"name": name, "address": address}
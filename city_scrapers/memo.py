@@ -0,0 +1,50 @@
+from functools import wraps
+from weakref import WeakKeyDictionary
+
+from parsel import Selector, SelectorList
+from scrapy.http import Response
+
+from city_scrapers.selectors import LexborSelector
+
+# Values that refer back to a page, which would keep their cache entry from being
+# released with the response
+PAGE_TYPES = (Response, Selector, SelectorList, LexborSelector)
+
+
+def response_cached(func):
+    """Decorator for spider methods taking a response as their first argument that
+    only depend on the page, like parsing a location or links shared by every row.
+    The first call's result is reused for later calls with the same response and
+    arguments, and is released along with the response once the callback finishes.
+
+    Cached values are shared between calls, so they shouldn't be modified after
+    they're returned. They also can't be responses or selectors (or lists of them),
+    since a value that refers to its response would keep it from ever being
+    released, so methods should return parsed values like strings and dicts.
+    """
+    cache = WeakKeyDictionary()
+
+    @wraps(func)
+    def wrapper(self, response, *args, **kwargs):
+        results = cache.setdefault(response, {})
+        key = (self, args, tuple(sorted(kwargs.items())))
+        if key not in results:
+            result = func(self, response, *args, **kwargs)
+            if _refers_to_page(result):
+                raise TypeError(
+                    "{} returned a response or selector, which can't be cached".format(
+                        func.__qualname__
+                    )
+                )
+            results[key] = result
+        return results[key]
+
+    return wrapper
+
+
+def _refers_to_page(value):
+    if isinstance(value, PAGE_TYPES):
+        return True
+    if isinstance(value, (list, tuple)):
+        return any(isinstance(item, PAGE_TYPES) for item in value)
+    return False
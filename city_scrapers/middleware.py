@@ -1,24 +1,569 @@
+import json
+import logging
+import os
 import random
+import time
+from collections import defaultdict
+from datetime import datetime
+from itertools import count
+from urllib.parse import urlparse
 
 from city_scrapers_core.items import Meeting
+from scrapy import Request, signals
+from scrapy.downloadermiddlewares.retry import RetryMiddleware
+from scrapy.exceptions import DontCloseSpider, IgnoreRequest, NotConfigured
+from scrapy.utils.httpobj import urlparse_cached
 from scrapy_wayback_middleware import WaybackMiddleware
 
+from city_scrapers.compact import MeetingInterner
+from city_scrapers.finalized import FinalizedStore, is_finalized
+from city_scrapers.items import MeetingLinks, serialize_meeting
+
+logger = logging.getLogger(__name__)
+
 
 class CityScrapersWaybackMiddleware(WaybackMiddleware):
+    def process_spider_output(self, response, result, spider):
+        """Archive response and item URLs, skipping data URL responses like the one
+        MeetingLinkJoinMiddleware returns held meetings from
+        """
+        outputs = super().process_spider_output(response, result, spider)
+        if not response.url.startswith("data:"):
+            yield from outputs
+            return
+        for output in outputs:
+            if (
+                isinstance(output, Request)
+                and output.callback == self.handle_wayback
+                and self._get_archived_url(output) == response.url
+            ):
+                continue
+            yield output
+
+    def _get_archived_url(self, request):
+        if self.is_post:
+            return json.loads(request.body).get("url")
+        return request.url[len("https://web.archive.org/save/") :]
+
     def get_item_urls(self, item):
         MAX_LINKS = 3
         if isinstance(item, Meeting):
             links = []
             if "legistar" in item["source"] and "Calendar.aspx" not in item["source"]:
                 links = [item["source"]]
-            links.extend(
-                random.sample(
-                    [link.get("href") for link in item.get("links", [])], MAX_LINKS
-                )
-            )
+            hrefs = [link.get("href") for link in item.get("links", [])]
+            links.extend(random.sample(hrefs, min(len(hrefs), MAX_LINKS)))
             return links
         if isinstance(item, dict):
             return random.sample(
                 [doc.get("url") for doc in item.get("documents", [])], MAX_LINKS
             )
         return []
+
+
+class RequestPhaseMiddleware:
+    """Spider middleware for crawls that need to be run in dependent phases.
+
+    Spiders declare a ``phases`` dict mapping phase names to a list of phases they
+    depend on, and tag requests with the phase they belong to through
+    ``meta={"phase": ...}``. Requests yielded while parsing a response inherit the
+    response's phase unless they're tagged with another one.
+
+    Requests for a phase are held back until every request in the phases it depends on
+    (and every request those yielded) has been parsed, and are then scheduled right
+    away instead of waiting for the whole spider to go idle. Requests that never make
+    it to a callback (like download errors without an errback) are accounted for when
+    the spider goes idle, which releases anything still being held.
+    """
+
+    def __init__(self, crawler):
+        self.crawler = crawler
+        self.tokens = count()
+        self.pending = defaultdict(set)
+        self.held = defaultdict(list)
+        self.resolved = set()
+        self.start_requests_done = False
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        middleware = cls(crawler)
+        crawler.signals.connect(middleware.spider_idle, signal=signals.spider_idle)
+        crawler.signals.connect(
+            middleware.request_dropped, signal=signals.request_dropped
+        )
+        return middleware
+
+    def process_start_requests(self, start_requests, spider):
+        if not getattr(spider, "phases", None):
+            yield from start_requests
+            return
+        for request in start_requests:
+            if self._should_hold(request, spider):
+                self.held[request.meta["phase"]].append(request)
+            else:
+                yield self._track(request)
+        self.start_requests_done = True
+        self._release(spider)
+
+    def process_spider_output(self, response, result, spider):
+        if not getattr(spider, "phases", None):
+            yield from result
+            return
+        phase = response.meta.get("phase")
+        try:
+            for output in result:
+                if isinstance(output, Request):
+                    if phase and "phase" not in output.meta:
+                        output.meta["phase"] = phase
+                    if self._should_hold(output, spider):
+                        self.held[output.meta["phase"]].append(output)
+                        continue
+                    self._track(output)
+                yield output
+        finally:
+            self._finish(response.meta)
+            self._release(spider)
+
+    def process_spider_exception(self, response, exception, spider):
+        if getattr(spider, "phases", None):
+            self._finish(response.meta)
+            self._release(spider)
+
+    def request_dropped(self, request, spider):
+        if getattr(spider, "phases", None):
+            self._finish(request.meta)
+            self._release(spider)
+
+    def spider_idle(self, spider):
+        """Nothing can be in progress once the spider is idle, so clear any requests
+        that were never parsed and schedule whatever phases are left.
+        """
+        if not self.held:
+            return
+        self.start_requests_done = True
+        self.pending.clear()
+        if self._release(spider):
+            raise DontCloseSpider
+
+    def _should_hold(self, request, spider):
+        phase = request.meta.get("phase")
+        return any(dep not in self.resolved for dep in spider.phases.get(phase, []))
+
+    def _track(self, request):
+        phase = request.meta.get("phase")
+        if phase:
+            token = next(self.tokens)
+            request.meta["phase_token"] = token
+            self.pending[phase].add(token)
+        return request
+
+    def _finish(self, meta):
+        phase = meta.get("phase")
+        if phase:
+            self.pending[phase].discard(meta.get("phase_token"))
+
+    def _release(self, spider):
+        """Schedule held requests for phases with resolved dependencies and mark
+        phases resolved once all of their requests have been parsed. Returns whether
+        any requests were scheduled.
+        """
+        if not self.start_requests_done:
+            return False
+        released = False
+        phase_names = set(spider.phases) | set(self.held) | set(self.pending)
+        for deps in spider.phases.values():
+            phase_names.update(deps)
+        changed = True
+        while changed:
+            changed = False
+            for phase in phase_names - self.resolved:
+                if any(
+                    dep not in self.resolved for dep in spider.phases.get(phase, [])
+                ):
+                    continue
+                for request in self.held.pop(phase, []):
+                    self.crawler.engine.crawl(self._track(request), spider)
+                    released = True
+                if not self.pending[phase]:
+                    self.resolved.add(phase)
+                    changed = True
+        return released
+
+
+class MeetingLinkJoinMiddleware:
+    """Spider middleware for joining links to meetings when they're scraped separately.
+
+    Spiders with ``join_links`` set can yield :class:`MeetingLinks` items for a date
+    from any callback, in any order relative to the meetings they belong to. Meetings
+    are held until their date is marked final by a :class:`MeetingLinks` item or the
+    spider goes idle, and are then returned with all links for their agency and date
+    added. This lets documents and meetings be crawled concurrently instead of loading
+    every document before requesting meetings. Held meetings are stored as compact
+    records, since archive crawls can hold most of a spider's meetings until it's idle.
+
+    Meetings still held once the spider is idle are returned from the callback of a
+    data URL request, so they pass through every spider middleware like any other
+    output.
+    """
+
+    def __init__(self, crawler):
+        self.crawler = crawler
+        self.interner = MeetingInterner()
+        self.meetings = defaultdict(list)
+        self.links = defaultdict(list)
+        self.finalized = set()
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        middleware = cls(crawler)
+        crawler.signals.connect(middleware.spider_idle, signal=signals.spider_idle)
+        return middleware
+
+    def process_spider_output(self, response, result, spider):
+        if not getattr(spider, "join_links", False) or response.meta.get(
+            "link_join_flush"
+        ):
+            yield from result
+            return
+        for output in result:
+            if isinstance(output, MeetingLinks):
+                key = self._get_key(spider, output["start"])
+                for link in output.get("links", []):
+                    if link not in self.links[key]:
+                        self.links[key].append(link)
+                if output.get("final"):
+                    self.finalized.add(key)
+            elif isinstance(output, Meeting):
+                key = self._get_key(spider, output["start"])
+                self.meetings[key].append(self.interner.compact(output))
+            else:
+                yield output
+                continue
+            if key in self.finalized:
+                yield from self._join(key)
+
+    def spider_idle(self, spider):
+        """Schedule a request to return any meetings still waiting on links once the
+        spider is idle
+        """
+        if not self.meetings:
+            return
+        self.crawler.engine.crawl(
+            Request(
+                "data:,",
+                callback=self.flush,
+                dont_filter=True,
+                meta={"link_join_flush": True, "dont_obey_robotstxt": True},
+            ),
+            spider,
+        )
+        raise DontCloseSpider
+
+    def flush(self, response):
+        """Return every held meeting with the links found for its date"""
+        for key in list(self.meetings):
+            yield from self._join(key)
+
+    def _get_key(self, spider, start):
+        if isinstance(start, datetime):
+            start = start.date()
+        return (spider.agency, start)
+
+    def _join(self, key):
+        for record in self.meetings.pop(key, []):
+            meeting = record.to_meeting()
+            meeting["links"] = meeting.get("links", []) + [
+                link for link in self.links[key] if link not in meeting.get("links", [])
+            ]
+            yield meeting
+
+
+class FinalizedDetailMiddleware:
+    """Spider middleware for skipping detail pages that have been finalized.
+
+    For spiders with ``skip_finalized`` set, responses that only return meetings which
+    have passed and have minutes posted are stored by URL in a JSON file for each
+    spider in the ``CITY_SCRAPERS_FINALIZED_DIR`` setting. Requests for those URLs in
+    later crawls are dropped, and the stored meetings are returned in their place.
+    Spiders can define a ``parse_finalized`` method accepting and returning a stored
+    meeting to update any state that would otherwise be set while parsing the page.
+    """
+
+    def __init__(self, crawler, finalized_dir):
+        self.crawler = crawler
+        self.finalized_dir = finalized_dir
+        self.store = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        finalized_dir = crawler.settings.get("CITY_SCRAPERS_FINALIZED_DIR")
+        if not finalized_dir:
+            raise NotConfigured
+        middleware = cls(crawler, finalized_dir)
+        crawler.signals.connect(middleware.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+        return middleware
+
+    def spider_opened(self, spider):
+        if getattr(spider, "skip_finalized", False):
+            self.store = FinalizedStore(
+                os.path.join(self.finalized_dir, "{}.json".format(spider.name))
+            ).load()
+
+    def spider_closed(self, spider):
+        if self.store is not None:
+            self.store.save()
+
+    def process_spider_output(self, response, result, spider):
+        if self.store is None:
+            yield from result
+            return
+        meetings = []
+        finalized = True
+        for output in result:
+            if isinstance(output, Request) and output.url in self.store:
+                self.crawler.stats.inc_value("finalized/skipped", spider=spider)
+                for meeting in self.store.get(output.url):
+                    if hasattr(spider, "parse_finalized"):
+                        meeting = spider.parse_finalized(meeting)
+                    yield meeting
+                continue
+            if isinstance(output, Meeting):
+                meetings.append(serialize_meeting(output))
+                finalized = finalized and is_finalized(output)
+            else:
+                finalized = False
+            yield output
+        if meetings and finalized:
+            self.store.add(self._get_url(response), meetings)
+
+    def _get_url(self, response):
+        """Return the URL originally requested for a response, before any redirects"""
+        if response.request is None:
+            return response.url
+        return response.meta.get("redirect_urls", [response.url])[0]
+
+
+class HostUnavailable(IgnoreRequest):
+    """Request dropped because its host's circuit is open"""
+
+
+class HostCircuit:
+    """Circuit breaker for requests to a single host.
+
+    The circuit opens after ``max_failures`` consecutive failed requests, and
+    requests are rejected until ``cooldown`` seconds have passed. It's then
+    half-open, and a single request is let through as a probe once per cooldown
+    until a request succeeds and closes the circuit again. Times are wall clock
+    times so circuits can be shared between processes.
+    """
+
+    def __init__(self, max_failures, cooldown):
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+
+    @property
+    def is_open(self):
+        return self.opened_at is not None
+
+    def allow(self):
+        """Return whether a request to the host can be sent"""
+        if self.opened_at is None:
+            return True
+        now = time.time()
+        if now - self.opened_at < self.cooldown:
+            return False
+        # Restart the cooldown so only one probe is sent until it finishes
+        self.opened_at = now
+        return True
+
+    def success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def failure(self):
+        """Record a failed request, returning whether the circuit was opened by it"""
+        self.failures += 1
+        if self.opened_at is None and self.failures >= self.max_failures:
+            self.opened_at = time.time()
+            return True
+        return False
+
+
+class HostCircuitStore:
+    """Open circuits saved as a JSON file for each host in a directory, so spiders
+    crawled in separate processes share them like spiders in the same process.
+    """
+
+    def __init__(self, circuit_dir):
+        self.circuit_dir = circuit_dir
+
+    def load(self, max_failures, cooldown):
+        """Return a dict of hosts to open circuits"""
+        loaded = {}
+        if not os.path.isdir(self.circuit_dir):
+            return loaded
+        for file_name in sorted(os.listdir(self.circuit_dir)):
+            if not file_name.endswith(".json"):
+                continue
+            with open(os.path.join(self.circuit_dir, file_name)) as f:
+                data = json.load(f)
+            circuit = HostCircuit(max_failures, cooldown)
+            circuit.failures = data["failures"]
+            circuit.opened_at = data["opened_at"]
+            loaded[file_name[: -len(".json")]] = circuit
+        return loaded
+
+    def save(self, host, circuit):
+        os.makedirs(self.circuit_dir, exist_ok=True)
+        path = self._get_path(host)
+        tmp_path = "{}.tmp".format(path)
+        with open(tmp_path, "w") as f:
+            json.dump({"failures": circuit.failures, "opened_at": circuit.opened_at}, f)
+        os.replace(tmp_path, path)
+
+    def remove(self, host):
+        if os.path.exists(self._get_path(host)):
+            os.remove(self._get_path(host))
+
+    def _get_path(self, host):
+        return os.path.join(self.circuit_dir, "{}.json".format(host))
+
+
+# Shared by every crawler in a process, so spiders run together with the runall
+# command stop requesting a host once any of them finds it's down
+circuits = {}
+
+
+class HostCircuitBreakerMiddleware:
+    """Downloader middleware for failing fast when a host is down.
+
+    Timeouts, connection errors and server errors are tracked for each host with a
+    :class:`HostCircuit` shared by every spider in the process, using the
+    ``CITY_SCRAPERS_CIRCUIT_FAILURES`` and ``CITY_SCRAPERS_CIRCUIT_COOLDOWN``
+    settings. While a host's circuit is open, requests to it (including retries and
+    requests that were already scheduled) raise :class:`HostUnavailable` instead of
+    being downloaded. If the ``CITY_SCRAPERS_CIRCUIT_DIR`` setting is set, open
+    circuits are also saved there with a :class:`HostCircuitStore` and loaded when
+    later spiders start, since the cron workflow crawls each spider in its own
+    process. If the host is one of the spider's ``start_urls`` or
+    ``allowed_domains`` hosts, the spider is closed with the "upstream_unavailable"
+    reason instead of waiting on every request to time out. Requests to secondary
+    hosts like video links fail without closing the spider.
+
+    It should run after ``RetryMiddleware`` so each retried attempt is counted and
+    checked against the circuit.
+    """
+
+    failure_http_codes = {500, 502, 503, 504, 522, 524}
+    close_reason = "upstream_unavailable"
+
+    def __init__(self, crawler, max_failures, cooldown, store=None):
+        self.crawler = crawler
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self.store = store
+        self.closing = False
+        if store is not None:
+            for host, circuit in store.load(max_failures, cooldown).items():
+                circuits.setdefault(host, circuit)
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        max_failures = crawler.settings.getint("CITY_SCRAPERS_CIRCUIT_FAILURES")
+        if max_failures <= 0:
+            raise NotConfigured
+        circuit_dir = crawler.settings.get("CITY_SCRAPERS_CIRCUIT_DIR")
+        return cls(
+            crawler,
+            max_failures,
+            crawler.settings.getfloat("CITY_SCRAPERS_CIRCUIT_COOLDOWN"),
+            store=HostCircuitStore(circuit_dir) if circuit_dir else None,
+        )
+
+    def process_request(self, request, spider):
+        circuit = self.get_circuit(request)
+        if circuit is None or circuit.allow():
+            return
+        self.crawler.stats.inc_value("circuit_breaker/rejected", spider=spider)
+        self._host_unavailable(urlparse_cached(request).hostname, spider)
+        raise HostUnavailable("Circuit open for {}".format(request.url))
+
+    def process_response(self, request, response, spider):
+        if response.status in self.failure_http_codes:
+            self._failure(request, spider)
+        else:
+            circuit = self.get_circuit(request)
+            if circuit is not None:
+                was_open = circuit.is_open
+                circuit.success()
+                if was_open and self.store is not None:
+                    self.store.remove(urlparse_cached(request).hostname)
+        return response
+
+    def process_exception(self, request, exception, spider):
+        if isinstance(exception, RetryMiddleware.EXCEPTIONS_TO_RETRY):
+            self._failure(request, spider)
+
+    def get_circuit(self, request):
+        """Return the shared circuit for a request's host, or None for requests
+        without one like data URLs
+        """
+        host = urlparse_cached(request).hostname
+        if not host:
+            return None
+        if host not in circuits:
+            circuits[host] = HostCircuit(self.max_failures, self.cooldown)
+        return circuits[host]
+
+    def is_primary_host(self, host, spider):
+        """Return whether host is one of the spider's start URL or allowed domain
+        hosts, rather than a secondary host like a video or document link
+        """
+        domains = {urlparse(url).hostname for url in getattr(spider, "start_urls", [])}
+        domains.update(getattr(spider, "allowed_domains", None) or [])
+        return any(
+            host == domain or host.endswith(".{}".format(domain))
+            for domain in domains
+            if domain
+        )
+
+    def _failure(self, request, spider):
+        circuit = self.get_circuit(request)
+        if circuit is None:
+            return
+        opened = circuit.failure()
+        host = urlparse_cached(request).hostname
+        if circuit.is_open and self.store is not None:
+            # Also saved when a probe fails to restart the cooldown for other spiders
+            self.store.save(host, circuit)
+        if opened:
+            self.crawler.stats.inc_value("circuit_breaker/opened", spider=spider)
+            logger.warning(
+                "Circuit opened for %s after %d failed requests", host, circuit.failures
+            )
+            self._host_unavailable(host, spider)
+
+    def _host_unavailable(self, host, spider):
+        """Fail requests to host that are already waiting in the downloader, and close
+        the spider if it's one of the spider's primary hosts. Requests to other hosts
+        are only failed so the rest of the crawl can continue.
+        """
+        if self.is_primary_host(host, spider) and not self.closing:
+            self.closing = True
+            logger.warning("Closing spider, %s is unavailable", host)
+            self.crawler.engine.close_spider(spider, self.close_reason)
+        for slot in self.crawler.engine.downloader.slots.values():
+            queued = [
+                (request, deferred)
+                for request, deferred in slot.queue
+                if urlparse_cached(request).hostname == host
+            ]
+            for request, deferred in queued:
+                slot.queue.remove((request, deferred))
+                self.crawler.stats.inc_value("circuit_breaker/rejected", spider=spider)
+                deferred.errback(
+                    HostUnavailable("Circuit open for {}".format(request.url))
+                )
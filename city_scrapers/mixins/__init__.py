@@ -1,2 +1,3 @@
 from .chi_mayors_advisory_councils import ChiMayorsAdvisoryCouncilsMixin  # noqa
 from .chi_rogers_park_ssa import ChiRogersParkSsaMixin  # noqa
+from .crawl_state import CrawlState, CrawlStateMixin  # noqa
@@ -6,6 +6,12 @@ from city_scrapers_core.constants import COMMISSION
 from city_scrapers_core.items import Meeting
 from dateutil.relativedelta import relativedelta
 
+from city_scrapers.locations import (
+    canonical_address,
+    chicago_address,
+    normalize_location,
+)
+
 
 class ChiRogersParkSsaMixin:
     timezone = "America/Chicago"
@@ -98,10 +104,9 @@ class ChiRogersParkSsaMixin:
             ).strip()
             if loc_name in loc_addr_str:
                 loc_name = ""
-            return {
-                "name": loc_name,
-                "address": loc_addr_str + " Chicago, IL",
-            }
+            return normalize_location(
+                {"name": loc_name, "address": chicago_address(loc_addr_str)}
+            )
         loc_street = (
             map_link.css('[itemprop="streetAddress"]::attr(content)').extract_first()
             or ""
@@ -115,7 +120,11 @@ class ChiRogersParkSsaMixin:
         )
         if loc_name in loc_street:
             loc_name = ""
-        return {
-            "name": loc_name,
-            "address": "{} {}, IL {}".format(loc_street, loc_city, loc_zip).strip(),
-        }
+        return normalize_location(
+            {
+                "name": loc_name,
+                "address": canonical_address(
+                    "{} {}, IL {}".format(loc_street, loc_city, loc_zip)
+                ),
+            }
+        )
@@ -0,0 +1,40 @@
+from city_scrapers.date_index import DateIndex
+
+
+class CrawlState(dict):
+    """Values collected over the course of a single crawl, like documents that are
+    matched to meetings in a later callback.
+    """
+
+    def date_index(self, name):
+        """Return the :class:`DateIndex` stored under ``name``, creating it if it
+        doesn't exist yet.
+        """
+        if name not in self:
+            self[name] = DateIndex()
+        return self[name]
+
+    def add_by_date(self, name, date_obj, value):
+        """Add a value to the date index ``name`` for a date or datetime"""
+        self.date_index(name).add(date_obj, value)
+
+    def get_by_date(self, name, date_obj):
+        """Return all values in the date index ``name`` for a date or datetime"""
+        return self.date_index(name).get(date_obj)
+
+
+class CrawlStateMixin:
+    """
+    Stores values that need to be shared across callbacks in ``crawl_state`` instead of
+    on the spider class, so nothing is shared between crawls when multiple spiders are
+    run in the same process. The state is cleared when the spider closes.
+    """
+
+    @property
+    def crawl_state(self):
+        if "_crawl_state" not in self.__dict__:
+            self._crawl_state = CrawlState()
+        return self._crawl_state
+
+    def closed(self, reason):
+        self.crawl_state.clear()
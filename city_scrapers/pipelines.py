@@ -0,0 +1,131 @@
+import os
+from uuid import uuid1
+
+from city_scrapers_core.items import Meeting
+from city_scrapers_core.pipelines import DiffPipeline, OpenCivicDataPipeline
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
+from scrapy.utils.misc import load_object
+
+from city_scrapers.changes import ChangeFeed
+from city_scrapers.warehouse import MeetingWarehouse
+
+OCD_PIPELINE = "city_scrapers_core.pipelines.OpenCivicDataPipeline"
+
+
+class WarehousePipeline:
+    """Pipeline for storing every scraped meeting in a :class:`MeetingWarehouse`.
+
+    Enabled with the ``CITY_SCRAPERS_WAREHOUSE_PATH`` setting. Each crawl is recorded
+    as a run, and the number of meetings created, updated and unchanged since previous
+    runs are added to the crawl stats under ``warehouse/``.
+
+    If the ``CITY_SCRAPERS_CHANGES_DIR`` setting is also set, the changes recorded in
+    each run are appended to a :class:`ChangeFeed` for the spider in that directory
+    once the spider closes.
+
+    When ``OpenCivicDataPipeline`` is enabled, meetings without an OCD ID from a diff
+    pipeline are given their previously stored ID or a new one before they're stored,
+    so the stored ID is the same one ``OpenCivicDataPipeline`` outputs.
+    """
+
+    commit_every = 500
+
+    def __init__(self, crawler, path, changes_dir=None, assign_ids=False):
+        self.crawler = crawler
+        self.path = path
+        self.changes_dir = changes_dir
+        self.assign_ids = assign_ids
+        self.warehouse = None
+        self.run_id = None
+        self.start_seq = 0
+        self.uncommitted = 0
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        path = crawler.settings.get("CITY_SCRAPERS_WAREHOUSE_PATH")
+        if not path:
+            raise NotConfigured
+        pipeline = cls(
+            crawler,
+            path,
+            changes_dir=crawler.settings.get("CITY_SCRAPERS_CHANGES_DIR"),
+            assign_ids=OCD_PIPELINE in crawler.settings.getdict("ITEM_PIPELINES"),
+        )
+        crawler.signals.connect(pipeline.spider_closed, signal=signals.spider_closed)
+        return pipeline
+
+    def open_spider(self, spider):
+        self.warehouse = MeetingWarehouse(self.path)
+        self.start_seq = self.warehouse.last_seq()
+        self.run_id = self.warehouse.start_run(spider.name)
+
+    def spider_closed(self, spider, reason):
+        """Record the finish reason, which isn't available in close_spider"""
+        if self.warehouse is not None:
+            self.warehouse.finish_run(self.run_id, reason)
+            if self.changes_dir:
+                feed = ChangeFeed(
+                    os.path.join(self.changes_dir, "{}.jsonl".format(spider.name))
+                )
+                count = feed.append(
+                    self.warehouse.changes(self.start_seq, spider_name=spider.name)
+                )
+                self.crawler.stats.set_value("changes/count", count, spider=spider)
+            self.warehouse.close()
+            self.warehouse = None
+
+    def process_item(self, item, spider):
+        if not isinstance(item, Meeting):
+            return item
+        if self.assign_ids and not item.get("_id"):
+            # Bypass __setitem__ on Meeting like DiffPipeline
+            item._values["_id"] = self._stored_id(item) or "ocd-event/" + str(uuid1())
+        result = self.warehouse.upsert(self.run_id, spider, item)
+        self.crawler.stats.inc_value("warehouse/{}".format(result), spider=spider)
+        self.uncommitted += 1
+        if self.uncommitted >= self.commit_every:
+            self.warehouse.commit()
+            self.uncommitted = 0
+        return item
+
+    def _stored_id(self, item):
+        stored = self.warehouse.get(item["id"])
+        if stored is not None:
+            return stored.get("_id")
+
+
+class WarehouseDiffPipeline(DiffPipeline):
+    """Implements ``DiffPipeline`` with the meetings stored by
+    :class:`WarehousePipeline`, which needs to be enabled with the same
+    ``CITY_SCRAPERS_WAREHOUSE_PATH``.
+
+    Unlike loading the latest feed, this doesn't depend on when feeds were last
+    stored. If no meetings with OCD IDs are stored for the spider yet, results are
+    loaded with the diff pipeline in the ``CITY_SCRAPERS_DIFF_FALLBACK`` setting if
+    it's set.
+    """
+
+    def __init__(self, crawler, output_format):
+        self.path = crawler.settings.get("CITY_SCRAPERS_WAREHOUSE_PATH")
+        if not self.path:
+            raise NotConfigured
+        self.fallback = crawler.settings.get("CITY_SCRAPERS_DIFF_FALLBACK")
+        super().__init__(crawler, output_format)
+
+    def load_previous_results(self):
+        spider = self.crawler.spider
+        warehouse = MeetingWarehouse(self.path)
+        try:
+            meetings = [
+                meeting
+                for meeting in warehouse.meetings(spider_name=spider.name)
+                if meeting.get("_id")
+            ]
+        finally:
+            warehouse.close()
+        if not meetings and self.fallback:
+            fallback = load_object(self.fallback)(self.crawler, self.output_format)
+            return fallback.load_previous_results()
+        ocd_pipeline = OpenCivicDataPipeline()
+        return [ocd_pipeline.process_item(meeting, spider) for meeting in meetings]
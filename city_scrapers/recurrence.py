@@ -0,0 +1,142 @@
+import re
+from datetime import datetime, time
+from functools import lru_cache
+
+from dateutil.rrule import FR, MO, MONTHLY, SA, SU, TH, TU, WE, WEEKLY, rrule
+
+from city_scrapers.dates import MONTHS, search_time
+
+WEEKDAYS = {
+    "monday": MO,
+    "tuesday": TU,
+    "wednesday": WE,
+    "thursday": TH,
+    "friday": FR,
+    "saturday": SA,
+    "sunday": SU,
+}
+
+ORDINALS = {
+    "1st": 1,
+    "first": 1,
+    "2nd": 2,
+    "second": 2,
+    "3rd": 3,
+    "third": 3,
+    "4th": 4,
+    "fourth": 4,
+    "5th": 5,
+    "fifth": 5,
+    "last": -1,
+}
+
+ORDINAL_PATTERN = r"(?:{})".format("|".join(ORDINALS))
+WEEKDAY_PATTERN = r"(?P<weekday>{})s?".format("|".join(WEEKDAYS))
+
+# Matches schedules like "3rd Thursday", "first and third Tuesday" and "last Friday"
+ORDINALS_PATTERN = r"(?P<ordinals>{0}(?:\s*(?:,|,?\s*and|&)\s*{0})*)".format(
+    ORDINAL_PATTERN
+)
+ORDINAL_WEEKDAY_RE = re.compile(
+    r"\b{}\s+{}\b".format(ORDINALS_PATTERN, WEEKDAY_PATTERN), flags=re.IGNORECASE
+)
+# Matches a list of months following a schedule like "of January, April and July"
+MONTH_PATTERN = r"(?:{})\b\.?".format("|".join(MONTHS))
+MONTHS_RE = re.compile(
+    r"\s+(?:of|in)\s+(?P<months>{0}(?:\s*(?:,|,?\s*and|&)\s*{0})*)".format(
+        MONTH_PATTERN
+    ),
+    flags=re.IGNORECASE,
+)
+MONTH_RE = re.compile(r"({})\b".format("|".join(MONTHS)), flags=re.IGNORECASE)
+# Matches weekly schedules like "every Monday" or "Wednesdays"
+WEEKLY_RE = re.compile(
+    r"\b(?:every\s+{weekday}|(?P<plural>{days})s)\b".format(
+        weekday=WEEKDAY_PATTERN, days="|".join(WEEKDAYS)
+    ),
+    flags=re.IGNORECASE,
+)
+ORDINAL_RE = re.compile(ORDINAL_PATTERN, flags=re.IGNORECASE)
+
+
+class Recurrence:
+    """Meeting schedule described in text like "3rd Thursday of the month at 6pm",
+    expanded into meeting start datetimes for any window of time.
+    """
+
+    def __init__(self, freq, weekdays, start_time=None, months=None):
+        self.freq = freq
+        self.weekdays = tuple(weekdays)
+        self.time = start_time or time(0)
+        self.months = tuple(months) if months else None
+
+    def _key(self):
+        return (self.freq, self.weekdays, self.time, self.months)
+
+    def __eq__(self, other):
+        return isinstance(other, Recurrence) and self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return "Recurrence(freq={}, weekdays={}, time={}, months={})".format(
+            *self._key()
+        )
+
+    def between(self, start, end):
+        """Lazily generate meeting start datetimes from start through end inclusive.
+
+        :param start: Date or datetime at the beginning of the window
+        :param end: Date or datetime at the end of the window
+        :return: Generator of naive datetimes in order
+        """
+        return iter(
+            rrule(
+                self.freq,
+                byweekday=self.weekdays,
+                bymonth=self.months,
+                byhour=self.time.hour,
+                byminute=self.time.minute,
+                bysecond=0,
+                dtstart=_as_datetime(start, time(0)),
+                until=_as_datetime(end, time.max),
+            )
+        )
+
+
+def _as_datetime(value, default_time):
+    if isinstance(value, datetime):
+        return value
+    return datetime.combine(value, default_time)
+
+
+@lru_cache(maxsize=1024)
+def parse_recurrence(text):
+    """Parse a meeting schedule like "1st and 3rd Tuesdays at 6:30pm", "2nd Monday of
+    January, April, July and October" or "every Monday, 10 a.m." from text, returning
+    None if there isn't one. The start time defaults to midnight if the text doesn't
+    include one.
+    """
+    start_time = search_time(text)
+    ordinal_match = ORDINAL_WEEKDAY_RE.search(text)
+    if ordinal_match:
+        weekday = WEEKDAYS[ordinal_match.group("weekday").lower()]
+        weekdays = [
+            weekday(ORDINALS[ordinal.lower()])
+            for ordinal in ORDINAL_RE.findall(ordinal_match.group("ordinals"))
+        ]
+        months_match = MONTHS_RE.match(text, ordinal_match.end())
+        months = None
+        if months_match:
+            months = sorted(
+                {
+                    MONTHS[month.lower()]
+                    for month in MONTH_RE.findall(months_match.group("months"))
+                }
+            )
+        return Recurrence(MONTHLY, weekdays, start_time, months)
+    weekly_match = WEEKLY_RE.search(text)
+    if weekly_match:
+        weekday_str = weekly_match.group("weekday") or weekly_match.group("plural")
+        return Recurrence(WEEKLY, [WEEKDAYS[weekday_str.lower()]], start_time)
@@ -0,0 +1,383 @@
+import logging
+import re
+from functools import lru_cache
+
+from parsel import Selector, SelectorList
+from scrapy.http import HtmlResponse
+from scrapy.selector import Selector as ScrapySelector
+
+logger = logging.getLogger(__name__)
+
+PSEUDO_ELEMENT_RE = re.compile(r"::(?:(?P<text>text)|attr\((?P<attr>[^)]+)\))\s*$")
+COMBINATOR_RE = re.compile(r"\s*[\s>+~]\s*")
+COMPOUND_TAG_RE = re.compile(r"[a-zA-Z][\w-]*")
+SIMPLE_SELECTOR_RE = re.compile(
+    r"^(?P<tag>[a-zA-Z][\w-]*)?(?:#(?P<id>[\w-]+)|\.(?P<cls>[\w-]+))?$"
+)
+# Lookaheads for start tags with an id or a class among the tokens in their class
+ID_ATTR_PATTERN = r"(?=[^>]*?\sid\s*=\s*[\"']?{}[\"'\s/>])"
+CLASS_ATTR_PATTERN = (
+    r"(?=[^>]*?\sclass\s*=\s*(?P<quote>[\"'])"
+    r"(?:[^\"'>]*\s)?{}(?:\s[^\"'>]*)?(?P=quote))"
+)
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta"}
+
+
+def lexbor_available():
+    try:
+        import selectolax.lexbor  # noqa
+    except ImportError:
+        return False
+    return True
+
+
+@lru_cache(maxsize=None)
+def _start_tag_re(selector):
+    """Return a pattern matching start tags for a simple selector like "div",
+    "#content", ".entry-content" or "div.entry-content"
+    """
+    match = SIMPLE_SELECTOR_RE.match(selector)
+    if not match or not any(match.groups()):
+        raise ValueError("Unsupported region selector: {}".format(selector))
+    pattern = r"<(?P<tag>{})(?=[\s/>])".format(
+        re.escape(match.group("tag") or "") or r"[a-zA-Z][\w-]*"
+    )
+    if match.group("id"):
+        pattern += ID_ATTR_PATTERN.format(re.escape(match.group("id")))
+    if match.group("cls"):
+        pattern += CLASS_ATTR_PATTERN.format(re.escape(match.group("cls")))
+    return re.compile(pattern + r"[^>]*>", flags=re.IGNORECASE)
+
+
+def _find_start_tag(text, selector, pos):
+    """Return a match for the next start tag for selector in text after pos. Ids and
+    classes are found with a substring search first, which is much faster than
+    checking the pattern at every tag in the page.
+    """
+    start_re = _start_tag_re(selector)
+    literal = selector.lstrip("#.").split("#")[-1].split(".")[-1]
+    if literal == selector:
+        return start_re.search(text, pos)
+    while True:
+        idx = text.find(literal, pos)
+        if idx == -1:
+            return None
+        tag_start = text.rfind("<", pos, idx)
+        if tag_start != -1:
+            match = start_re.match(text, tag_start)
+            if match and match.end() > idx:
+                return match
+        pos = idx + len(literal)
+
+
+@lru_cache(maxsize=None)
+def _tag_re(tag):
+    return re.compile(r"<(/?){}(?=[\s/>])[^>]*>".format(re.escape(tag)), re.IGNORECASE)
+
+
+def _element_end(text, tag, pos):
+    """Return the end of the element with a start tag ending at pos, or None if its
+    end tag can't be found
+    """
+    if tag.lower() in VOID_TAGS:
+        return pos
+    depth = 1
+    tag_re = _tag_re(tag)
+    for match in tag_re.finditer(text, pos):
+        if match.group(1):
+            depth -= 1
+            if depth == 0:
+                return match.end()
+        elif not match.group().endswith("/>"):
+            depth += 1
+
+
+def extract_region(text, region):
+    """Return a document with only the elements in an HTML string matching region,
+    a comma-separated list of simple selectors, in their original order. Elements
+    are found with a scan of the raw text rather than by parsing the page, so None
+    is returned if nothing matches or an element's end can't be found, and the
+    whole page should be parsed instead.
+    """
+    spans = []
+    for selector in region.split(","):
+        selector = selector.strip()
+        pos = 0
+        while True:
+            match = _find_start_tag(text, selector, pos)
+            if not match:
+                break
+            end = _element_end(text, match.group("tag"), match.end())
+            if end is None:
+                return None
+            spans.append((match.start(), end))
+            pos = end
+    if not spans:
+        return None
+    parts = []
+    last_end = 0
+    for start, end in sorted(spans):
+        # Skip elements nested inside an element that's already included
+        if start >= last_end:
+            parts.append(text[start:end])
+            last_end = end
+    return "<html><body>{}</body></html>".format("".join(parts))
+
+
+class LexborSelectorList(list):
+    """List of :class:`LexborSelector` objects with the parts of parsel's
+    ``SelectorList`` API that spiders use
+    """
+
+    def __getitem__(self, index):
+        result = super().__getitem__(index)
+        if isinstance(index, slice):
+            return self.__class__(result)
+        return result
+
+    def css(self, query):
+        return self.__class__(selector for item in self for selector in item.css(query))
+
+    def xpath(self, query):
+        return SelectorList(selector for item in self for selector in item.xpath(query))
+
+    def getall(self):
+        return [item.get() for item in self]
+
+    extract = getall
+
+    def get(self, default=None):
+        for item in self:
+            return item.get()
+        return default
+
+    extract_first = get
+
+    def re(self, regex):
+        return [match for item in self for match in item.re(regex)]
+
+    def re_first(self, regex, default=None):
+        for match in self.re(regex):
+            return match
+        return default
+
+    @property
+    def attrib(self):
+        for item in self:
+            return item.attrib
+        return {}
+
+
+class LexborSelector:
+    """Selector backed by the lexbor HTML5 parser from the optional ``selectolax``
+    package, which parses large pages several times faster than lxml.
+
+    It supports the subset of parsel's ``Selector`` API that spiders use: ``css``
+    queries with ``::text`` and ``::attr(name)`` pseudo-elements, ``get``/``getall``
+    (and ``extract``/``extract_first``), ``re``/``re_first`` and ``attrib``. Other
+    than text and attributes, differences from parsel are that selectors with
+    descendant combinators are matched against the whole document rather than only
+    inside the selected element, pseudo-elements can't be used in selector groups
+    separated by commas, serialized HTML and whitespace outside of ``body`` can
+    differ, and ``xpath`` falls back to parsel, parsing the HTML of elements again
+    when it's called on them.
+    """
+
+    def __init__(self, text=None, node=None, value=None, root=None):
+        if node is None and value is None:
+            from selectolax.lexbor import LexborHTMLParser
+
+            node = LexborHTMLParser(text).root
+            self._text = text
+        self.node = node
+        self.value = value
+        self._root = root
+
+    def css(self, query):
+        """Select elements, or text and attribute values with ``::text`` and
+        ``::attr(name)``, following parsel's translation of those pseudo-elements
+        """
+        if self.node is None:
+            return LexborSelectorList()
+        match = PSEUDO_ELEMENT_RE.search(query)
+        base_query = query[: match.start()].strip() if match else query.strip()
+        if match and match.group("attr"):
+            name = match.group("attr")
+            return LexborSelectorList(
+                self._child(value=node.attributes[name] or "")
+                for node in self._select(base_query or "*")
+                if name in node.attributes
+            )
+        if match:
+            # parsel treats "*::text" and "<selector> *::text" as every descendant
+            # text node, and "<selector>::text" as only direct child text nodes
+            ancestor_query = base_query[:-1].rstrip()
+            if base_query in ("", "*"):
+                texts = self._descendant_text([self.node])
+            elif base_query.endswith(" *") and ancestor_query[-1] not in ">+~":
+                texts = self._descendant_text(self._select(ancestor_query))
+            else:
+                texts = self._child_text(self._select(base_query))
+            return LexborSelectorList(self._child(value=text) for text in texts)
+        return LexborSelectorList(
+            self._child(node=node) for node in self._select(base_query)
+        )
+
+    def _select(self, query):
+        """Return elements matching query, including the element itself like parsel"""
+        nodes = self.node.css(query)
+        if self._matches_self(query):
+            nodes.insert(0, self.node)
+        return nodes
+
+    def _matches_self(self, query):
+        parent = self.node.parent
+        if parent is None:
+            return False
+        # Skip searching the parent when the query ends with another tag
+        tag = COMPOUND_TAG_RE.match(COMBINATOR_RE.split(query.strip())[-1])
+        if tag and "," not in query and tag.group().lower() != self.node.tag:
+            return False
+        return any(node.mem_id == self.node.mem_id for node in parent.css(query))
+
+    def _child_text(self, nodes):
+        for node in nodes:
+            for child in node.iter(include_text=True):
+                if child.tag == "-text":
+                    yield child.text_content
+
+    def _descendant_text(self, nodes):
+        """Yield every text node inside nodes once in document order, skipping nodes
+        nested inside other nodes in the list
+        """
+        node_ids = {node.mem_id for node in nodes}
+        for node in nodes:
+            parent = node.parent
+            while parent is not None and parent.mem_id not in node_ids:
+                parent = parent.parent
+            if parent is not None:
+                continue
+            for child in node.traverse(include_text=True):
+                if child.tag == "-text":
+                    yield child.text_content
+
+    def _child(self, node=None, value=None):
+        return self.__class__(node=node, value=value, root=self._root or self)
+
+    def xpath(self, query):
+        """Run an xpath query with parsel, on the document or on a copy of an
+        element parsed from its HTML
+        """
+        if self._root is None:
+            return Selector(text=self._text).xpath(query)
+        if self.node is None:
+            raise ValueError("xpath can't be used on text or attribute values")
+        # The element is the first one with its tag in a document parsed from its
+        # HTML, which lets relative queries start from it like they would in parsel
+        document = Selector(text=self.node.html)
+        element = document.xpath("//{}[1]".format(self.node.tag))
+        return (element[0] if element else document).xpath(query)
+
+    def get(self):
+        if self.value is not None:
+            return self.value
+        return self.node.html
+
+    extract = get
+
+    def getall(self):
+        return [self.get()]
+
+    def re(self, regex):
+        if isinstance(regex, str):
+            regex = re.compile(regex)
+        text = self.get()
+        matches = []
+        for match in regex.finditer(text):
+            if regex.groups:
+                matches.extend(group for group in match.groups() if group is not None)
+            else:
+                matches.append(match.group())
+        return matches
+
+    def re_first(self, regex, default=None):
+        for match in self.re(regex):
+            return match
+        return default
+
+    @property
+    def attrib(self):
+        if self.node is None:
+            return {}
+        return {name: value or "" for name, value in self.node.attributes.items()}
+
+
+class ParserBackendMiddleware:
+    """Downloader middleware that controls how HTML responses are parsed, so
+    callbacks calling ``response.css`` use a faster backend or a smaller document.
+
+    Spiders can set an ``html_parser`` attribute for an alternative backend. The
+    only backend is "lexbor", which uses :class:`LexborSelector` if the
+    ``selectolax`` package is installed and falls back to parsel otherwise.
+    Callbacks for these spiders should pass URLs rather than selectors to
+    ``response.follow``.
+
+    Spiders can also set an ``html_region`` attribute to only parse the part of each
+    page they use, either as a selector for every response or a dict mapping
+    callback names to selectors. Regions are comma-separated lists of simple
+    selectors (a tag, id or class) passed to :func:`extract_region`, and queries in
+    callbacks can't depend on anything outside of them. ``response.text`` is
+    unchanged, and the whole page is parsed if a region isn't found.
+    """
+
+    backends = {"lexbor": (LexborSelector, lexbor_available)}
+
+    def __init__(self, stats=None):
+        self.stats = stats
+        self.warned = set()
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(stats=crawler.stats)
+
+    def process_response(self, request, response, spider):
+        if not isinstance(response, HtmlResponse):
+            return response
+        selector_cls = self.get_selector_cls(spider)
+        region = self.get_region(request, spider)
+        if selector_cls is None and not region:
+            return response
+        text = response.text
+        if region:
+            region_text = extract_region(text, region)
+            self._inc_stats(
+                "html_region/missed" if region_text is None else "html_region/parsed",
+                spider,
+            )
+            text = region_text or text
+        response._cached_selector = (selector_cls or ScrapySelector)(text=text)
+        return response
+
+    def get_selector_cls(self, spider):
+        backend = getattr(spider, "html_parser", None)
+        if not backend:
+            return None
+        selector_cls, available = self.backends[backend]
+        if available():
+            return selector_cls
+        if backend not in self.warned:
+            logger.warning(
+                "%s HTML parser unavailable, falling back to parsel", backend
+            )
+            self.warned.add(backend)
+
+    def get_region(self, request, spider):
+        region = getattr(spider, "html_region", None)
+        if isinstance(region, dict):
+            callback = request.callback if request is not None else None
+            return region.get(getattr(callback, "__name__", "parse"))
+        return region
+
+    def _inc_stats(self, key, spider):
+        if self.stats is not None:
+            self.stats.inc_value(key, spider=spider)
@@ -8,6 +8,8 @@ ITEM_PIPELINES = {
 }
 
 SPIDER_MIDDLEWARES = {
+    "city_scrapers.middleware.RequestPhaseMiddleware": 100,
+    "city_scrapers.middleware.MeetingLinkJoinMiddleware": 600,
     "city_scrapers.middleware.CityScrapersWaybackMiddleware": 500,
 }
 
@@ -35,23 +35,92 @@ AUTOTHROTTLE_TARGET_CONCURRENCY = float(
 # Configure item pipelines
 ITEM_PIPELINES = {
     "city_scrapers_core.pipelines.MeetingPipeline": 300,
+    "city_scrapers.pipelines.WarehousePipeline": 350,
     # "city_scrapers_core.pipelines.ValidationPipeline": 400,
 }
 
-SPIDER_MIDDLEWARES = {}
+SPIDER_MIDDLEWARES = {
+    "city_scrapers.middleware.RequestPhaseMiddleware": 100,
+    "city_scrapers.middleware.MeetingLinkJoinMiddleware": 600,
+    "city_scrapers.middleware.FinalizedDetailMiddleware": 700,
+}
 
 CITY_SCRAPERS_ARCHIVE = os.getenv("CITY_SCRAPERS_ARCHIVE") is not None
 
+# Directory for storing meetings from detail pages that won't change, skipping them
+# in later crawls for spiders with skip_finalized set
+CITY_SCRAPERS_FINALIZED_DIR = os.getenv("CITY_SCRAPERS_FINALIZED_DIR")
+
+# SQLite database for storing every scraped meeting along with its history across runs
+CITY_SCRAPERS_WAREHOUSE_PATH = os.getenv("CITY_SCRAPERS_WAREHOUSE_PATH")
+
+# Backend for keeping state like the warehouse between runs with the syncstate
+# command, copying to CITY_SCRAPERS_STATE_DIR locally
+CITY_SCRAPERS_STATE_BACKEND = "city_scrapers.state.LocalStateBackend"
+CITY_SCRAPERS_STATE_DIR = os.getenv("CITY_SCRAPERS_STATE_DIR")
+
+# Directory for appending each run's warehouse changes to a JSON lines file per
+# spider, kept between runs along with the warehouse by the syncstate command
+CITY_SCRAPERS_CHANGES_DIR = os.getenv("CITY_SCRAPERS_CHANGES_DIR")
+
 DOWNLOADER_MIDDLEWARES = {
+    "city_scrapers.selectors.ParserBackendMiddleware": 100,
     "scrapy.downloadermiddlewares.robotstxt.RobotsTxtMiddleware": 543,
+    "city_scrapers.middleware.HostCircuitBreakerMiddleware": 560,
 }
 
-COMMANDS_MODULE = "city_scrapers_core.commands"
+# Consecutive failed requests to a host before requests to it fail fast for every
+# spider in the process, and seconds to wait before probing the host again
+CITY_SCRAPERS_CIRCUIT_FAILURES = int(os.getenv("CITY_SCRAPERS_CIRCUIT_FAILURES", 5))
+CITY_SCRAPERS_CIRCUIT_COOLDOWN = float(
+    os.getenv("CITY_SCRAPERS_CIRCUIT_COOLDOWN", 60.0)
+)
+
+# Directory for sharing open circuits with spiders crawled in separate processes
+CITY_SCRAPERS_CIRCUIT_DIR = os.getenv("CITY_SCRAPERS_CIRCUIT_DIR")
+
+COMMANDS_MODULE = "city_scrapers.commands"
+
+FEED_STORAGES = {
+    "chunked-file": "city_scrapers.feedstorage.LocalChunkedFeedStorage",
+    "digest-file": "city_scrapers.feedstorage.LocalDigestFeedStorage",
+}
+
+# Compression ("gzip", "zstd" or "none") and block size in bytes for chunked feeds
+CITY_SCRAPERS_FEED_COMPRESSION = os.getenv("CITY_SCRAPERS_FEED_COMPRESSION", "gzip")
+CITY_SCRAPERS_FEED_BLOCK_SIZE = int(
+    os.getenv("CITY_SCRAPERS_FEED_BLOCK_SIZE", 4 * 1024 * 1024)
+)
+
+# Directory for manifests of the last feed stored for each spider with digest-file
+CITY_SCRAPERS_FEED_MANIFEST_DIR = os.getenv("CITY_SCRAPERS_FEED_MANIFEST_DIR")
+
+# Days an unchanged feed can go without being stored again, which must stay within
+# the 3 days of previous feeds AzureDiffPipeline looks through
+CITY_SCRAPERS_FEED_MAX_SKIP_DAYS = float(
+    os.getenv("CITY_SCRAPERS_FEED_MAX_SKIP_DAYS", 2)
+)
 
 EXTENSIONS = {
+    "city_scrapers.extensions.BatchedStatusExtension": 100,
+    "city_scrapers.extensions.ReactorWatchdogExtension": 200,
     "scrapy.extensions.closespider.CloseSpider": None,
 }
 
+# Backend for publishing spider statuses, writing to CITY_SCRAPERS_STATUS_DIR locally
+CITY_SCRAPERS_STATUS_BACKEND = "city_scrapers.extensions.LocalStatusBackend"
+CITY_SCRAPERS_STATUS_DIR = os.getenv("CITY_SCRAPERS_STATUS_DIR")
+
+# Directory for recording each spider's status when spiders are run in separate
+# processes, published together with the publishstatus command
+CITY_SCRAPERS_STATUS_SHARD_DIR = os.getenv("CITY_SCRAPERS_STATUS_SHARD_DIR")
+
+# Seconds the reactor can be blocked by synchronous work before the stack is logged
+# and counted in stats, or 0 to disable the watchdog
+CITY_SCRAPERS_WATCHDOG_THRESHOLD = float(
+    os.getenv("CITY_SCRAPERS_WATCHDOG_THRESHOLD", 1.0)
+)
+
 CLOSESPIDER_ERRORCOUNT = 5
 
 logging.getLogger("pdfminer").propagate = False
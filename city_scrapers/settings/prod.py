@@ -6,16 +6,21 @@ USER_AGENT = "City Scrapers [production mode]. Learn more and say hello at https
 
 # Configure item pipelines
 ITEM_PIPELINES = {
-    "city_scrapers_core.pipelines.AzureDiffPipeline": 300,
+    "city_scrapers.pipelines.WarehouseDiffPipeline": 300,
     "city_scrapers_core.pipelines.MeetingPipeline": 400,
+    "city_scrapers.pipelines.WarehousePipeline": 450,
     "city_scrapers_core.pipelines.OpenCivicDataPipeline": 500,
 }
 
+# Load previous results from the latest feed until the warehouse has OCD IDs
+CITY_SCRAPERS_DIFF_FALLBACK = "city_scrapers_core.pipelines.AzureDiffPipeline"
+
 SENTRY_DSN = os.getenv("SENTRY_DSN")
 
 EXTENSIONS = {
     "scrapy_sentry.extensions.Errors": 10,
-    "city_scrapers_core.extensions.AzureBlobStatusExtension": 100,
+    "city_scrapers.extensions.BatchedStatusExtension": 100,
+    "city_scrapers.extensions.ReactorWatchdogExtension": 200,
     "scrapy.extensions.closespider.CloseSpider": None,
 }
 
@@ -27,15 +32,21 @@ FEED_EXPORTERS = {
 FEED_FORMAT = "jsonlines"
 
 FEED_STORAGES = {
-    "azure": "city_scrapers_core.extensions.azure_storage.AzureBlobFeedStorage",
+    "azure": "city_scrapers.feedstorage.AzureDigestFeedStorage",
+    "chunked-azure": "city_scrapers.feedstorage.AzureChunkedFeedStorage",
 }
 
 AZURE_ACCOUNT_NAME = os.getenv("AZURE_ACCOUNT_NAME")
 AZURE_ACCOUNT_KEY = os.getenv("AZURE_ACCOUNT_KEY")
 AZURE_CONTAINER = os.getenv("AZURE_CONTAINER")
 
+CITY_SCRAPERS_STATUS_BACKEND = "city_scrapers.extensions.AzureStatusBackend"
 CITY_SCRAPERS_STATUS_CONTAINER = os.getenv("AZURE_STATUS_CONTAINER")
 
+CITY_SCRAPERS_STATE_BACKEND = "city_scrapers.state.AzureStateBackend"
+CITY_SCRAPERS_STATE_CONTAINER = AZURE_CONTAINER
+CITY_SCRAPERS_STATE_PREFIX = "state/"
+
 FEED_URI = (
     "azure://{account_name}:{account_key}@{container}"
     "/%(year)s/%(month)s/%(day)s/%(hour_min)s/%(name)s.json"
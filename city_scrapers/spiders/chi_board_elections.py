@@ -5,6 +5,8 @@ from city_scrapers_core.constants import COMMISSION
 from city_scrapers_core.items import Meeting
 from city_scrapers_core.spiders import CityScrapersSpider
 
+DATE_RE = re.compile(r"(–|- |-)(.+[0-9]{4})")
+
 
 class ChiBoardElectionsSpider(CityScrapersSpider):
     name = "chi_board_elections"
@@ -70,62 +72,65 @@ class ChiBoardElectionsSpider(CityScrapersSpider):
 
     def _prev_meetings(self, response):
         """
-        Meetingdate regex first searches for the 3 types of hyphens that
-        chi_board_elections uses (they like switching it up), and then finds a year
-        number, and returns everything in between.
+        Parse previous meetings in a single pass over the page's links and text,
+        merging each entry's links into the previous meeting when they share a start
+        (a minutes entry followed by its video).
         """
-
-        items = response.xpath("//a|//span/text()").extract()
-        prev_start = None
         six_months_ago = datetime.now() - timedelta(days=180)
-        for item in items:
-            next_idx = items.index(item) + 1
+        archive = self.settings.getbool("CITY_SCRAPERS_ARCHIVE")
+        meeting = None
+        for item in response.xpath("//a|//span/text()").extract():
             item = item.replace("\xa0", " ")  # Gets rid of non-breaking space character
             try:
-                item_date = re.search(r"(–|- |-)(.+[0-9]{4})", item).group(2)
-                while len(item_date) > 30:
-                    item_date = re.search(r"(–|- |-)(.+[0-9]{4})", item_date).group(2)
-                item_date.lstrip()
-                start = self._parse_start(item_date, item)
-                if start < six_months_ago and not self.settings.getbool(
-                    "CITY_SCRAPERS_ARCHIVE"
-                ):
+                item_date = self._parse_item_date(item)
+                if item_date is None:  # Sometimes meetings will return None
                     continue
-                if prev_start != start:  # To acount for duplicates
-                    meeting = Meeting(
-                        title="Electoral Board",
-                        description="",
-                        classification=COMMISSION,
-                        start=start,
-                        end=None,
-                        time_notes="Meeting end time is estimated",
-                        all_day=False,
-                        location=self.location,
-                        links=self._parse_links(response, meeting=item),
-                        source=response.url,
-                    )
-                    # In case there's both minutes and video for one date
-                    if next_idx < len(items):
-                        next_item = items[next_idx].replace("\xa0", " ")
-                        next_date = re.search(r"(–|- |-)(.+[0-9]{4})", next_item).group(
-                            2
-                        )
-                        while len(next_date) > 30:
-                            next_date = re.search(
-                                r"(–|- |-)(.+[0-9]{4})", next_date
-                            ).group(2)
-                        next_date.lstrip()
-                        next_start = self._parse_start(next_date, next_item)
-                        if next_start == meeting["start"] and "href" in next_item:
-                            meeting["links"].extend(
-                                self._parse_links(response, next_item)
-                            )
-                    meeting["status"] = self._get_status(meeting)
-                    meeting["id"] = self._get_id(meeting)
-                    yield meeting
-                prev_start = start
-            except AttributeError:  # Sometimes meetings will return None
+                start = self._parse_start(item_date, item)
+            except AttributeError:  # Skip entries with a date or time we can't parse
                 continue
+            if meeting is not None and start == meeting["start"]:
+                # In case there's both minutes and video for one date
+                if "href" in item:
+                    meeting["links"].extend(self._parse_links(response, item))
+                continue
+            if meeting is not None:
+                yield self._finish_prev_meeting(meeting)
+                meeting = None
+            if start < six_months_ago and not archive:
+                continue
+            meeting = Meeting(
+                title="Electoral Board",
+                description="",
+                classification=COMMISSION,
+                start=start,
+                end=None,
+                time_notes="Meeting end time is estimated",
+                all_day=False,
+                location=self.location,
+                links=self._parse_links(response, meeting=item),
+                source=response.url,
+            )
+        if meeting is not None:
+            yield self._finish_prev_meeting(meeting)
+
+    def _finish_prev_meeting(self, meeting):
+        meeting["status"] = self._get_status(meeting)
+        meeting["id"] = self._get_id(meeting)
+        return meeting
+
+    def _parse_item_date(self, item):
+        """
+        Meeting date regex first searches for the 3 types of hyphens that
+        chi_board_elections uses (they like switching it up), and then finds a year
+        number, and returns everything in between. Returns None if there's no date.
+        """
+        date_match = DATE_RE.search(item)
+        if not date_match:
+            return
+        item_date = date_match.group(2)
+        while len(item_date) > 30:
+            item_date = DATE_RE.search(item_date).group(2)
+        return item_date
 
     def _parse_start(self, date_str, meeting_text):
         """Parse start datetime"""
@@ -7,6 +7,8 @@ from city_scrapers_core.constants import BOARD, COMMITTEE, NOT_CLASSIFIED
 from city_scrapers_core.items import Meeting
 from city_scrapers_core.spiders import CityScrapersSpider
 
+from city_scrapers.jsonstream import iter_json_outputs
+
 
 class ChiBuildingsSpider(CityScrapersSpider):
     name = "chi_buildings"
@@ -29,42 +31,42 @@ class ChiBuildingsSpider(CityScrapersSpider):
         Change the `_parse_title`, `_parse_start`, etc methods to fit your scraping
         needs.
         """
+        yield from iter_json_outputs(response, self._parse_item)
+
+    def _parse_item(self, item):
+        """Yield a request for an event's page if it's a relevant meeting"""
         meeting_types = [
             "admin-opp-committee-meeting",
             "audit-committee",
             "board-meeting",
         ]
 
-        data = json.loads(response.text)
-        for item in data:
-            if item.get("category") != [] and item.get("category")[0] in meeting_types:
-                title, dt_time = self._parse_title_time(item["title"])
-                start = self._parse_dt_time(
-                    self._parse_datetime(item["start"]), dt_time
-                )
-                end = self._parse_dt_time(self._parse_datetime(item["end"]), dt_time)
-                if end <= start or end.day != start.day:
-                    end = None
-                meeting = Meeting(
-                    title=title,
-                    description="",
-                    classification=self._parse_classification(item.get("category")[0]),
-                    start=start,
-                    end=end,
-                    time_notes="",
-                    all_day=False,
-                    source=self._parse_source(item),
-                )
-                meeting["status"] = self._get_status(meeting)
-                meeting["id"] = self._get_id(meeting)
-
-                # Request each relevant event page, including current data in meta attr
-                req = scrapy.Request(
-                    item["url"], callback=self._parse_event, dont_filter=True,
-                )
-                req.meta["meeting"] = meeting
-                req.meta["category"] = item["category"]
-                yield req
+        if item.get("category") != [] and item.get("category")[0] in meeting_types:
+            title, dt_time = self._parse_title_time(item["title"])
+            start = self._parse_dt_time(self._parse_datetime(item["start"]), dt_time)
+            end = self._parse_dt_time(self._parse_datetime(item["end"]), dt_time)
+            if end <= start or end.day != start.day:
+                end = None
+            meeting = Meeting(
+                title=title,
+                description="",
+                classification=self._parse_classification(item.get("category")[0]),
+                start=start,
+                end=end,
+                time_notes="",
+                all_day=False,
+                source=self._parse_source(item),
+            )
+            meeting["status"] = self._get_status(meeting)
+            meeting["id"] = self._get_id(meeting)
+
+            # Request each relevant event page, including current data in meta attr
+            req = scrapy.Request(
+                item["url"], callback=self._parse_event, dont_filter=True,
+            )
+            req.meta["meeting"] = meeting
+            req.meta["category"] = item["category"]
+            yield req
 
     def _parse_title_time(self, title):
         """Return title with time string removed and time if included"""
@@ -6,6 +6,8 @@ from city_scrapers_core.constants import BOARD, COMMITTEE
 from city_scrapers_core.items import Meeting
 from city_scrapers_core.spiders import CityScrapersSpider
 
+from city_scrapers.memo import response_cached
+
 
 class ChiCityCollegeSpider(CityScrapersSpider):
     name = "chi_city_college"
@@ -13,6 +15,7 @@ class ChiCityCollegeSpider(CityScrapersSpider):
     start_urls = [
         "http://www.ccc.edu/events/Pages/default.aspx?dept=Office%20of%20the%20Board%20of%20Trustees",  # noqa
     ]
+    skip_finalized = True
 
     def parse(self, response):
         """
@@ -33,7 +36,7 @@ class ChiCityCollegeSpider(CityScrapersSpider):
             start = self._parse_start(item, date_str)
             title = self._parse_title(item)
             meeting = Meeting(
-                title=self._parse_title(item),
+                title=title,
                 description="",
                 classification=self._parse_classification(title),
                 start=start,
@@ -48,6 +51,7 @@ class ChiCityCollegeSpider(CityScrapersSpider):
             meeting["status"] = self._get_status(meeting)
             yield meeting
 
+    @response_cached
     def _parse_location(self, response):
         """Parse or generate location"""
         loc_parts = [
@@ -89,6 +93,7 @@ class ChiCityCollegeSpider(CityScrapersSpider):
             return COMMITTEE
         return BOARD
 
+    @response_cached
     def _parse_links(self, response):
         """Returns an array of links if available"""
         links = []
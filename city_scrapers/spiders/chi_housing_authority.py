@@ -6,45 +6,53 @@ from city_scrapers_core.constants import BOARD
 from city_scrapers_core.items import Meeting
 from city_scrapers_core.spiders import CityScrapersSpider
 
+from city_scrapers.gather import gather_requests
+
 
 class ChiHousingAuthoritySpider(CityScrapersSpider):
     name = "chi_housing_authority"
     agency = "Chicago Housing Authority"
     timezone = "America/Chicago"
+    html_parser = "lexbor"
     start_urls = [
         "http://www.thecha.org/about/board-meetings-agendas-and-resolutions/board-information-and-meetings",  # noqa
     ]
+    notice_url = "http://www.thecha.org/about/board-meetings-agendas-and-resolutions/board-meeting-notices"  # noqa
+    minutes_url = "http://www.thecha.org/doing-business/contracting-opportunities/view-all/Board%20Meeting"  # noqa
     location = {
         "name": "CHA Corporate Offices",
         "address": "60 E Van Buren St, 7th Floor, Chicago, IL 60605",
     }
 
-    def parse(self, response):
+    def start_requests(self):
+        """Fetch the upcoming meetings, notices and past meetings pages concurrently and
+        combine them once they've all been parsed
         """
-        `parse` should always `yield` Meeting items.
+        yield from gather_requests(
+            [
+                scrapy.Request(url)
+                for url in [self.start_urls[0], self.notice_url, self.minutes_url]
+            ],
+            self._parse_combined,
+        )
+
+    def _parse_combined(self, responses):
+        """
+        `_parse_combined` should always `yield` Meeting items.
 
         Change the `_parse_title`, `_parse_start`, etc methods to fit your scraping
         needs.
         """
-        if "60 East Van Buren" not in response.text:
-            raise ValueError("Meeting address has changed")
-
-        self.upcoming_meetings = self._parse_upcoming(response)
-        yield scrapy.Request(
-            "http://www.thecha.org/about/board-meetings-agendas-and-resolutions/board-meeting-notices",  # noqa
-            callback=self._parse_next,
-            dont_filter=True,
+        upcoming_response, notice_response, minutes_response = responses
+        self._validate_location(upcoming_response)
+        upcoming_meetings = self._parse_notice(
+            notice_response, self._parse_upcoming(upcoming_response)
         )
+        yield from self._parse_combined_meetings(minutes_response, upcoming_meetings)
 
-    def _parse_next(self, response):
-        """Chains previous requests and yields a request to combine all results"""
-        req = scrapy.Request(
-            "http://www.thecha.org/doing-business/contracting-opportunities/view-all/Board%20Meeting",  # noqa
-            callback=self._parse_combined_meetings,
-            dont_filter=True,
-        )
-        self.upcoming_meetings = self._parse_notice(response)
-        yield req
+    def _validate_location(self, response):
+        if "60 East Van Buren" not in response.text:
+            raise ValueError("Meeting address has changed")
 
     def _parse_upcoming(self, response):
         """
@@ -75,11 +83,11 @@ class ChiHousingAuthoritySpider(CityScrapersSpider):
                 date_list.append(date_dict)
         return date_list
 
-    def _parse_notice(self, response):
+    def _parse_notice(self, response, upcoming_meetings):
         """Returns a list of meetings with notice documents added to applicable dates"""
         notice_documents = self._parse_notice_documents(response)
         meetings_list = []
-        for meeting in self.upcoming_meetings:
+        for meeting in upcoming_meetings:
             # Check if the meeting date is in any document title, assign docs if so
             meeting_date_str = "{dt:%B} {dt.day}".format(dt=meeting["start"])
             if any(meeting_date_str in doc["title"] for doc in notice_documents):
@@ -102,12 +110,12 @@ class ChiHousingAuthoritySpider(CityScrapersSpider):
             )
         return notice_documents
 
-    def _parse_combined_meetings(self, response):
+    def _parse_combined_meetings(self, response, upcoming_meetings):
         """Combines upcoming and past meetings and yields results ignoring duplicates"""
         meetings = self._parse_past_meetings(response)
         meeting_dates = set([meeting["start"] for meeting in meetings])
 
-        for meeting in self.upcoming_meetings:
+        for meeting in upcoming_meetings:
             if meeting["start"] not in meeting_dates:
                 meetings.append(meeting)
 
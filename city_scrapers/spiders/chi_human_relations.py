@@ -10,16 +10,15 @@ from city_scrapers_core.spiders import CityScrapersSpider
 from pdfminer.high_level import extract_text_to_fp
 from pdfminer.layout import LAParams
 
+from city_scrapers.locations import get_location, validate_venue
+
 
 class ChiHumanRelationsSpider(CityScrapersSpider):
     name = "chi_human_relations"
     agency = "Chicago Commission on Human Relations"
     timezone = "America/Chicago"
     start_urls = ["https://www.chicago.gov/city/en/depts/cchr.html"]
-    location = {
-        "name": "",
-        "address": "740 N Sedgwick St, 4th Floor Boardroom, Chicago, IL 60654",
-    }
+    location = get_location("cchr")
 
     def __init__(self, *args, **kwargs):
         self.meeting_starts = []
@@ -69,7 +68,7 @@ class ChiHumanRelationsSpider(CityScrapersSpider):
         # Remove duplicate spaces
         clean_text = re.sub(r"\s+", " ", clean_text)
         year_str = re.search(r"\d{4}", clean_text).group()
-        self._validate_location(clean_text)
+        validate_venue(clean_text, "cchr", "zoom")
 
         for date_str in re.findall(r"[A-Z]{3,10}\s+\d{1,2}(?!\d)", clean_text):
             self.meeting_starts.append(self._parse_start(date_str, year_str))
@@ -133,12 +132,5 @@ class ChiHumanRelationsSpider(CityScrapersSpider):
 
     def _parse_location(self, text):
         if "Zoom" in text:
-            return {
-                "name": "Zoom (see website for details)",
-                "address": "",
-            }
+            return get_location("zoom")
         return self.location
-
-    def _validate_location(self, text):
-        if "740" not in text and "Zoom" not in text:
-            raise ValueError("Meeting location has changed")
@@ -6,11 +6,14 @@ from city_scrapers_core.constants import BOARD
 from city_scrapers_core.items import Meeting
 from city_scrapers_core.spiders import CityScrapersSpider
 
+from city_scrapers.locations import chicago_address, normalize_location
+
 
 class ChiLibrarySpider(CityScrapersSpider):
     name = "chi_library"
     agency = "Chicago Public Library"
     timezone = "America/Chicago"
+    html_region = "#content"
     start_urls = [
         "https://www.chipublib.org/board-of-directors/board-meeting-schedule/"
     ]
@@ -58,17 +61,12 @@ class ChiLibrarySpider(CityScrapersSpider):
         Parse or generate location. Url, latitutde and longitude are all
         optional and may be more trouble than they're worth to collect.
         """
-        addr_str = item.css("::text")[-1].extract().strip()
-        if "virtual" in addr_str.lower():
-            return {
-                "name": "Virtual",
-                "address": "",
+        return normalize_location(
+            {
+                "name": item.css("a::text").extract_first() or "",
+                "address": chicago_address(item.css("::text")[-1].extract()),
             }
-        addr_str = "{} Chicago, IL".format(addr_str)
-        return {
-            "name": item.css("a::text").extract_first() or "",
-            "address": addr_str,
-        }
+        )
 
     def _parse_start(self, item, year):
         """
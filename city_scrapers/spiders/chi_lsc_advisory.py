@@ -11,6 +11,7 @@ class ChiLscAdvisorySpider(CityScrapersSpider):
     name = "chi_lsc_advisory"
     agency = "Chicago Local School Council Advisory Board"
     timezone = "America/Chicago"
+    html_parser = "lexbor"
     start_urls = [
         "https://www.cps.edu/about/local-school-councils/local-school-council-advisory-board/"  # noqa
     ]
@@ -1,4 +1,3 @@
-import json
 import re
 from datetime import datetime, timedelta
 
@@ -6,6 +5,8 @@ from city_scrapers_core.constants import COMMITTEE, POLICE_BEAT
 from city_scrapers_core.items import Meeting
 from city_scrapers_core.spiders import CityScrapersSpider
 
+from city_scrapers.jsonstream import iter_json_outputs
+
 
 class ChiPoliceSpider(CityScrapersSpider):
     name = "chi_police"
@@ -25,38 +26,36 @@ class ChiPoliceSpider(CityScrapersSpider):
         Change the `_parse_title`, `_parse_start`, etc methods to fit your scraping
         needs.
         """
-        try:
-            data = json.loads(response.text)
-        except json.decoder.JSONDecodeError:
-            return
+        yield from iter_json_outputs(response, self._parse_item)
 
+    def _parse_item(self, item):
+        """Yield a meeting for a calendar event if it's a recent Beat or DAC meeting"""
         ninety_days_ago = datetime.now() - timedelta(days=90)
-        for item in data:
-            # Drop events that aren't Beat meetings or DAC meetings
-            classification = self._parse_classification(item)
-            if not classification:
-                continue
-            start = self._parse_start(item)
-            if start < ninety_days_ago and not self.settings.getbool(
-                "CITY_SCRAPERS_ARCHIVE"
-            ):
-                continue
-            end, has_end = self._parse_end(start, item)
-            meeting = Meeting(
-                title=self._parse_title(classification, item),
-                description="",
-                classification=classification,
-                start=start,
-                end=end,
-                time_notes="End estimated 2 hours after start" if not has_end else "",
-                all_day=False,
-                location=self._parse_location(item),
-                links=[],
-                source=self._parse_source(item),
-            )
-            meeting["id"] = self._get_id(meeting, identifier=str(item["calendarId"]))
-            meeting["status"] = self._get_status(meeting)
-            yield meeting
+        # Drop events that aren't Beat meetings or DAC meetings
+        classification = self._parse_classification(item)
+        if not classification:
+            return
+        start = self._parse_start(item)
+        if start < ninety_days_ago and not self.settings.getbool(
+            "CITY_SCRAPERS_ARCHIVE"
+        ):
+            return
+        end, has_end = self._parse_end(start, item)
+        meeting = Meeting(
+            title=self._parse_title(classification, item),
+            description="",
+            classification=classification,
+            start=start,
+            end=end,
+            time_notes="End estimated 2 hours after start" if not has_end else "",
+            all_day=False,
+            location=self._parse_location(item),
+            links=[],
+            source=self._parse_source(item),
+        )
+        meeting["id"] = self._get_id(meeting, identifier=str(item["calendarId"]))
+        meeting["status"] = self._get_status(meeting)
+        yield meeting
 
     def _parse_classification(self, item):
         """Classify meeting as District Advisory Council or Beat meeting."""
@@ -1,15 +1,17 @@
-import re
-from datetime import datetime
+from datetime import date, datetime
 
 from city_scrapers_core.constants import COMMITTEE
 from city_scrapers_core.items import Meeting
 from city_scrapers_core.spiders import CityScrapersSpider
 
+from city_scrapers.recurrence import parse_recurrence
+
 
 class ChiSchoolCommunityActionCouncilSpider(CityScrapersSpider):
     name = "chi_school_community_action_council"
     agency = "Chicago Public Schools"
     timezone = "America/Chicago"
+    html_parser = "lexbor"
     start_urls = [
         "https://www.cps.edu/services-and-supports/parent-engagement/community-action-councils-cacs/"  # noqa
     ]
@@ -21,29 +23,32 @@ class ChiSchoolCommunityActionCouncilSpider(CityScrapersSpider):
         Change the `_parse_title`, `_parse_start`, etc methods to fit your scraping
         needs.
         """
-        # Sets month counter to the current month, passed to parse_start
-        # month_counter = datetime.today().month
-        month = datetime.today().month
-        # Iterates through every month in the year after the current month
+        # Meetings are listed from the start of the current month through the end of
+        # the year
+        today = datetime.today()
+        window_start = date(today.year, today.month, 1)
+        window_end = date(today.year, 12, 31)
         for item in response.css(".smaller-headings .block"):
             source = item.css("a").css("a::attr(href)").extract_first()
             if source and "humboldparkportal.org" in source:
                 continue
             if not source:
                 source = response.url
-            for month_counter in range(month, 13):
-                start = self._parse_start(item, month_counter)
-                if not start:
-                    continue
+            recurrence = self._parse_recurrence(item)
+            if not recurrence:
+                continue
+            title = self._parse_title(item)
+            location = self._parse_location(item)
+            for start in recurrence.between(window_start, window_end):
                 meeting = Meeting(
-                    title=self._parse_title(item),
+                    title=title,
                     description="",
                     classification=COMMITTEE,
                     start=start,
                     end=None,
                     time_notes="",
                     all_day=False,
-                    location=self._parse_location(item),
+                    location=location,
                     links=[],
                     source=source,
                 )
@@ -57,67 +62,9 @@ class ChiSchoolCommunityActionCouncilSpider(CityScrapersSpider):
         comm_area = " ".join(item.css(".h4-style *::text").extract()).strip()
         return f"{comm_area} Community Action Council"
 
-    @staticmethod
-    def parse_weekday(item_text):
-        """
-        Parses the source material and retrieves the day of the week that
-        the meeting occurs.
-        """
-        day_match = re.search(r"[A-Z][a-z]+day", item_text)
-        if not day_match:
-            return
-        return datetime.strptime(day_match.group(), "%A").weekday()
-
-    @staticmethod
-    def parse_time(item_text):
-        """
-        Parses the source material and retrieves the time that the meeting
-        occurs.
-        """
-        time_match = re.search(r"\d{1,2}(:\d\d)? ?[APMapm\.]{2,4}", item_text)
-        if not time_match:
-            return
-        time_str = re.sub(r"[\s\.]", "", time_match.group().lower())
-        time_fmt = "%I%p"
-        if ":" in time_str:
-            time_fmt = "%I:%M%p"
-        return datetime.strptime(time_str, time_fmt).time()
-
-    @staticmethod
-    def count_days(weekday, week_count, month_counter):
-        """
-        Because the source material provides meeting dates on a reoccuring
-        schedule, we must use the parsed day from the parse_day function
-        """
-        today = datetime.today()
-        week_counter = 0
-        for x in range(1, 31):
-            try:
-                current_date = datetime(today.year, month_counter, x)
-                if current_date.weekday() == weekday:
-                    week_counter += 1
-                    if week_counter == week_count:
-                        return current_date
-            except ValueError:
-                break
-
-    def _parse_start(self, item, month_counter):
-        """
-        Parse start date and time.
-        Accepts month_counter as an argument from top level parse function
-        to iterate through all months in the year.
-        """
-        item_text = " ".join(item.css("*::text").extract())
-        weekday = self.parse_weekday(item_text)
-        # Selects first character in the source, usually the week count
-        week_num_match = re.search(r"\d[a-z]{2} [A-Z][a-z]+day", item_text)
-        if not week_num_match:
-            return
-        week_count = re.search(r"\d", week_num_match.group()).group()
-        meeting_date = self.count_days(weekday, int(week_count), month_counter)
-        if not meeting_date:
-            return
-        return datetime.combine(meeting_date.date(), self.parse_time(item_text))
+    def _parse_recurrence(self, item):
+        """Parse the meeting schedule, like "2nd Monday of the month at 5:30pm" """
+        return parse_recurrence(" ".join(item.css("*::text").extract()))
 
     def _parse_location(self, item):
         """Parse or generate location."""
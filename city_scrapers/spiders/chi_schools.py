@@ -6,11 +6,21 @@ from city_scrapers_core.constants import BOARD, COMMITTEE, FORUM
 from city_scrapers_core.items import Meeting
 from city_scrapers_core.spiders import CityScrapersSpider
 
+from city_scrapers.keywords import KeywordMatcher
+from city_scrapers.memo import response_cached
+
 
 class ChiSchoolsSpider(CityScrapersSpider):
     name = "chi_schools"
     agency = "Chicago Public Schools"
     timezone = "America/Chicago"
+    html_region = {
+        "_parse_detail": "#content-primary, #mapAddress",
+        "_parse_calendar": "#content-primary, #mapAddress",
+    }
+    classifications = KeywordMatcher(
+        [("committee", COMMITTEE), ("hearing", FORUM)], default=BOARD
+    )
     start_urls = [
         "https://www.cpsboe.org/meetings/past-meetings",
         "https://www.cpsboe.org/meetings",
@@ -20,27 +30,23 @@ class ChiSchoolsSpider(CityScrapersSpider):
         "address": "42 W Madison St, Chicago, IL 60602",
     }
 
-    @classmethod
-    def from_crawler(cls, crawler, *args, **kwargs):
-        """Connect to spider_idle for when all detail pages are scraped"""
-        spider = super().from_crawler(crawler, *args, **kwargs)
-        spider.meeting_dates = []
-        crawler.signals.connect(spider.spider_idle, signal=scrapy.signals.spider_idle)
-        return spider
-
-    def spider_idle(self):
-        """Parse planning calendar after all detail pages scraped"""
-        self.crawler.signals.disconnect(
-            self.spider_idle, signal=scrapy.signals.spider_idle
-        )
-        self.crawler.engine.crawl(
-            scrapy.Request(
-                "https://www.cpsboe.org/meetings/planning-calendar",
-                callback=self._parse_calendar,
-            ),
-            self,
+    calendar_url = "https://www.cpsboe.org/meetings/planning-calendar"
+    # Parse planning calendar after all detail pages are scraped
+    phases = {"calendar": ["meetings"]}
+    skip_finalized = True
+
+    def __init__(self, *args, **kwargs):
+        self.meeting_dates = []
+        super().__init__(*args, **kwargs)
+
+    def start_requests(self):
+        for url in self.start_urls:
+            yield scrapy.Request(url, callback=self.parse, meta={"phase": "meetings"})
+        yield scrapy.Request(
+            self.calendar_url,
+            callback=self._parse_calendar,
+            meta={"phase": "calendar"},
         )
-        raise scrapy.exceptions.DontCloseSpider
 
     def parse(self, response):
         if "past" in response.url:
@@ -51,6 +57,11 @@ class ChiSchoolsSpider(CityScrapersSpider):
             for link in response.css(".meetings dl a:not(.action)"):
                 yield response.follow(link.attrib["href"], callback=self._parse_detail)
 
+    def parse_finalized(self, meeting):
+        """Track dates of stored meetings so they aren't duplicated from the calendar"""
+        self.meeting_dates.append(meeting["start"].date())
+        return meeting
+
     def _parse_detail(self, response):
         """Parse information from meeting detail pages"""
         title = self._parse_title(response)
@@ -155,11 +166,7 @@ class ChiSchoolsSpider(CityScrapersSpider):
         return self._get_status(meeting, text=description)
 
     def _parse_classification(self, title):
-        if "Committee" in title:
-            return COMMITTEE
-        if "hearing" in title.lower():
-            return FORUM
-        return BOARD
+        return self.classifications.match(title)
 
     def _parse_start(self, dt_str):
         date_match = re.search(r"[A-Z][a-z]{2,8} \d{1,2},? \d{4}", dt_str)
@@ -175,6 +182,7 @@ class ChiSchoolsSpider(CityScrapersSpider):
             dt_fmt = "%B %d %Y %I%p"
         return datetime.strptime(" ".join([date_str, time_str]), dt_fmt)
 
+    @response_cached
     def _parse_location(self, response):
         addr_input = " ".join(response.css("#mapAddress::attr(value)").extract())
         loc_lines = response.css("h2.datetime + p")[:1].css("*::text").extract()
@@ -12,13 +12,14 @@ from city_scrapers_core.items import Meeting
 from city_scrapers_core.spiders import CityScrapersSpider
 from scrapy import Field, Item
 
+from city_scrapers.mixins import CrawlStateMixin
 
-class ChiSsa27Spider(CityScrapersSpider):
+
+class ChiSsa27Spider(CrawlStateMixin, CityScrapersSpider):
     name = "chi_ssa_27"
     agency = "Chicago Special Service Area #27 Lakeview West"
     timezone = "America/Chicago"
     start_urls = ["https://www.lakeviewchamber.com/ssa27"]
-    minutes_list = []
     location = {
         "name": "Sheil Park",
         "address": "3505 N. Southport Ave., Chicago, IL 60657",
@@ -26,7 +27,10 @@ class ChiSsa27Spider(CityScrapersSpider):
 
     def parse(self, response):
         """   `parse` should always `yield` Meeting items. """
-        self.minutes_list = self.get_minutes_panel_items(response)
+        for minutes_item in self.get_minutes_panel_items(response):
+            self.crawl_state.add_by_date(
+                "minutes", minutes_item["date_date"], minutes_item
+            )
         location = self._parse_location(response)
         commission_path = "div #content-232764 div.panel-body p"
 
@@ -113,16 +117,10 @@ class ChiSsa27Spider(CityScrapersSpider):
         d_date = "".join(item_txt.split(",")[0:2])
         date_needed = datetime.strptime(d_date, "%b %d %Y").date()
 
-        try:
-            matched_meets = list(
-                filter(lambda d: d["date_date"] == date_needed, self.minutes_list)
-            )
-            if len(matched_meets) == 0 or not matched_meets[0]["link"]:
-                return []
-            matched_meeting = [{"title": title, "href": matched_meets[0]["link"]}]
-        except IndexError:
+        matched_meets = self.crawl_state.get_by_date("minutes", date_needed)
+        if len(matched_meets) == 0 or not matched_meets[0]["link"]:
             return []
-        return matched_meeting
+        return [{"title": title, "href": matched_meets[0]["link"]}]
 
     def _parse_title(self, item):
         if "Annual Meeting" in "".join(item.css("p::text").getall()):
@@ -5,20 +5,23 @@ from city_scrapers_core.constants import COMMISSION
 from city_scrapers_core.items import Meeting
 from city_scrapers_core.spiders import CityScrapersSpider
 
+from city_scrapers.locations import get_location, validate_venue
+
 
 class ChiSsa61Spider(CityScrapersSpider):
     name = "chi_ssa_61"
     agency = "Chicago Special Service Area #61 Hyde Park"
     timezone = "America/Chicago"
+    html_parser = "lexbor"
+    html_region = ".about-tabs"
     start_urls = ["http://www.downtownhydeparkchicago.com/about/"]
-    location = {
-        "name": "Polsky Center for Innovation",
-        "address": "1452 East 53rd Street, 2nd Floor, Chicago, IL 60615",
-    }
+    location = get_location("polsky_center")
 
     def parse(self, response):
         """Parse meetings on upcoming and minutes pages"""
-        self._validate_location(response)
+        validate_venue(
+            " ".join(response.css(".about-tabs *::text").extract()), "polsky_center"
+        )
         for item in response.css(".about-tabs .active li"):
             text = " ".join(item.css("*::text").extract()).strip()
             if not re.search(r"[ pam\.]{2,5}", text):
@@ -61,10 +64,3 @@ class ChiSsa61Spider(CityScrapersSpider):
         else:
             tm = time(10)
         return datetime.combine(dt, tm)
-
-    def _validate_location(self, response):
-        about_text = re.sub(
-            r"\s+", " ", " ".join(response.css(".about-tabs *::text").extract())
-        )
-        if "Polsky Center" not in about_text:
-            raise ValueError("Meeting location has changed")
@@ -5,12 +5,15 @@ from city_scrapers_core.constants import BOARD, COMMITTEE
 from city_scrapers_core.items import Meeting
 from city_scrapers_core.spiders import LegistarSpider
 
+from city_scrapers.keywords import KeywordMatcher
+
 
 class CookBoardSpider(LegistarSpider):
     name = "cook_board"
     agency = "Cook County Board of Commissioners"
     timezone = "America/Chicago"
     start_urls = ["https://cook-county.legistar.com/Calendar.aspx"]
+    classifications = KeywordMatcher([("board", BOARD)], default=COMMITTEE)
 
     def parse_legistar(self, events):
         three_months_ago = datetime.today() - timedelta(days=90)
@@ -45,10 +48,7 @@ class CookBoardSpider(LegistarSpider):
         Differentiate board and committee meetings
         based on event name.
         """
-        if "board" in name.lower():
-            return BOARD
-        else:
-            return COMMITTEE
+        return self.classifications.match(name)
 
     def _parse_location(self, item):
         """
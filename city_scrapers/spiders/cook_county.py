@@ -12,11 +12,23 @@ from city_scrapers_core.constants import (
 from city_scrapers_core.items import Meeting
 from city_scrapers_core.spiders import CityScrapersSpider
 
+from city_scrapers.keywords import KeywordMatcher
+
 
 class CookCountySpider(CityScrapersSpider):
     name = "cook_county"
     agency = "Cook County Government"
     timezone = "America/Chicago"
+    skip_finalized = True
+    classifications = KeywordMatcher(
+        [
+            (re.compile(r"a(c|dvisory) (committee|council)"), ADVISORY_COMMITTEE),
+            ("board", BOARD),
+            ("committee", COMMITTEE),
+            ("commission", COMMISSION),
+        ],
+        default=NOT_CLASSIFIED,
+    )
 
     def start_requests(self):
         # Only filter for Public Forums (20) in the current and upcoming month
@@ -70,18 +82,8 @@ class CookCountySpider(CityScrapersSpider):
             ).extract()
         ]
 
-    @staticmethod
-    def _parse_classification(name):
-        name = name.upper()
-        if re.search(r"A(C|(DVISORY)) (COMMITTEE|COUNCIL)", name):
-            return ADVISORY_COMMITTEE
-        if "BOARD" in name:
-            return BOARD
-        if "COMMITTEE" in name:
-            return COMMITTEE
-        if "COMMISSION" in name:
-            return COMMISSION
-        return NOT_CLASSIFIED
+    def _parse_classification(self, name):
+        return self.classifications.match(name)
 
     def _parse_location(self, response):
         """
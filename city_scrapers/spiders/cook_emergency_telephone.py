@@ -9,16 +9,15 @@ from city_scrapers_core.spiders import CityScrapersSpider
 from pdfminer.high_level import extract_text_to_fp
 from pdfminer.layout import LAParams
 
+from city_scrapers.locations import get_location, validate_venue
+
 
 class CookEmergencyTelephoneSpider(CityScrapersSpider):
     name = "cook_emergency_telephone"
     agency = "Cook County Emergency Telephone System Board"
     timezone = "America/Chicago"
     start_urls = ["https://www.cookcounty911.com/"]
-    location = {
-        "name": "Conference Room",
-        "address": "1401 S. Maybrook Drive, Maywood, IL 60153",
-    }
+    location = get_location("cook_county_911")
 
     def __init__(self, *args, **kwargs):
         self.meeting_starts = []
@@ -75,7 +74,7 @@ class CookEmergencyTelephoneSpider(CityScrapersSpider):
         # Remove duplicate spaces
         clean_text = re.sub(r"\s+", " ", clean_text)
 
-        self._validate_location(clean_text)
+        validate_venue(clean_text, "cook_county_911")
 
         # Find dates in the format May 20, 2020 10:30 a.m
         DATE_PATTERN = (
@@ -149,7 +148,3 @@ class CookEmergencyTelephoneSpider(CityScrapersSpider):
         )
 
         return links_map
-
-    def _validate_location(self, text):
-        if "Maywood" not in text:
-            raise ValueError("Meeting location has changed")
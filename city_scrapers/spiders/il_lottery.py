@@ -1,11 +1,12 @@
 import re
-from collections import defaultdict
 from datetime import datetime, time
 
 from city_scrapers_core.constants import BOARD
 from city_scrapers_core.items import Meeting
 from city_scrapers_core.spiders import CityScrapersSpider
 
+from city_scrapers.date_index import DateIndex
+
 
 class IlLotterySpider(CityScrapersSpider):
     name = "il_lottery"
@@ -57,7 +58,7 @@ class IlLotterySpider(CityScrapersSpider):
             )
             meeting["id"] = self._get_id(meeting)
             meeting["status"] = self._get_status(meeting, text=item)
-            meeting["links"] = links.get(meeting["start"].date(), [])
+            meeting["links"] = links.get(meeting["start"])
 
             yield meeting
 
@@ -109,10 +110,10 @@ class IlLotterySpider(CityScrapersSpider):
             link_text_substrings: A list with strings that must exist in link text
                 in order to be added to link dictionary
         Return:
-            List of dictionaries with the keys title (title/description of the link)
-            and href (link URL) for the agenda for the meeting on the requested date
+            DateIndex of dictionaries with the keys title (title/description of the
+            link) and href (link URL) for each meeting date
         """
-        link_date_map = defaultdict(list)
+        link_date_map = DateIndex()
         for link in response.xpath("//p//a"):
             link_text_selector = link.xpath("text()")
             if link_text_selector:
@@ -123,11 +124,12 @@ class IlLotterySpider(CityScrapersSpider):
                 ):
                     link_date = self.parse_day(link_text)
                     link_href = link.xpath("@href").get()
-                    link_date_map[link_date].append(
+                    link_date_map.add(
+                        link_date,
                         {
                             "href": response.urljoin(link_href),
                             "title": link_text.replace("\xa0", " "),
-                        }
+                        },
                     )
 
         return link_date_map
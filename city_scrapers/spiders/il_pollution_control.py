@@ -1,4 +1,3 @@
-import json
 import re
 from datetime import datetime
 from io import BytesIO, StringIO
@@ -10,6 +9,12 @@ from city_scrapers_core.spiders import CityScrapersSpider
 from pdfminer.high_level import extract_text_to_fp
 from pdfminer.layout import LAParams
 
+from city_scrapers.dates import parse_date
+from city_scrapers.items import MeetingLinks
+from city_scrapers.jsonstream import iter_json_outputs
+
+MINUTES_DATE_FORMATS = ("%m-%d-%Y", "%m-%d-%y", "%m/%d/%Y", "%m/%d/%y")
+
 
 class IlPollutionControlSpider(CityScrapersSpider):
     name = "il_pollution_control"
@@ -21,33 +26,19 @@ class IlPollutionControlSpider(CityScrapersSpider):
     ]
     json_url = "https://pcb.illinois.gov/ClerksOffice/GetCalendarEvents"
     calendar_url = "https://pcb.illinois.gov/ClerksOffice/Calendar"
+    join_links = True
 
     def __init__(self, *args, **kwargs):
-        self.minutes_map = dict()  # Populated by self._parse_minutes()
-        self.agenda_map = dict()  # Populated by self._parse_agenda()
         self.relevant_years = [
             str(y) for y in range(datetime.now().year - 1, datetime.now().year + 1)
         ]
         super().__init__(*args, **kwargs)
 
-    @classmethod
-    def from_crawler(cls, crawler, *args, **kwargs):
-        """ Overridden `from_crawler` to connect `spider_idle` signal. """
-        spider = super().from_crawler(crawler, *args, **kwargs)
-        crawler.signals.connect(spider.spider_idle, signal=scrapy.signals.spider_idle)
-        return spider
-
-    def spider_idle(self):
-        """
-        React to `spider_idle` signal by starting JSON parsing after _parse_minutes.
-        """
-        self.crawler.signals.disconnect(
-            self.spider_idle, signal=scrapy.signals.spider_idle
-        )
-        self.crawler.engine.crawl(
-            scrapy.Request(self.json_url, callback=self._parse_json), self
-        )
-        raise scrapy.exceptions.DontCloseSpider
+    def start_requests(self):
+        """Request JSON alongside minutes and agendas, which are joined by date"""
+        for url in self.start_urls:
+            yield scrapy.Request(url, callback=self.parse)
+        yield scrapy.Request(self.json_url, callback=self._parse_json)
 
     def parse(self, response):
         """
@@ -62,7 +53,7 @@ class IlPollutionControlSpider(CityScrapersSpider):
             yield scrapy.Request(agenda_url, callback=self._parse_agenda)
 
     def _parse_minutes(self, response):
-        """ Traverse tree of URLs and populate self.minutes_map """
+        """ Traverse tree of URLs and yield links to minutes by date """
         for item in response.xpath("//td[@class='name']/a"):
             try:
                 href = item.xpath("@href")[0].get()
@@ -80,19 +71,11 @@ class IlPollutionControlSpider(CityScrapersSpider):
                 yield scrapy.Request(url, callback=self._parse_minutes)
             else:
                 # Dates are given in several formats:
-                format_strs = ["%m-%d-%Y", "%m-%d-%y", "%m/%d/%Y", "%m/%d/%y"]
-                dt = None
-                for format_str in format_strs:
-                    try:
-                        dt = datetime.strptime(text, format_str).date()
-                    except ValueError:
-                        continue
-                    else:
-                        break  # Found a format_str that matches - stop looking
+                dt = parse_date(text, MINUTES_DATE_FORMATS)
                 if dt is None:
                     continue  # Could not find matching format_str - can't process link.
 
-                self.minutes_map[dt] = url
+                yield MeetingLinks(start=dt, links=[{"href": url, "title": "Minutes"}])
 
     def _parse_agenda_page(self, response):
         """Scrape link to agenda PDF"""
@@ -102,7 +85,7 @@ class IlPollutionControlSpider(CityScrapersSpider):
                     yield href.get()
 
     def _parse_agenda(self, response):
-        """Parse PDF with agenda for date and store link + date"""
+        """Parse PDF with agenda for date and yield link by date"""
         # pdf_obj = PdfFileReader(BytesIO(response.body))
         # pdf_text = pdf_obj.getPage(0).extractText().replace("\n", "")
         lp = LAParams(line_margin=0.1)
@@ -118,47 +101,52 @@ class IlPollutionControlSpider(CityScrapersSpider):
             month = datetime.strptime(m.group("month"), "%B").month
             day = int(m.group("day"))
             year = int(m.group("year"))
-            self.agenda_map[datetime(year, month, day).date()] = response.url
         except AttributeError:  # Regex failed to match.
-            return None
+            return
 
-        return None
+        yield MeetingLinks(
+            start=datetime(year, month, day).date(),
+            links=[{"href": response.url, "title": "Agenda"}],
+        )
 
     def _parse_json(self, response):
         """
         Parse JSON from /ClerksOffice/GetCalendarEvents -> Meetings
         """
-        data = json.loads(response.text)
-
-        for item in data:
-            if any(
-                s in item["CalendarTypeDesc"].lower()
-                for s in ("holiday", "seminar", "hearing")
-            ):
-                continue  # Not interested in this event type
-
-            title = item["CalendarTypeDesc"].replace("CANCELLED", "").strip()
-            meeting = Meeting(
-                title=title,
-                description="",  # Too inconsistent to parse accurately
-                classification=self._parse_classification(title),
-                start=self._parse_start(item),
-                end=None,
-                all_day=item["IsFullDay"],
-                time_notes="",
-                location=self._parse_location(item),
-                links=list(),
-                source=self._parse_source(item, response),
-            )
-
-            meeting["links"] = self._parse_links(meeting)
-            meeting["status"] = self._get_status(
-                meeting,
-                text=" ".join([item["CalendarTypeDesc"], item["Description"]]).lower(),
-            )
-            meeting["id"] = self._get_id(meeting)
-
-            yield meeting
+        yield from iter_json_outputs(
+            response, lambda item: self._parse_json_item(item, response)
+        )
+
+    def _parse_json_item(self, item, response):
+        """Yield a meeting for a calendar event if it isn't a holiday, seminar or
+        hearing
+        """
+        if any(
+            s in item["CalendarTypeDesc"].lower()
+            for s in ("holiday", "seminar", "hearing")
+        ):
+            return  # Not interested in this event type
+
+        title = item["CalendarTypeDesc"].replace("CANCELLED", "").strip()
+        meeting = Meeting(
+            title=title,
+            description="",  # Too inconsistent to parse accurately
+            classification=self._parse_classification(title),
+            start=self._parse_start(item),
+            end=None,
+            all_day=item["IsFullDay"],
+            time_notes="",
+            location=self._parse_location(item),
+            links=list(),
+            source=self._parse_source(item, response),
+        )
+        meeting["status"] = self._get_status(
+            meeting,
+            text=" ".join([item["CalendarTypeDesc"], item["Description"]]).lower(),
+        )
+        meeting["id"] = self._get_id(meeting)
+
+        yield meeting
 
     def _parse_classification(self, title):
         """Parse or generate classification from allowed options."""
@@ -194,17 +182,6 @@ class IlPollutionControlSpider(CityScrapersSpider):
                 "name": "",
             }
 
-    def _parse_links(self, meeting):
-        """ Associate Meeting objects with previously-scraped links """
-        links = list()
-        key = meeting["start"].date()
-        if key in self.minutes_map:
-            links.append({"href": self.minutes_map[key], "title": "Minutes"})
-        if key in self.agenda_map:
-            links.append({"href": self.agenda_map[key], "title": "Agenda"})
-
-        return links
-
     def _parse_source(self, item, response):
         """Parse or generate source."""
         rel_url = scrapy.Selector(text=item["Description"]).xpath(".//a/@href").get()
@@ -19,33 +19,25 @@ class IlPortDistrictSpider(CityScrapersSpider):
     }
 
     schedules_url = "https://www.iipd.com/calendar/schedules"
+    phases = {"schedules": ["agendas", "minutes"]}
 
     def start_requests(self):
         yield scrapy.Request(
-            url="https://www.iipd.com/calendar/agendas", callback=self.parse_agendas
+            url="https://www.iipd.com/calendar/agendas",
+            callback=self.parse_agendas,
+            meta={"phase": "agendas"},
         )
         yield scrapy.Request(
             url="https://www.iipd.com/about/board-meeting-minutes",
             callback=self.parse_minutes,
+            meta={"phase": "minutes"},
         )
-
-    @classmethod
-    def from_crawler(cls, crawler, *args, **kwargs):
-        spider = super().from_crawler(crawler, *args, **kwargs)
-        crawler.signals.connect(spider.spider_idle, signal=scrapy.signals.spider_idle)
-        return spider
-
-    def spider_idle(self):
-        """
-        Call parse_schedules if spider is idle (finished parsing minutes and agendas)
-        """
-        self.crawler.signals.disconnect(
-            self.spider_idle, signal=scrapy.signals.spider_idle
-        )
-        self.crawler.engine.crawl(
-            scrapy.Request(self.schedules_url, callback=self.parse_schedules), self
+        # Parse schedules once both minutes and agendas have been parsed
+        yield scrapy.Request(
+            self.schedules_url,
+            callback=self.parse_schedules,
+            meta={"phase": "schedules"},
         )
-        raise scrapy.exceptions.DontCloseSpider
 
     def parse_schedules(self, response):
         year = response.css(".rtecenter em::text").extract_first()[:4]
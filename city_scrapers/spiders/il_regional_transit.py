@@ -10,11 +10,21 @@ from city_scrapers_core.constants import (
 from city_scrapers_core.items import Meeting
 from city_scrapers_core.spiders import CityScrapersSpider
 
+from city_scrapers.keywords import KeywordMatcher
+
 
 class IlRegionalTransitSpider(CityScrapersSpider):
     name = "il_regional_transit"
     agency = "Regional Transportation Authority"
     timezone = "America/Chicago"
+    classifications = KeywordMatcher(
+        [
+            ("citizens advisory", ADVISORY_COMMITTEE),
+            ("committee", COMMITTEE),
+            ("board", BOARD),
+        ],
+        default=NOT_CLASSIFIED,
+    )
     start_urls = [
         "http://rtachicago.granicus.com/ViewPublisher.php?view_id=5",
         "http://rtachicago.granicus.com/ViewPublisher.php?view_id=4",
@@ -53,16 +63,8 @@ class IlRegionalTransitSpider(CityScrapersSpider):
             meeting["status"] = self._get_status(meeting)
             yield meeting
 
-    @staticmethod
-    def _parse_classification(name):
-        name = name.upper()
-        if "CITIZENS ADVISORY" in name:
-            return ADVISORY_COMMITTEE
-        if "COMMITTEE" in name:
-            return COMMITTEE
-        if "BOARD" in name:
-            return BOARD
-        return NOT_CLASSIFIED
+    def _parse_classification(self, name):
+        return self.classifications.match(name)
 
     @staticmethod
     def _parse_title(item):
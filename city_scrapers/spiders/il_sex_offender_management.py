@@ -11,16 +11,31 @@ from city_scrapers_core.spiders import CityScrapersSpider
 from pdfminer.high_level import extract_text_to_fp
 from pdfminer.layout import LAParams
 
-
-class IlSexOffenderManagementSpider(CityScrapersSpider):
+from city_scrapers.dates import parse_date, parse_datetime, parse_time
+from city_scrapers.keywords import get_status
+from city_scrapers.mixins import CrawlStateMixin
+
+MEETING_DATE_RE = re.compile(
+    r"(Jan(uary)?|Feb(ruary)?|Mar(ch)?|Apr(il)?|May|Jun(e)?|"
+    r"Jul(y)?|Aug(ust)?|Sep(tember)?|Oct(ober)?|Nov(ember)?|"
+    r"Dec(ember)?)\s+\d{1,2},\s+\d{4}"
+)
+TIME_RANGE_RE = re.compile(
+    r"[0-2]?[0-9]:[0-9][0-9][a-zA-Z][a-zA-Z]-[0-2]?[0-9]:[0-9][0-9][a-zA-Z][a-zA-Z]"
+)
+HOUR_RANGE_RE = re.compile(r"[0-2]?[0-9]-[0-9]?[0-9][a-zA-Z][a-zA-Z]")
+TIME_STR_RE = re.compile(r"[0-2]?[0-9]:[0-9][0-9][a-zA-Z][a-zA-Z]")
+
+
+class IlSexOffenderManagementSpider(CrawlStateMixin, CityScrapersSpider):
     name = "il_sex_offender_management"
     agency = "Illinois Sex Offender Management Board"
     timezone = "America/Chicago"
     custom_settings = {"ROBOTSTXT_OBEY": False}
+    html_region = {"parse": ".soi-article-content"}
     start_urls = [
         "https://www2.illinois.gov/idoc/Pages/SexOffenderManagementBoard.aspx"
     ]
-    meeting_minutes = []
 
     def parse(self, response):
         """
@@ -29,16 +44,15 @@ class IlSexOffenderManagementSpider(CityScrapersSpider):
         Change the `_parse_title`, `_parse_start`, etc methods to fit your scraping
         needs.
         """
-        # first go through and gather list of lists for meeting minutes
+        # first go through and gather meeting minutes links by date
         for link in response.css(".soi-article-content a"):
             link_text = " ".join(link.css("*::text").extract())
             if "meeting minutes" in link_text.lower():
-                # create new list holding meeting minutes date and link
                 date_time_obj = self._get_datetime_obj_meeting_minutes(
                     link_text
                 )  # noqa
                 href = response.urljoin(link.attrib["href"])
-                self.meeting_minutes.append([date_time_obj, href])
+                self.crawl_state.add_by_date("minutes", date_time_obj, href)
 
         for link in response.css(".soi-article-content a"):
             link_text = " ".join(link.css("*::text").extract())
@@ -142,7 +156,7 @@ class IlSexOffenderManagementSpider(CityScrapersSpider):
             links=link_map["current_iteration"],
             source=self.start_urls[0],
         )
-        meeting["status"] = self._get_status(meeting, text=clean_text)
+        meeting["status"] = get_status(meeting, text=clean_text)
         meeting["id"] = self._get_id(meeting)
 
         yield meeting
@@ -152,16 +166,15 @@ class IlSexOffenderManagementSpider(CityScrapersSpider):
         links = []
         if agenda_dict is not None:
             links.append(agenda_dict)
-        for meeting in self.meeting_minutes:
-            if date_time_obj.date() == meeting[0].date():
-                # account for training meetings
-                if "training" in agenda_dict["href"].lower():
-                    if "training" in meeting[1].lower():
-                        minutes_dict = {"title": "Meeting Minutes", "href": meeting[1]}
-                        links.append(minutes_dict)
-                elif "training" not in meeting[1].lower():
-                    minutes_dict = {"title": "Meeting Minutes", "href": meeting[1]}
+        for href in self.crawl_state.get_by_date("minutes", date_time_obj):
+            # account for training meetings
+            if "training" in agenda_dict["href"].lower():
+                if "training" in href.lower():
+                    minutes_dict = {"title": "Meeting Minutes", "href": href}
                     links.append(minutes_dict)
+            elif "training" not in href.lower():
+                minutes_dict = {"title": "Meeting Minutes", "href": href}
+                links.append(minutes_dict)
         return links
 
     def _clean_up_pdf(self, response):
@@ -197,51 +210,36 @@ class IlSexOffenderManagementSpider(CityScrapersSpider):
 
     def _get_meeting_date(self, clean_text):
         """Parse meeting agenda for 'Month Day, Year' and returns group"""
-        pattern = re.compile(
-            r"(Jan(uary)?|Feb(ruary)?|Mar(ch)?|Apr(il)?|May|Jun(e)?|"
-            r"Jul(y)?|Aug(ust)?|Sep(tember)?|Oct(ober)?|Nov(ember)?|"
-            r"Dec(ember)?)\s+\d{1,2},\s+\d{4}"
-        )
-        return pattern.search(clean_text).group()
+        return MEETING_DATE_RE.search(clean_text).group()
 
     def _get_start_end_time(self, clean_text):
         """Parse start and end time of meeting from agenda and returns group"""
-        pattern = re.compile(
-            r"[0-2]?[0-9]:[0-9][0-9][a-zA-Z][a-zA-Z]-"
-            r"[0-2]?[0-9]:[0-9][0-9][a-zA-Z][a-zA-Z]"
-        )
-        if pattern.search(clean_text) is not None:
-            return pattern.search(clean_text).group()
-        else:
-            # in a few specific agendas there are times formatted as '9-10am'
-            # instead of 9:00am-10:00am or 09:00am-10:00am
-            pattern = re.compile(r"[0-2]?[0-9]-[0-9]?[0-9][a-zA-Z][a-zA-Z]")
-            if pattern.search(clean_text) is not None:
-                # re-make string to 09:00am-10:00am format from '9-10am'
-                new_string = pattern.search(clean_text).group()
-                suffix = new_string[-2:]
-                start = new_string.split("-")[0] + ":00" + suffix
-                end = new_string.split("-")[1][:-2] + ":00" + suffix
-                new_string = start + "-" + end
-                return new_string
-            else:
-                return None
+        time_range_match = TIME_RANGE_RE.search(clean_text)
+        if time_range_match is not None:
+            return time_range_match.group()
+        # in a few specific agendas there are times formatted as '9-10am'
+        # instead of 9:00am-10:00am or 09:00am-10:00am
+        hour_range_match = HOUR_RANGE_RE.search(clean_text)
+        if hour_range_match is None:
+            return None
+        # re-make string to 09:00am-10:00am format from '9-10am'
+        new_string = hour_range_match.group()
+        suffix = new_string[-2:]
+        start = new_string.split("-")[0] + ":00" + suffix
+        end = new_string.split("-")[1][:-2] + ":00" + suffix
+        return start + "-" + end
 
     def _get_datetime_obj(self, date_str, time_str):
         """Return Naive Datetime object from date and time strings passed in"""
-        pattern = re.compile(r"[0-2]?[0-9]:[0-9][0-9][a-zA-Z][a-zA-Z]")
-        time_str = pattern.search(time_str).group()
-        # standardize time by converting to military time
-        time_str = datetime.strptime(time_str, "%I:%M%p").strftime("%H:%M")
-        return datetime.strptime("{} {}".format(date_str, time_str), "%B %d, %Y %H:%M")
+        time_str = TIME_STR_RE.search(time_str).group()
+        return datetime.combine(parse_date(date_str), parse_time(time_str))
 
     def _get_datetime_obj_meeting_minutes(self, link_text):
         """ Make datetime object for meeting minutes"""
         date = self._get_meeting_date(link_text)
-        # tested, this will return the datetime object correct regardless
-        # if given full month is given and regardless of capitilization
-        date_time_obj = datetime.strptime("{}".format(date), "%B %d, %Y")
-        return date_time_obj
+        # this will return the datetime object correct regardless if full month is
+        # given and regardless of capitalization
+        return parse_datetime(date)
 
     def _parse_location(self, clean_text):
         """Parse or generate location."""
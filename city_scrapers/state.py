@@ -0,0 +1,165 @@
+import os
+import shutil
+
+from scrapy.exceptions import NotConfigured
+from scrapy.utils.misc import load_object
+
+from city_scrapers.warehouse import MeetingWarehouse
+
+# Settings for local files that need to persist between runs, and their names in
+# the state backend
+STATE_FILES = {"CITY_SCRAPERS_WAREHOUSE_PATH": "warehouse.db"}
+# Settings for local directories whose files need to persist between runs, and the
+# prefixes of their names in the state backend
+STATE_DIRS = {"CITY_SCRAPERS_CHANGES_DIR": "changes/"}
+
+
+def get_state_backend(settings):
+    """Return the backend for persisting state from the CITY_SCRAPERS_STATE_BACKEND
+    setting, raising NotConfigured if it isn't set
+    """
+    backend_path = settings.get("CITY_SCRAPERS_STATE_BACKEND")
+    if not backend_path:
+        raise NotConfigured
+    return load_object(backend_path).from_settings(settings)
+
+
+def state_files(settings):
+    """Return a dict of names in the state backend to configured local paths"""
+    return {
+        name: settings.get(setting)
+        for setting, name in STATE_FILES.items()
+        if settings.get(setting)
+    }
+
+
+def download_state(backend, settings):
+    """Download configured state files and files in state directories that exist in
+    the backend, returning the names of files that were downloaded
+    """
+    files = state_files(settings)
+    for setting, prefix in STATE_DIRS.items():
+        if settings.get(setting):
+            for name in backend.list(prefix):
+                files[name] = os.path.join(settings.get(setting), name[len(prefix) :])
+    downloaded = []
+    for name, path in files.items():
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = "{}.tmp".format(path)
+        if backend.download(name, tmp_path):
+            os.replace(tmp_path, path)
+            downloaded.append(name)
+    return downloaded
+
+
+def upload_state(backend, settings):
+    """Upload configured state files and files in state directories that exist
+    locally, returning the names of files that were uploaded
+    """
+    files = state_files(settings)
+    for setting, prefix in STATE_DIRS.items():
+        state_dir = settings.get(setting)
+        if state_dir and os.path.isdir(state_dir):
+            for file_name in sorted(os.listdir(state_dir)):
+                if os.path.isfile(os.path.join(state_dir, file_name)):
+                    files[prefix + file_name] = os.path.join(state_dir, file_name)
+    uploaded = []
+    for name, path in files.items():
+        if not os.path.exists(path):
+            continue
+        if name == STATE_FILES["CITY_SCRAPERS_WAREHOUSE_PATH"]:
+            warehouse = MeetingWarehouse(path)
+            warehouse.checkpoint()
+            warehouse.close()
+        backend.upload(name, path)
+        uploaded.append(name)
+    return uploaded
+
+
+class LocalStateBackend:
+    """Copies state files to and from the local directory in the CITY_SCRAPERS_STATE_DIR
+    setting, standing in for a blob container
+    """
+
+    def __init__(self, state_dir):
+        self.state_dir = state_dir
+
+    @classmethod
+    def from_settings(cls, settings):
+        state_dir = settings.get("CITY_SCRAPERS_STATE_DIR")
+        if not state_dir:
+            raise NotConfigured
+        return cls(state_dir)
+
+    def download(self, name, path):
+        """Copy a file to path, returning False if it doesn't exist"""
+        src_path = os.path.join(self.state_dir, name)
+        if not os.path.exists(src_path):
+            return False
+        shutil.copyfile(src_path, path)
+        return True
+
+    def list(self, prefix):
+        """Return the names of files starting with prefix"""
+        prefix_dir = os.path.join(self.state_dir, prefix)
+        if not os.path.isdir(prefix_dir):
+            return []
+        return [prefix + file_name for file_name in sorted(os.listdir(prefix_dir))]
+
+    def upload(self, name, path):
+        dest_path = os.path.join(self.state_dir, name)
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        shutil.copyfile(path, dest_path)
+
+
+class AzureStateBackend:
+    """Copies state files to and from blobs under the CITY_SCRAPERS_STATE_PREFIX in the
+    Azure Blob Storage container in the CITY_SCRAPERS_STATE_CONTAINER setting
+    """
+
+    def __init__(self, account_name, account_key, container, prefix):
+        from azure.storage.blob import ContainerClient
+
+        self.container_client = ContainerClient(
+            "{}.blob.core.windows.net".format(account_name),
+            container,
+            credential=account_key,
+        )
+        self.prefix = prefix
+
+    @classmethod
+    def from_settings(cls, settings):
+        container = settings.get("CITY_SCRAPERS_STATE_CONTAINER")
+        if not container:
+            raise NotConfigured
+        return cls(
+            settings.get("AZURE_ACCOUNT_NAME"),
+            settings.get("AZURE_ACCOUNT_KEY"),
+            container,
+            settings.get("CITY_SCRAPERS_STATE_PREFIX", "state/"),
+        )
+
+    def download(self, name, path):
+        """Download a blob to path, returning False if it doesn't exist"""
+        from azure.core.exceptions import ResourceNotFoundError
+
+        try:
+            downloader = self.container_client.download_blob(self.prefix + name)
+        except ResourceNotFoundError:
+            return False
+        with open(path, "wb") as f:
+            downloader.readinto(f)
+        return True
+
+    def list(self, prefix):
+        """Return the names of blobs starting with prefix"""
+        return [
+            blob.name[len(self.prefix) :]
+            for blob in self.container_client.list_blobs(
+                name_starts_with=self.prefix + prefix
+            )
+        ]
+
+    def upload(self, name, path):
+        with open(path, "rb") as f:
+            self.container_client.upload_blob(self.prefix + name, f, overwrite=True)
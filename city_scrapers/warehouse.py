@@ -0,0 +1,333 @@
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+from city_scrapers_core.constants import CANCELLED
+
+from city_scrapers.items import DATETIME_FORMAT, deserialize_meeting, serialize_meeting
+
+CREATED = "created"
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+# Change types recorded in addition to created and updated
+CANCELLED_CHANGE = "cancelled"
+DISAPPEARED = "disappeared"
+REAPPEARED = "reappeared"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    spider TEXT NOT NULL,
+    started TEXT NOT NULL,
+    finished TEXT,
+    reason TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_spider ON runs (spider, id);
+CREATE TABLE IF NOT EXISTS meetings (
+    id TEXT PRIMARY KEY,
+    spider TEXT NOT NULL,
+    agency TEXT,
+    start TEXT,
+    digest TEXT NOT NULL,
+    data TEXT NOT NULL,
+    first_run INTEGER NOT NULL,
+    last_run INTEGER NOT NULL,
+    changed_run INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS meetings_start ON meetings (start);
+CREATE INDEX IF NOT EXISTS meetings_agency ON meetings (agency, start);
+CREATE INDEX IF NOT EXISTS meetings_spider ON meetings (spider, start);
+CREATE INDEX IF NOT EXISTS meetings_spider_run ON meetings (spider, last_run);
+CREATE TABLE IF NOT EXISTS meeting_versions (
+    meeting_id TEXT NOT NULL,
+    run_id INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (meeting_id, run_id)
+);
+CREATE INDEX IF NOT EXISTS meeting_versions_run ON meeting_versions (run_id);
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER NOT NULL,
+    spider TEXT NOT NULL,
+    meeting_id TEXT NOT NULL,
+    type TEXT NOT NULL,
+    start TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS changes_spider ON changes (spider, seq);
+CREATE INDEX IF NOT EXISTS changes_meeting ON changes (meeting_id, seq);
+"""
+
+
+def meeting_digest(data):
+    """Return a digest of serialized meeting data for detecting changes"""
+    return hashlib.sha1(
+        json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    ).hexdigest()
+
+
+class MeetingWarehouse:
+    """SQLite store of every meeting scraped across runs.
+
+    Meetings are indexed by ID, start, agency and spider. Each run of a spider is
+    recorded, along with a version row for every meeting that was created or changed
+    in that run, so previous state can be looked up without loading earlier feeds.
+    """
+
+    def __init__(self, path):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    def checkpoint(self):
+        """Copy committed changes from the write-ahead log into the database file, so
+        the file can be copied on its own
+        """
+        self.conn.commit()
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def start_run(self, spider_name):
+        """Record the start of a spider run, returning the run ID"""
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (spider, started) VALUES (?, ?)",
+                (spider_name, datetime.now().strftime(DATETIME_FORMAT)),
+            )
+        return cursor.lastrowid
+
+    def finish_run(self, run_id, reason):
+        """Record the end of a run. If the run finished normally, upcoming meetings
+        that were seen in the previous finished run or any run since but not in this
+        one are recorded as disappeared.
+        """
+        now = datetime.now().strftime(DATETIME_FORMAT)
+        with self.conn:
+            spider_name = self.conn.execute(
+                "SELECT spider FROM runs WHERE id = ?", (run_id,)
+            ).fetchone()["spider"]
+            previous_run = self.previous_run(spider_name, run_id)
+            if reason == "finished" and previous_run is not None:
+                for row in self.conn.execute(
+                    "SELECT id, start FROM meetings WHERE spider = ? AND last_run < ? "
+                    "AND last_run >= ? AND start >= ? ORDER BY start, id",
+                    (spider_name, run_id, previous_run, now),
+                ).fetchall():
+                    self._record_change(
+                        run_id, spider_name, row["id"], DISAPPEARED, row["start"], {}
+                    )
+            self.conn.execute(
+                "UPDATE runs SET finished = ?, reason = ? WHERE id = ?",
+                (now, reason, run_id),
+            )
+
+    def previous_run(self, spider_name, run_id):
+        """Return the ID of the last run of a spider before run_id that finished
+        normally, or None
+        """
+        row = self.conn.execute(
+            "SELECT MAX(id) FROM runs WHERE spider = ? AND id < ? "
+            "AND reason = 'finished'",
+            (spider_name, run_id),
+        ).fetchone()
+        return row[0]
+
+    def upsert(self, run_id, spider, meeting):
+        """Store a meeting scraped in a run, returning whether it was created, updated
+        or unchanged since it was last stored. Created and updated meetings are added
+        to the change log, as are meetings that reappeared after they disappeared or
+        were missing from the previous finished run.
+        """
+        data = serialize_meeting(meeting)
+        digest = meeting_digest(data)
+        row = self.conn.execute(
+            "SELECT digest, data, last_run FROM meetings WHERE id = ?", (meeting["id"],)
+        ).fetchone()
+        reappeared = row is not None and self._reappeared(
+            run_id, spider.name, meeting["id"], row["last_run"]
+        )
+        if reappeared:
+            self._record_change(
+                run_id, spider.name, meeting["id"], REAPPEARED, data.get("start"), data
+            )
+        if row is not None and row["digest"] == digest:
+            self.conn.execute(
+                "UPDATE meetings SET last_run = ? WHERE id = ?", (run_id, meeting["id"])
+            )
+            return UNCHANGED
+        data_str = json.dumps(data, sort_keys=True)
+        self.conn.execute(
+            "INSERT INTO meetings (id, spider, agency, start, digest, data, first_run, "
+            "last_run, changed_run) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (id) DO UPDATE SET spider = excluded.spider, "
+            "agency = excluded.agency, start = excluded.start, "
+            "digest = excluded.digest, data = excluded.data, "
+            "last_run = excluded.last_run, changed_run = excluded.changed_run",
+            (
+                meeting["id"],
+                spider.name,
+                spider.agency,
+                data.get("start"),
+                digest,
+                data_str,
+                run_id,
+                run_id,
+                run_id,
+            ),
+        )
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meeting_versions "
+            "(meeting_id, run_id, digest, data) VALUES (?, ?, ?, ?)",
+            (meeting["id"], run_id, digest, data_str),
+        )
+        if row is None:
+            self._record_change(
+                run_id, spider.name, meeting["id"], CREATED, data.get("start"), data
+            )
+            return CREATED
+        previous = json.loads(row["data"])
+        fields = {
+            key: value for key, value in data.items() if previous.get(key) != value
+        }
+        change_type = UPDATED
+        if data.get("status") == CANCELLED and previous.get("status") != CANCELLED:
+            change_type = CANCELLED_CHANGE
+        # Reappeared records already include every field
+        if not reappeared:
+            self._record_change(
+                run_id,
+                spider.name,
+                meeting["id"],
+                change_type,
+                data.get("start"),
+                fields,
+            )
+        return UPDATED
+
+    def _reappeared(self, run_id, spider_name, meeting_id, last_run):
+        if last_run == run_id:
+            return False
+        previous_run = self.previous_run(spider_name, run_id)
+        if previous_run is not None and last_run < previous_run:
+            return True
+        row = self.conn.execute(
+            "SELECT type FROM changes WHERE meeting_id = ? ORDER BY seq DESC LIMIT 1",
+            (meeting_id,),
+        ).fetchone()
+        return row is not None and row["type"] == DISAPPEARED
+
+    def _record_change(self, run_id, spider_name, meeting_id, change_type, start, data):
+        self.conn.execute(
+            "INSERT INTO changes (run_id, spider, meeting_id, type, start, data) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                run_id,
+                spider_name,
+                meeting_id,
+                change_type,
+                start,
+                json.dumps(data, sort_keys=True),
+            ),
+        )
+
+    def changes(self, since=0, spider_name=None):
+        """Generate change records with sequence numbers greater than ``since`` in
+        the order they were recorded, optionally only for one spider.
+
+        Records are dicts with "seq", "run", "spider", "id", "type" and "start" keys.
+        Created and reappeared meetings include all serialized fields in "meeting",
+        and updated and cancelled meetings include only the fields that changed in
+        "fields". Disappeared meetings were upcoming in the previous finished run of
+        their spider, or a run since, but weren't scraped in the current one.
+        Reappeared meetings were scraped again after they disappeared or were missing
+        from the previous finished run.
+        """
+        query = "SELECT * FROM changes WHERE seq > ?"
+        params = [since]
+        if spider_name is not None:
+            query += " AND spider = ?"
+            params.append(spider_name)
+        for row in self.conn.execute(query + " ORDER BY seq", params):
+            change = {
+                "seq": row["seq"],
+                "run": row["run_id"],
+                "spider": row["spider"],
+                "id": row["meeting_id"],
+                "type": row["type"],
+                "start": row["start"],
+            }
+            if row["type"] in (CREATED, REAPPEARED):
+                change["meeting"] = json.loads(row["data"])
+            elif row["type"] != DISAPPEARED:
+                change["fields"] = json.loads(row["data"])
+            yield change
+
+    def last_seq(self):
+        """Return the sequence number of the latest change, or 0 if there are none"""
+        return self.conn.execute(
+            "SELECT COALESCE(MAX(seq), 0) FROM changes"
+        ).fetchone()[0]
+
+    def commit(self):
+        self.conn.commit()
+
+    def get(self, meeting_id):
+        """Return the latest stored version of a meeting, or None"""
+        row = self.conn.execute(
+            "SELECT data FROM meetings WHERE id = ?", (meeting_id,)
+        ).fetchone()
+        if row is not None:
+            return deserialize_meeting(json.loads(row["data"]))
+
+    def get_version(self, meeting_id, run_id):
+        """Return a meeting as it was stored as of a run, or None if it didn't exist"""
+        row = self.conn.execute(
+            "SELECT data FROM meeting_versions WHERE meeting_id = ? AND run_id <= ? "
+            "ORDER BY run_id DESC LIMIT 1",
+            (meeting_id, run_id),
+        ).fetchone()
+        if row is not None:
+            return deserialize_meeting(json.loads(row["data"]))
+
+    def meetings(self, start=None, end=None, agency=None, spider_name=None):
+        """Generate stored meetings ordered by start, optionally filtered by a start
+        datetime range, agency or spider name
+        """
+        clauses = []
+        params = []
+        for column, op, value in (
+            ("start", ">=", start),
+            ("start", "<", end),
+            ("agency", "=", agency),
+            ("spider", "=", spider_name),
+        ):
+            if value is None:
+                continue
+            if isinstance(value, datetime):
+                value = value.strftime(DATETIME_FORMAT)
+            clauses.append("{} {} ?".format(column, op))
+            params.append(value)
+        query = "SELECT data FROM meetings"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        for row in self.conn.execute(query + " ORDER BY start, id", params):
+            yield deserialize_meeting(json.loads(row["data"]))
+
+    def missing(self, spider_name, run_id):
+        """Generate meetings for a spider that were last seen before a run"""
+        for row in self.conn.execute(
+            "SELECT data FROM meetings WHERE spider = ? AND last_run < ? "
+            "ORDER BY start, id",
+            (spider_name, run_id),
+        ):
+            yield deserialize_meeting(json.loads(row["data"]))
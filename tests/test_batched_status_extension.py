@@ -0,0 +1,137 @@
+import json
+import os
+from os.path import join
+from unittest.mock import MagicMock
+
+import pytest
+from city_scrapers_core.spiders import CityScrapersSpider
+from freezegun import freeze_time
+from scrapy.exceptions import NotConfigured
+from scrapy.settings import Settings
+from scrapy.statscollectors import MemoryStatsCollector
+
+from city_scrapers.commands.publishstatus import Command as PublishStatusCommand
+from city_scrapers.extensions import (
+    BatchedStatusExtension,
+    LocalStatusBackend,
+    StatusCollector,
+    collector,
+)
+
+
+class StatusSpider(CityScrapersSpider):
+    name = "status"
+    agency = "Status Agency"
+    timezone = "America/Chicago"
+
+
+class OtherSpider(StatusSpider):
+    name = "other"
+
+
+@pytest.fixture(autouse=True)
+def clear_collector():
+    collector.outcomes = {}
+    yield
+    collector.outcomes = {}
+
+
+def make_extension(tmp_path, **settings):
+    crawler = MagicMock()
+    crawler.settings = Settings(
+        {
+            "CITY_SCRAPERS_STATUS_BACKEND": (
+                "city_scrapers.extensions.LocalStatusBackend"
+            ),
+            "CITY_SCRAPERS_STATUS_DIR": join(str(tmp_path), "status"),
+            **settings,
+        }
+    )
+    crawler.stats = MemoryStatsCollector(crawler)
+    return BatchedStatusExtension.from_crawler(crawler)
+
+
+def close(extension, spider, item_count):
+    extension.crawler.stats.set_value("item_scraped_count", item_count)
+    extension.spider_closed(spider, "finished")
+
+
+def test_not_configured():
+    crawler = MagicMock()
+    crawler.settings = Settings(
+        {"CITY_SCRAPERS_STATUS_BACKEND": "city_scrapers.extensions.LocalStatusBackend"}
+    )
+    with pytest.raises(NotConfigured):
+        BatchedStatusExtension.from_crawler(crawler)
+
+
+@freeze_time("2020-01-02 12:00:00")
+def test_unbatched_writes_badge(tmp_path):
+    extension = make_extension(tmp_path)
+    close(extension, StatusSpider(), 3)
+    with open(join(str(tmp_path), "status", "status.svg")) as f:
+        svg = f.read()
+    assert "running" in svg and "2020-01-02" in svg
+    assert not os.path.exists(join(str(tmp_path), "status", "status.json"))
+    assert len(collector) == 0
+
+
+def test_batched_publishes_once(tmp_path):
+    status_extension = make_extension(tmp_path, CITY_SCRAPERS_STATUS_BATCH=True)
+    other_extension = make_extension(tmp_path, CITY_SCRAPERS_STATUS_BATCH=True)
+    close(status_extension, StatusSpider(), 3)
+    other_extension.spider_error()
+    close(other_extension, OtherSpider(), 3)
+    assert not os.path.exists(join(str(tmp_path), "status"))
+
+    backend = MagicMock()
+    collector.publish(backend)
+    backend.write_batch.assert_called_once()
+    blobs = backend.write_batch.call_args[0][0]
+    assert sorted(blobs) == ["other.svg", "status.json", "status.svg"]
+    document = json.loads(blobs["status.json"][0])
+    assert document["spiders"]["status"]["status"] == "running"
+    assert document["spiders"]["other"]["status"] == "failing"
+    assert len(collector) == 0
+
+
+def test_shards(tmp_path):
+    shard_dir = join(str(tmp_path), "shards")
+    close(
+        make_extension(tmp_path, CITY_SCRAPERS_STATUS_SHARD_DIR=shard_dir),
+        StatusSpider(),
+        0,
+    )
+    close(
+        make_extension(tmp_path, CITY_SCRAPERS_STATUS_SHARD_DIR=shard_dir),
+        OtherSpider(),
+        2,
+    )
+    collector.outcomes = {}
+
+    status_collector = StatusCollector()
+    assert len(status_collector.load_shards(shard_dir)) == 2
+    status_collector.publish(LocalStatusBackend(join(str(tmp_path), "status")))
+    with open(join(str(tmp_path), "status", "status.json")) as f:
+        document = json.load(f)
+    assert {
+        name: outcome["status"] for name, outcome in document["spiders"].items()
+    } == {
+        "other": "running",
+        "status": "failing",
+    }
+    assert os.path.exists(join(str(tmp_path), "status", "other.svg"))
+    assert StatusCollector().load_shards(join(str(tmp_path), "missing")) == []
+
+
+def test_publishstatus_command(tmp_path, capsys):
+    shard_dir = join(str(tmp_path), "shards")
+    extension = make_extension(tmp_path, CITY_SCRAPERS_STATUS_SHARD_DIR=shard_dir)
+    close(extension, StatusSpider(), 1)
+
+    command = PublishStatusCommand()
+    command.settings = extension.crawler.settings
+    command.run([shard_dir], None)
+    assert os.listdir(shard_dir) == []
+    assert os.path.exists(join(str(tmp_path), "status", "status.json"))
+    assert "1 spider" in capsys.readouterr().out
@@ -0,0 +1,175 @@
+from datetime import datetime
+from os.path import join
+from unittest.mock import MagicMock
+
+import pytest
+from city_scrapers_core.constants import BOARD, CANCELLED, TENTATIVE
+from city_scrapers_core.items import Meeting
+from city_scrapers_core.spiders import CityScrapersSpider
+from freezegun import freeze_time
+from scrapy.settings import Settings
+
+from city_scrapers.changes import ChangeFeed
+from city_scrapers.pipelines import WarehousePipeline
+from city_scrapers.warehouse import MeetingWarehouse
+
+
+class ChangesSpider(CityScrapersSpider):
+    name = "changes"
+    agency = "Changes Agency"
+
+
+spider = ChangesSpider()
+
+
+def make_meeting(day, status=TENTATIVE, description=""):
+    meeting = Meeting(
+        title="Board",
+        description=description,
+        classification=BOARD,
+        start=datetime(2020, 1, day, 10),
+        end=None,
+        all_day=False,
+        time_notes="",
+        location={"name": "", "address": ""},
+        links=[],
+        source="https://example.com",
+    )
+    meeting["status"] = status
+    meeting["id"] = spider._get_id(meeting)
+    return meeting
+
+
+def run(warehouse, meetings, reason="finished"):
+    run_id = warehouse.start_run(spider.name)
+    for meeting in meetings:
+        warehouse.upsert(run_id, spider, meeting)
+    warehouse.finish_run(run_id, reason)
+    return run_id
+
+
+@pytest.fixture
+def warehouse(tmp_path):
+    warehouse = MeetingWarehouse(join(str(tmp_path), "warehouse.db"))
+    yield warehouse
+    warehouse.close()
+
+
+@freeze_time("2020-01-01")
+def test_changes(warehouse):
+    run(warehouse, [make_meeting(2), make_meeting(3)])
+    run(warehouse, [make_meeting(2), make_meeting(3)])
+    run(warehouse, [make_meeting(2, description="Agenda"), make_meeting(4)])
+    run(
+        warehouse,
+        [make_meeting(2, status=CANCELLED, description="Agenda"), make_meeting(4)],
+    )
+
+    changes = list(warehouse.changes())
+    assert [change["seq"] for change in changes] == [1, 2, 3, 4, 5, 6]
+    assert [(change["type"], change["start"][:10]) for change in changes] == [
+        ("created", "2020-01-02"),
+        ("created", "2020-01-03"),
+        ("updated", "2020-01-02"),
+        ("created", "2020-01-04"),
+        ("disappeared", "2020-01-03"),
+        ("cancelled", "2020-01-02"),
+    ]
+    assert changes[0]["meeting"]["description"] == ""
+    assert changes[2]["fields"] == {"description": "Agenda"}
+    assert changes[5]["fields"] == {"status": CANCELLED}
+    assert "fields" not in changes[4] and "meeting" not in changes[4]
+    assert warehouse.last_seq() == 6
+
+
+@freeze_time("2020-01-01")
+def test_changes_since(warehouse):
+    run(warehouse, [make_meeting(2)])
+    run(warehouse, [make_meeting(2, status=CANCELLED)])
+
+    assert [change["type"] for change in warehouse.changes(since=1)] == ["cancelled"]
+    assert list(warehouse.changes(spider_name="other")) == []
+
+
+@freeze_time("2020-01-03")
+def test_changes_disappeared(warehouse):
+    run(warehouse, [make_meeting(2), make_meeting(4)])
+    run(warehouse, [], reason="shutdown")
+    run(warehouse, [])
+    run(warehouse, [])
+
+    # Past meetings and meetings missing after an unfinished run aren't included
+    assert [change["type"] for change in warehouse.changes(since=2)] == ["disappeared"]
+
+
+@freeze_time("2020-01-03")
+def test_changes_disappeared_after_unfinished_run(warehouse):
+    run(warehouse, [make_meeting(4)])
+    run(warehouse, [make_meeting(4), make_meeting(5)], reason="closespider_errorcount")
+    run(warehouse, [])
+
+    changes = list(warehouse.changes(since=2))
+    assert [(change["type"], change["start"][:10]) for change in changes] == [
+        ("disappeared", "2020-01-04"),
+        ("disappeared", "2020-01-05"),
+    ]
+
+
+@freeze_time("2020-01-03")
+def test_changes_reappeared(warehouse):
+    run(warehouse, [make_meeting(4), make_meeting(5)])
+    run(warehouse, [make_meeting(5)])
+    run(warehouse, [make_meeting(4), make_meeting(5)])
+    run(warehouse, [make_meeting(4), make_meeting(5, description="Agenda")])
+
+    changes = list(warehouse.changes(since=2))
+    assert [(change["type"], change["start"][:10]) for change in changes] == [
+        ("disappeared", "2020-01-04"),
+        ("reappeared", "2020-01-04"),
+        ("updated", "2020-01-05"),
+    ]
+    assert changes[1]["meeting"]["id"] == make_meeting(4)["id"]
+
+
+@freeze_time("2020-01-03")
+def test_changes_reappeared_after_missed_run(warehouse):
+    run(warehouse, [make_meeting(2)])
+    run(warehouse, [])
+    run(warehouse, [make_meeting(2, description="Agenda")])
+
+    changes = list(warehouse.changes(since=1))
+    assert [change["type"] for change in changes] == ["reappeared"]
+    assert changes[0]["meeting"]["description"] == "Agenda"
+
+
+def test_change_feed(tmp_path):
+    feed = ChangeFeed(join(str(tmp_path), "changes", "changes.jsonl"))
+    assert list(feed.read()) == []
+    assert feed.append([{"seq": 1}, {"seq": 2}]) == 2
+    assert feed.append([{"seq": 3}]) == 1
+    assert [change["seq"] for change in feed.read(since=1)] == [2, 3]
+
+
+@freeze_time("2020-01-01")
+def test_pipeline_writes_changes(tmp_path):
+    crawler = MagicMock()
+    crawler.settings = Settings(
+        {
+            "CITY_SCRAPERS_WAREHOUSE_PATH": join(str(tmp_path), "warehouse.db"),
+            "CITY_SCRAPERS_CHANGES_DIR": str(tmp_path),
+        }
+    )
+    for meetings in [[make_meeting(2)], [make_meeting(2)], [make_meeting(3)]]:
+        pipeline = WarehousePipeline.from_crawler(crawler)
+        pipeline.open_spider(spider)
+        for meeting in meetings:
+            pipeline.process_item(meeting, spider)
+        pipeline.spider_closed(spider, "finished")
+
+    feed = ChangeFeed(join(str(tmp_path), "changes.jsonl"))
+    assert [(change["seq"], change["type"]) for change in feed.read()] == [
+        (1, "created"),
+        (2, "created"),
+        (3, "disappeared"),
+    ]
+    crawler.stats.set_value.assert_called_with("changes/count", 2, spider=spider)
@@ -5,6 +5,7 @@ import pytest
 from city_scrapers_core.constants import COMMISSION, PASSED
 from city_scrapers_core.utils import file_response
 from freezegun import freeze_time
+from scrapy.http import HtmlResponse
 from scrapy.settings import Settings
 
 from city_scrapers.spiders.chi_board_elections import ChiBoardElectionsSpider
@@ -157,3 +158,43 @@ def test_all_day_prev(item):
 @pytest.mark.parametrize("item", parsed_items_prev)
 def test_classification_prev(item):
     assert item["classification"] == COMMISSION
+
+
+archive_spider = ChiBoardElectionsSpider()
+archive_spider.settings = Settings(values={"CITY_SCRAPERS_ARCHIVE": True})
+
+freezer.start()
+
+parsed_items_archive = [
+    item for item in archive_spider._prev_meetings(test_response_prev)
+]
+
+freezer.stop()
+
+
+def test_count_archive():
+    assert len(parsed_items_archive) == 132
+    assert len({item["id"] for item in parsed_items_archive}) == 132
+
+
+def test_links_archive():
+    # Entry followed by an empty link to a different date is still included
+    assert parsed_items_archive[-1]["start"] == datetime(2013, 9, 10, 9, 30)
+    assert parsed_items_archive[-1]["links"] == [
+        {
+            "title": "Video",
+            "href": "https://www.youtube.com/watch?v=8U7J1xoJvDQ&amp;feature=youtu.be",
+        }
+    ]
+
+
+def test_prev_meetings_skips_unparseable():
+    response = HtmlResponse(
+        url=prev_url,
+        body=(
+            b'<a href="/minutes-1.pdf">Board Meeting Minutes - Jan. 10, 2017 </a>'
+            b'<a href="/minutes-2.pdf">Board Meeting Minutes - Feb. 10, 2016</a>'
+        ),
+    )
+    items = list(archive_spider._prev_meetings(response))
+    assert [item["start"] for item in items] == [datetime(2016, 2, 10, 9, 30)]
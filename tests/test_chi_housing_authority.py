@@ -27,21 +27,32 @@ notice_response = file_response(
     url=NOTICE_URL,
 )
 
-spider.upcoming_meetings = spider._parse_upcoming(upcoming_response)
-spider.upcoming_meetings = spider._parse_notice(notice_response)
 minutes_req = file_response(
     join(dirname(__file__), "files", "chi_housing_authority_minutes.html"),
     url=MINUTES_URL,
 )
 
-parsed_items = [item for item in spider._parse_combined_meetings(minutes_req)]
+upcoming_meetings = spider._parse_notice(
+    notice_response, spider._parse_upcoming(upcoming_response)
+)
+parsed_items = [
+    item for item in spider._parse_combined_meetings(minutes_req, upcoming_meetings)
+]
 
 freezer.stop()
 
 
+def test_start_requests():
+    assert [request.url for request in spider.start_requests()] == [
+        UPCOMING_URL,
+        NOTICE_URL,
+        MINUTES_URL,
+    ]
+
+
 def test_raises_location_error():
     with pytest.raises(ValueError):
-        [i for i in spider.parse(minutes_req)]
+        [i for i in spider._parse_combined([minutes_req, notice_response, minutes_req])]
 
 
 def test_start():
@@ -23,7 +23,8 @@ freezer.stop()
 
 
 def test_num_items():
-    assert len(parsed_items) == (13 - current_month_number) * 8
+    # Bronzeville only meets in January, April, July and October
+    assert len(parsed_items) == (13 - current_month_number) * 7 + 1
 
 
 def test_title():
@@ -31,7 +32,7 @@ def test_title():
 
 
 def test_start_time():
-    assert parsed_items[0]["start"] == datetime(2020, 8, 10, 17, 30)
+    assert parsed_items[0]["start"] == datetime(2020, 8, 11, 17, 30)
 
 
 def test_end_time():
@@ -41,7 +42,7 @@ def test_end_time():
 def test_id():
     assert (
         parsed_items[0]["id"]
-        == "chi_school_community_action_council/202008101730/x/austin_community_action_council"  # noqa
+        == "chi_school_community_action_council/202008111730/x/austin_community_action_council"  # noqa
     )
 
 
@@ -15,6 +15,8 @@ test_response = file_response(join(dirname(__file__), "files", "chi_ssa_21.html"
 spider = ChiSsa21Spider()
 parsed_items = [item for item in spider.parse(test_response)]
 
+freezer.stop()
+
 
 def test_title():
     assert parsed_items[0]["title"] == "Lincoln Square Neighborhood Improvement Program"
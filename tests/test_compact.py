@@ -0,0 +1,67 @@
+from datetime import datetime
+
+from city_scrapers_core.constants import BOARD, PASSED
+from city_scrapers_core.items import Meeting
+
+from city_scrapers.compact import MeetingInterner
+
+location = {"name": "Board Room", "address": "1 N State St, Chicago, IL 60602"}
+agenda = {"href": "https://example.com/agenda.pdf", "title": "Agenda"}
+
+
+def make_meeting(day):
+    meeting = Meeting(
+        title="Board of Directors",
+        description="",
+        classification=BOARD,
+        start=datetime(2020, 1, day, 10),
+        end=None,
+        all_day=False,
+        time_notes="",
+        location=dict(location),
+        links=[dict(agenda)],
+        source="https://example.com",
+    )
+    meeting["status"] = PASSED
+    meeting["id"] = "compact/202001{:02d}1000/x/board_of_directors".format(day)
+    return meeting
+
+
+def test_round_trip():
+    interner = MeetingInterner()
+    meeting = make_meeting(2)
+    restored = interner.compact(meeting).to_meeting()
+    assert isinstance(restored, Meeting)
+    assert restored == meeting
+    assert restored["location"] is not meeting["location"]
+
+
+def test_missing_fields():
+    interner = MeetingInterner()
+    restored = interner.compact(Meeting(title="Board", links=[])).to_meeting()
+    assert dict(restored) == {"title": "Board", "links": []}
+
+
+def test_shares_values():
+    interner = MeetingInterner()
+    first = interner.compact(make_meeting(2))
+    second = interner.compact(make_meeting(3))
+    assert first.location is second.location
+    assert first.links[0] is second.links[0]
+    assert first.title is second.title
+
+
+def test_restored_values_independent():
+    interner = MeetingInterner()
+    record = interner.compact(make_meeting(2))
+    restored = record.to_meeting()
+    restored["location"]["name"] = "Other"
+    restored["links"].append({"href": "https://example.com", "title": "Other"})
+    assert record.to_meeting() == make_meeting(2)
+
+
+def test_unshareable_values():
+    interner = MeetingInterner()
+    meeting = make_meeting(2)
+    meeting["location"] = {"name": "", "coordinates": {"lat": 1, "lng": 2}}
+    assert interner.compact(meeting).to_meeting() == meeting
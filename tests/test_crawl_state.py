@@ -0,0 +1,45 @@
+from datetime import date, datetime
+from os.path import dirname, join
+
+from city_scrapers_core.utils import file_response
+from freezegun import freeze_time
+
+from city_scrapers.mixins import CrawlState
+from city_scrapers.spiders.il_sex_offender_management import (
+    IlSexOffenderManagementSpider,
+)
+
+test_response = file_response(
+    join(dirname(__file__), "files", "il_sex_offender_management.html"),
+    url="https://www2.illinois.gov/idoc/Pages/SexOffenderManagementBoard.aspx",
+)
+
+
+def test_date_index():
+    state = CrawlState()
+    state.add_by_date("minutes", datetime(2020, 1, 2, 10), "a")
+    state.add_by_date("minutes", date(2020, 1, 2), "b")
+    assert state.get_by_date("minutes", date(2020, 1, 2)) == ["a", "b"]
+    assert state.get_by_date("minutes", datetime(2020, 1, 2, 18)) == ["a", "b"]
+    assert state.get_by_date("minutes", date(2020, 1, 3)) == []
+    assert state.get_by_date("agendas", date(2020, 1, 2)) == []
+    assert list(state.date_index("minutes")) == [date(2020, 1, 2)]
+
+
+def test_state_not_shared_across_runs():
+    freezer = freeze_time("2020-12-12")
+    freezer.start()
+    first_spider = IlSexOffenderManagementSpider()
+    list(first_spider.parse(test_response))
+    minutes_count = len(list(first_spider.crawl_state.date_index("minutes").values()))
+    second_spider = IlSexOffenderManagementSpider()
+    list(second_spider.parse(test_response))
+    freezer.stop()
+
+    assert minutes_count > 0
+    assert (
+        len(list(second_spider.crawl_state.date_index("minutes").values()))
+        == minutes_count
+    )
+    first_spider.closed("finished")
+    assert first_spider.crawl_state == {}
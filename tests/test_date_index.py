@@ -0,0 +1,16 @@
+from datetime import date, datetime
+
+from city_scrapers.date_index import DateIndex
+
+
+def test_date_index():
+    index = DateIndex()
+    index.add(datetime(2020, 1, 2, 10), "agenda")
+    index.add(date(2020, 1, 2), "minutes")
+    index.add(date(2020, 2, 5), "agenda")
+    assert index.get(date(2020, 1, 2)) == ["agenda", "minutes"]
+    assert index.get(datetime(2020, 2, 5, 18, 30)) == ["agenda"]
+    assert index.get(date(2020, 1, 3)) == []
+    assert date(2020, 2, 5) in index
+    assert len(index) == 2
+    assert list(index.values()) == ["agenda", "minutes", "agenda"]
@@ -0,0 +1,54 @@
+from datetime import date, datetime, time
+
+import pytest
+
+from city_scrapers.dates import (
+    parse_date,
+    parse_datetime,
+    parse_time,
+    search_date,
+    search_time,
+)
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("January 2, 2020", datetime(2020, 1, 2)),
+        ("Jan. 2 2020 6:30 PM", datetime(2020, 1, 2, 18, 30)),
+        ("Sept 3rd, 2019, 9:00 a.m.", datetime(2019, 9, 3, 9)),
+        ("May 5, 2020 at 1:00pm", datetime(2020, 5, 5, 13)),
+        ("1/2/20", datetime(2020, 1, 2)),
+        ("01-02-2020 10am", datetime(2020, 1, 2, 10)),
+        ("12.31.99", datetime(1999, 12, 31)),
+        ("Monday 2, 2020", None),
+        ("2/30/2020", None),
+        ("January 2, 2020 agenda", None),
+    ],
+)
+def test_parse_datetime(value, expected):
+    assert parse_datetime(value) == expected
+
+
+def test_parse_datetime_formats():
+    formats = ("%m-%d-%Y", "%m-%d-%y")
+    assert parse_datetime("1-17-19", formats) == datetime(2019, 1, 17)
+    assert parse_date("1-17-2019", formats) == date(2019, 1, 17)
+    assert parse_date("1/17/2019", formats) is None
+
+
+def test_parse_time():
+    assert parse_time("10 a.m.") == time(10)
+    assert parse_time("12:15am") == time(0, 15)
+    assert parse_time("12pm") == time(12)
+    assert parse_time("6:30 PM") == time(18, 30)
+    assert parse_time("noon") is None
+
+
+def test_search():
+    text = "The meeting on Thursday, March 5, 2020 at 6 p.m. was moved from 3/4/2020"
+    assert search_date(text) == datetime(2020, 3, 5)
+    assert search_date("Minutes 3/4/2020") == datetime(2020, 3, 4)
+    assert search_date("No date") is None
+    assert search_time(text) == time(18)
+    assert search_time("No time") is None
@@ -0,0 +1,222 @@
+import gzip
+import os
+import threading
+from os.path import join
+from tempfile import TemporaryFile
+from unittest.mock import MagicMock
+
+import pytest
+from scrapy.exceptions import NotConfigured
+from scrapy.settings import Settings
+
+from city_scrapers.commands.combinefeeds import Command as CombineFeedsCommand
+from city_scrapers.feedstorage import (
+    BlockSink,
+    LocalBlockBackend,
+    LocalChunkedFeedStorage,
+    LocalDigestFeedStorage,
+    feed_digest,
+)
+
+LINES = [b'{"id": "meeting/%d", "title": "Board"}\n' % i for i in range(1000)]
+
+
+class RecordingBackend:
+    def __init__(self):
+        self.blocks = {}
+        self.committed = None
+
+    def stage(self, block_id, data):
+        self.blocks[block_id] = data
+
+    def commit(self, block_ids):
+        self.committed = b"".join(self.blocks[block_id] for block_id in block_ids)
+
+
+def make_storage(path, **kwargs):
+    crawler = MagicMock()
+    crawler.settings = Settings(kwargs)
+    return LocalChunkedFeedStorage.from_crawler(crawler, "chunked-file://" + path)
+
+
+def test_block_sink():
+    backend = RecordingBackend()
+    sink = BlockSink(backend, block_size=10)
+    sink.write(b"a" * 25)
+    sink.write(b"b" * 5)
+    sink.finish()
+    assert [len(block) for _, block in sorted(backend.blocks.items())] == [10, 10, 10]
+    assert backend.committed == b"a" * 25 + b"b" * 5
+
+
+def test_block_sink_bounds_pending_blocks():
+    backend = RecordingBackend()
+    staged = threading.Event()
+    stage = backend.stage
+    backend.stage = lambda block_id, data: staged.wait() and stage(block_id, data)
+    sink = BlockSink(backend, block_size=10, max_pending=2)
+    writer = threading.Thread(target=sink.write, args=(b"a" * 100,))
+    writer.start()
+    writer.join(0.2)
+    try:
+        assert writer.is_alive()
+        assert len(sink.pending) == 2
+        assert len(sink.block_ids) == 2
+    finally:
+        staged.set()
+    writer.join()
+    sink.finish()
+    assert backend.committed == b"a" * 100
+
+
+def test_block_sink_empty():
+    backend = RecordingBackend()
+    sink = BlockSink(backend)
+    sink.finish()
+    assert backend.committed == b""
+
+
+def test_local_backend(tmp_path):
+    path = join(str(tmp_path), "feed.json")
+    backend = LocalBlockBackend(path)
+    backend.stage(1, b"world")
+    backend.stage(0, b"hello ")
+    assert not os.path.exists(path)
+    backend.commit([0, 1])
+    with open(path, "rb") as f:
+        assert f.read() == b"hello world"
+    assert not os.path.exists(backend.blocks_dir)
+
+
+def test_chunked_gzip(tmp_path):
+    path = join(str(tmp_path), "feeds", "spider.json.gz")
+    storage = make_storage(path, CITY_SCRAPERS_FEED_BLOCK_SIZE=1024)
+    file = storage.open(None)
+    for line in LINES:
+        file.write(line)
+    storage._store_in_thread(file)
+    assert len(storage.sink.block_ids) > 1
+    with gzip.open(path, "rb") as f:
+        assert f.read() == b"".join(LINES)
+
+
+def test_chunked_uncompressed(tmp_path):
+    path = join(str(tmp_path), "spider.json")
+    storage = make_storage(
+        path, CITY_SCRAPERS_FEED_COMPRESSION="none", CITY_SCRAPERS_FEED_BLOCK_SIZE=1024
+    )
+    file = storage.open(None)
+    for line in LINES:
+        file.write(line)
+    storage._store_in_thread(file)
+    with open(path, "rb") as f:
+        assert f.read() == b"".join(LINES)
+
+
+def test_chunked_zstd(tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    path = join(str(tmp_path), "spider.json.zst")
+    storage = make_storage(path, CITY_SCRAPERS_FEED_COMPRESSION="zstd")
+    file = storage.open(None)
+    for line in LINES:
+        file.write(line)
+    storage._store_in_thread(file)
+    with open(path, "rb") as f:
+        reader = zstandard.ZstdDecompressor().stream_reader(f)
+        assert reader.read() == b"".join(LINES)
+
+
+def test_unknown_compression():
+    with pytest.raises(NotConfigured):
+        make_storage("feed.json", CITY_SCRAPERS_FEED_COMPRESSION="bz2")
+
+
+def make_digest_storage(tmp_path, run):
+    storage = LocalDigestFeedStorage.from_settings(
+        Settings({"CITY_SCRAPERS_FEED_MANIFEST_DIR": join(str(tmp_path), "manifests")}),
+        "digest-file://{}".format(join(str(tmp_path), run, "spider.json")),
+    )
+    spider = MagicMock()
+    spider.name = "spider"
+    spider.crawler.settings = Settings()
+    return storage, storage.open(spider)
+
+
+def test_feed_digest():
+    first = TemporaryFile()
+    first.write(b'{"_id": 1, "updated_at": "2020-01-01"}\n{"_id": 2}\n')
+    second = TemporaryFile()
+    second.write(b'{"_id": 2}\n\n{"updated_at": "2020-01-02", "_id": 1}\n')
+    third = TemporaryFile()
+    third.write(b'{"_id": 2}\n')
+    assert feed_digest(first) == feed_digest(second)
+    assert feed_digest(first) != feed_digest(third)
+
+
+def test_digest_storage_skips_unchanged(tmp_path):
+    storage, file = make_digest_storage(tmp_path, "0800")
+    file.write(b'{"_id": 1, "updated_at": "2020-01-01T08:00:00"}\n')
+    storage._store_in_thread(file)
+    assert os.path.exists(join(str(tmp_path), "0800", "spider.json"))
+
+    storage, file = make_digest_storage(tmp_path, "0900")
+    file.write(b'{"_id": 1, "updated_at": "2020-01-01T09:00:00"}\n')
+    storage._store_in_thread(file)
+    assert not os.path.exists(join(str(tmp_path), "0900", "spider.json"))
+    manifest = storage.load_manifest("spider")
+    assert manifest["path"] == join(str(tmp_path), "0800", "spider.json")
+
+    storage, file = make_digest_storage(tmp_path, "1000")
+    file.write(b'{"_id": 1, "status": "cancelled"}\n')
+    storage._store_in_thread(file)
+    assert os.path.exists(join(str(tmp_path), "1000", "spider.json"))
+    assert storage.load_manifest("spider")["path"] == join(
+        str(tmp_path), "1000", "spider.json"
+    )
+
+
+def test_digest_storage_stores_stale_feed(tmp_path):
+    storage, file = make_digest_storage(tmp_path, "0800")
+    file.write(b'{"_id": 1}\n')
+    storage._store_in_thread(file)
+    manifest = storage.load_manifest("spider")
+    manifest["updated"] = "2020-01-01T08:00:00"
+    storage.save_manifest("spider", manifest)
+
+    storage, file = make_digest_storage(tmp_path, "0900")
+    file.write(b'{"_id": 1}\n')
+    storage._store_in_thread(file)
+    assert os.path.exists(join(str(tmp_path), "0900", "spider.json"))
+    assert storage.load_manifest("spider")["path"] == join(
+        str(tmp_path), "0900", "spider.json"
+    )
+
+
+def test_digest_storage_not_configured():
+    with pytest.raises(NotConfigured):
+        LocalDigestFeedStorage.from_settings(Settings(), "digest-file:///feed.json")
+
+
+def test_combinefeeds_unchanged_paths(tmp_path):
+    storage, file = make_digest_storage(tmp_path, "0800")
+    file.write(b'{"_id": 1}\n')
+    storage._store_in_thread(file)
+
+    command = CombineFeedsCommand()
+    command.settings = Settings(
+        {
+            "FEED_URI": "digest-file://{}".format(
+                join(str(tmp_path), "%(hour_min)s", "%(name)s.json")
+            ),
+            "FEED_STORAGES": {
+                "digest-file": "city_scrapers.feedstorage.LocalDigestFeedStorage"
+            },
+            "CITY_SCRAPERS_FEED_MANIFEST_DIR": join(str(tmp_path), "manifests"),
+        }
+    )
+    command.crawler_process = MagicMock()
+    command.crawler_process.spider_loader.list.return_value = ["other", "spider"]
+    assert command.get_spider_paths(["0900/other.json"]) == [
+        "0900/other.json",
+        join(str(tmp_path), "0800", "spider.json"),
+    ]
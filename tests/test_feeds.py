@@ -0,0 +1,216 @@
+import gzip
+import json
+import os
+from datetime import date
+from os.path import join
+
+from city_scrapers.feeds import (
+    FeedCompactor,
+    PartitionedFeedBuilder,
+    get_meeting_id,
+    iter_feed,
+    latest_feed_paths,
+)
+
+
+def make_item(spider_name, agency, start):
+    return {
+        "_id": "ocd-event/{}-{}".format(spider_name, start),
+        "name": "Board",
+        "start_time": "{}-06:00".format(start),
+        "extras": {
+            "cityscrapers/id": "{}/{}".format(spider_name, start),
+            "cityscrapers/agency": agency,
+        },
+    }
+
+
+def write_feed(path, items):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        for item in items:
+            f.write(json.dumps(item) + "\n")
+
+
+def read_lines(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_get_meeting_id():
+    assert get_meeting_id(make_item("a", "A", "2020-01-02T10:00:00")) == (
+        "a/2020-01-02T10:00:00"
+    )
+    assert get_meeting_id({"id": "a/1"}) == "a/1"
+
+
+def test_iter_feed_gzip(tmp_path):
+    path = join(str(tmp_path), "feed.json.gz")
+    with gzip.open(path, "wt") as f:
+        f.write('{"id": 1}\n\n{"id": 2}\n')
+    assert list(iter_feed(path)) == [{"id": 1}, {"id": 2}]
+
+
+def test_latest_feed_paths(tmp_path):
+    root = str(tmp_path)
+    for path in [
+        "2020/01/01/0800/chi_ssa_1.json",
+        "2020/01/02/0800/chi_ssa_1.json",
+        "2020/01/02/0800/chi_ssa_16.json",
+        "2020/01/02/0800/other.json",
+        "2020/01/01/0800/chi_ssa_16.json",
+    ]:
+        write_feed(join(root, path), [])
+    assert latest_feed_paths(root, ["chi_ssa_1", "chi_ssa_16", "missing"]) == {
+        "chi_ssa_1": join(root, "2020/01/02/0800/chi_ssa_1.json"),
+        "chi_ssa_16": join(root, "2020/01/02/0800/chi_ssa_16.json"),
+    }
+
+
+def test_build(tmp_path):
+    feed_dir = join(str(tmp_path), "feeds")
+    output_dir = join(str(tmp_path), "output")
+    feed_paths = {"a": join(feed_dir, "a.json"), "b": join(feed_dir, "b.json")}
+    write_feed(
+        feed_paths["a"],
+        [
+            make_item("a", "Agency A", "2020-02-01T10:00:00"),
+            make_item("a", "Agency A", "2020-01-03T10:00:00"),
+            make_item("a", "Agency A", "2020-01-01T10:00:00"),
+        ],
+    )
+    write_feed(
+        feed_paths["b"],
+        [
+            make_item("b", "Agency B", "2020-01-02T10:00:00"),
+            make_item("b", "Agency A", "2020-01-02T09:00:00"),
+        ],
+    )
+
+    builder = PartitionedFeedBuilder(output_dir)
+    assert builder.build(feed_paths) == [
+        "2020-01/agency-a",
+        "2020-01/agency-b",
+        "2020-02/agency-a",
+    ]
+    index = builder.load_index()
+    assert index["partitions"]["2020-01/agency-a"]["count"] == 3
+    assert [
+        item["start_time"][:19]
+        for item in read_lines(
+            join(output_dir, index["partitions"]["2020-01/agency-a"]["path"])
+        )
+    ] == ["2020-01-01T10:00:00", "2020-01-02T09:00:00", "2020-01-03T10:00:00"]
+
+    month = index["months"]["2020-01"]
+    assert month["count"] == 4
+    month_path = join(output_dir, month["path"])
+    assert [item["start_time"][:19] for item in read_lines(month_path)] == [
+        "2020-01-01T10:00:00",
+        "2020-01-02T09:00:00",
+        "2020-01-02T10:00:00",
+        "2020-01-03T10:00:00",
+    ]
+    with open(month_path, "rb") as f:
+        f.seek(month["offsets"]["2020-01-03"])
+        assert json.loads(f.readline())["start_time"].startswith("2020-01-03")
+
+
+def test_build_changed(tmp_path):
+    feed_dir = join(str(tmp_path), "feeds")
+    output_dir = join(str(tmp_path), "output")
+    feed_paths = {"a": join(feed_dir, "a.json"), "b": join(feed_dir, "b.json")}
+    write_feed(feed_paths["a"], [make_item("a", "Agency A", "2020-01-01T10:00:00")])
+    write_feed(feed_paths["b"], [make_item("b", "Agency B", "2020-02-01T10:00:00")])
+    builder = PartitionedFeedBuilder(output_dir)
+    builder.build(feed_paths)
+
+    assert builder.build(feed_paths) == []
+    write_feed(feed_paths["b"], [make_item("b", "Agency B", "2020-03-01T10:00:00")])
+    assert builder.build(feed_paths) == ["2020-02/agency-b", "2020-03/agency-b"]
+    index = builder.load_index()
+    assert sorted(index["months"]) == ["2020-01", "2020-03"]
+    assert not os.path.exists(join(output_dir, "2020-02.jsonl"))
+
+    assert builder.build({"b": feed_paths["b"]}) == ["2020-01/agency-a"]
+    assert sorted(builder.load_index()["partitions"]) == ["2020-03/agency-b"]
+
+
+def read_gzip_lines(path):
+    with gzip.open(path, "rt") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_compact(tmp_path):
+    root = str(tmp_path)
+    first = make_item("a", "Agency A", "2020-01-05T10:00:00")
+    updated = {**first, "name": "Special Board"}
+    write_feed(join(root, "2020/01/01/0800/a.json"), [first])
+    write_feed(
+        join(root, "2020/01/01/2000/a.json"),
+        [updated, make_item("a", "Agency A", "2020-01-04T10:00:00")],
+    )
+    write_feed(
+        join(root, "2020/01/02/0800/a.json"),
+        [first, make_item("a", "Agency A", "2020-01-06T10:00:00")],
+    )
+    write_feed(join(root, "2020/01/03/0800/a.json"), [first])
+
+    compactor = FeedCompactor(root)
+    assert compactor.compact(before=date(2020, 1, 3)) == ["2020-01-01", "2020-01-02"]
+    manifest = compactor.load_manifest()
+    assert sorted(manifest["daily"]["2020-01-01"]["sources"]) == [
+        "2020/01/01/0800/a.json",
+        "2020/01/01/2000/a.json",
+    ]
+    day_items = read_gzip_lines(
+        join(root, "compacted", manifest["daily"]["2020-01-01"]["path"])
+    )
+    assert [item["name"] for item in day_items] == ["Board", "Special Board"]
+
+    month = manifest["monthly"]["2020-01"]
+    assert month["days"] == ["2020-01-01", "2020-01-02"]
+    month_items = read_gzip_lines(join(root, "compacted", month["path"]))
+    assert [(item["start_time"][:10], item["name"]) for item in month_items] == [
+        ("2020-01-04", "Board"),
+        ("2020-01-05", "Board"),
+        ("2020-01-06", "Board"),
+    ]
+
+    assert compactor.compact(before=date(2020, 1, 3)) == []
+
+
+def test_compact_delete_sources(tmp_path):
+    root = str(tmp_path)
+    write_feed(
+        join(root, "2020/01/01/0800/a.json"),
+        [make_item("a", "Agency A", "2020-01-05T10:00:00")],
+    )
+    write_feed(
+        join(root, "2020/01/01/0800/b.json"),
+        [make_item("b", "Agency B", "2020-01-05T10:00:00")],
+    )
+    write_feed(
+        join(root, "2020/01/02/0800/a.json"),
+        [make_item("a", "Agency A", "2020-01-05T10:00:00")],
+    )
+    compactor = FeedCompactor(root)
+    assert compactor.compact(before=date(2020, 1, 2), delete_sources=True) == [
+        "2020-01-01"
+    ]
+    assert not os.path.exists(join(root, "2020/01/01/0800/a.json"))
+    # The latest feed for each spider is kept since digest manifests point to it
+    assert os.path.exists(join(root, "2020/01/01/0800/b.json"))
+    assert os.path.exists(join(root, "2020/01/02/0800/a.json"))
+    assert compactor.compact(before=date(2020, 1, 2)) == []
+
+    # Later feeds for a day are added to the items already compacted
+    write_feed(
+        join(root, "2020/01/01/2000/a.json"),
+        [make_item("a", "Agency A", "2020-01-06T10:00:00")],
+    )
+    assert compactor.compact(before=date(2020, 1, 2)) == ["2020-01-01"]
+    manifest = compactor.load_manifest()
+    assert manifest["daily"]["2020-01-01"]["count"] == 3
+    assert len(manifest["daily"]["2020-01-01"]["sources"]) == 3
+    assert compactor.compact(before=date(2020, 1, 2)) == []
@@ -0,0 +1,130 @@
+from datetime import datetime
+from os.path import join
+from unittest.mock import MagicMock
+
+import pytest
+from city_scrapers_core.constants import BOARD, PASSED, TENTATIVE
+from city_scrapers_core.items import Meeting
+from city_scrapers_core.spiders import CityScrapersSpider
+from scrapy import Request
+from scrapy.exceptions import NotConfigured
+from scrapy.http import HtmlResponse
+from scrapy.settings import Settings
+
+from city_scrapers.finalized import FinalizedStore
+from city_scrapers.middleware import FinalizedDetailMiddleware
+
+DETAIL_URL = "https://example.com/meetings/1"
+minutes = {"href": "https://example.com/minutes.pdf", "title": "Meeting Minutes"}
+
+
+class FinalizedSpider(CityScrapersSpider):
+    name = "finalized"
+    agency = "Finalized Agency"
+    skip_finalized = True
+
+
+listing_response = HtmlResponse(url="https://example.com/meetings", body=b"")
+detail_response = HtmlResponse(url=DETAIL_URL, body=b"")
+
+
+def make_meeting(status=PASSED, links=None):
+    meeting = Meeting(
+        title="Board",
+        description="",
+        classification=BOARD,
+        start=datetime(2020, 1, 2, 10),
+        end=None,
+        all_day=False,
+        time_notes="",
+        location={"name": "", "address": ""},
+        links=[minutes] if links is None else links,
+        source=DETAIL_URL,
+    )
+    meeting["status"] = status
+    meeting["id"] = "finalized/202001021000/x/board"
+    return meeting
+
+
+def process(middleware, response, output, spider):
+    return list(middleware.process_spider_output(response, iter(output), spider))
+
+
+def open_middleware(tmp_path, spider):
+    crawler = MagicMock()
+    crawler.settings = Settings({"CITY_SCRAPERS_FINALIZED_DIR": str(tmp_path)})
+    middleware = FinalizedDetailMiddleware.from_crawler(crawler)
+    middleware.spider_opened(spider)
+    return middleware
+
+
+def test_not_configured():
+    crawler = MagicMock()
+    crawler.settings = Settings({"CITY_SCRAPERS_FINALIZED_DIR": None})
+    with pytest.raises(NotConfigured):
+        FinalizedDetailMiddleware.from_crawler(crawler)
+
+
+def test_skips_finalized(tmp_path):
+    spider = FinalizedSpider()
+    middleware = open_middleware(tmp_path, spider)
+    request = Request(DETAIL_URL)
+    assert process(middleware, listing_response, [request], spider) == [request]
+    meeting = make_meeting()
+    assert process(middleware, detail_response, [meeting], spider) == [meeting]
+    middleware.spider_closed(spider)
+
+    middleware = open_middleware(tmp_path, spider)
+    assert process(middleware, listing_response, [request], spider) == [meeting]
+    middleware.crawler.stats.inc_value.assert_called_once_with(
+        "finalized/skipped", spider=spider
+    )
+
+
+@pytest.mark.parametrize(
+    "output",
+    [
+        [make_meeting(status=TENTATIVE)],
+        [make_meeting(links=[])],
+        [make_meeting(), make_meeting(links=[])],
+        [make_meeting(), Request("https://example.com/meetings/2")],
+        [],
+    ],
+)
+def test_not_finalized(tmp_path, output):
+    spider = FinalizedSpider()
+    middleware = open_middleware(tmp_path, spider)
+    assert process(middleware, detail_response, output, spider) == output
+    assert len(middleware.store) == 0
+
+
+def test_parse_finalized(tmp_path):
+    spider = FinalizedSpider()
+    spider.parse_finalized = MagicMock(side_effect=lambda meeting: meeting)
+    store = FinalizedStore(join(str(tmp_path), "finalized.json"))
+    store.add(DETAIL_URL, [make_meeting()])
+    store.save()
+    middleware = open_middleware(tmp_path, spider)
+    process(middleware, listing_response, [Request(DETAIL_URL)], spider)
+    spider.parse_finalized.assert_called_once_with(make_meeting())
+
+
+def test_ignores_other_spiders(tmp_path):
+    spider = FinalizedSpider()
+    spider.skip_finalized = False
+    middleware = open_middleware(tmp_path, spider)
+    meeting = make_meeting()
+    assert process(middleware, detail_response, [meeting], spider) == [meeting]
+    middleware.spider_closed(spider)
+    assert not (tmp_path / "finalized.json").exists()
+
+
+def test_stores_original_url(tmp_path):
+    spider = FinalizedSpider()
+    middleware = open_middleware(tmp_path, spider)
+    request = Request(DETAIL_URL, meta={"redirect_urls": [DETAIL_URL]})
+    response = HtmlResponse(
+        url="https://example.com/meetings/1/", body=b"", request=request
+    )
+    process(middleware, response, [make_meeting()], spider)
+    assert DETAIL_URL in middleware.store
@@ -0,0 +1,48 @@
+from scrapy import Request
+from scrapy.http import TextResponse
+from twisted.python.failure import Failure
+
+from city_scrapers.gather import gather_requests
+
+URLS = ["https://example.com/1", "https://example.com/2", "https://example.com/3"]
+
+
+def respond(request):
+    response = TextResponse(url=request.url, body=request.url.encode(), request=request)
+    return list(request.callback(response, **request.cb_kwargs))
+
+
+def fail(request):
+    try:
+        raise ValueError("Download failed")
+    except ValueError:
+        failure = Failure()
+    return request.errback(failure)
+
+
+def combine(responses, suffix=""):
+    yield {"urls": [response.url for response in responses], "suffix": suffix}
+
+
+def test_gather_requests():
+    requests = gather_requests([Request(url) for url in URLS], combine)
+    assert [request.url for request in requests] == URLS
+    assert all(request.dont_filter for request in requests)
+    # Responses arriving out of order are combined in request order
+    assert respond(requests[2]) == []
+    assert respond(requests[0]) == []
+    assert respond(requests[1]) == [{"urls": URLS, "suffix": ""}]
+
+
+def test_gather_requests_cb_kwargs():
+    requests = gather_requests(
+        [Request(url) for url in URLS[:1]], combine, cb_kwargs={"suffix": "a"}
+    )
+    assert respond(requests[0]) == [{"urls": URLS[:1], "suffix": "a"}]
+
+
+def test_gather_requests_failure():
+    requests = gather_requests([Request(url) for url in URLS], combine)
+    assert respond(requests[0]) == []
+    assert isinstance(fail(requests[1]), Failure)
+    assert respond(requests[2]) == []
@@ -0,0 +1,165 @@
+import os
+from collections import deque
+from os.path import join
+from unittest.mock import MagicMock
+
+import pytest
+from scrapy import Request, Spider
+from scrapy.exceptions import NotConfigured
+from scrapy.http import Response
+from scrapy.settings import Settings
+from scrapy.statscollectors import MemoryStatsCollector
+from twisted.internet.defer import Deferred
+from twisted.internet.error import TimeoutError
+
+from city_scrapers.middleware import (
+    HostCircuit,
+    HostCircuitBreakerMiddleware,
+    HostUnavailable,
+    circuits,
+)
+
+DOWN_URL = "https://www2.illinois.gov/sites/agency/Pages/meetings.aspx"
+UP_URL = "https://www.cookcountyil.gov/agency/meetings"
+WEBEX_URL = "https://illinois.webex.com/recordingservice/sites/illinois/recording/1"
+spider = Spider("circuit", start_urls=[DOWN_URL], allowed_domains=["www2.illinois.gov"])
+
+
+@pytest.fixture(autouse=True)
+def clear_circuits():
+    yield
+    circuits.clear()
+
+
+def make_middleware(failures=3, cooldown=60, circuit_dir=None):
+    crawler = MagicMock()
+    crawler.settings = Settings(
+        {
+            "CITY_SCRAPERS_CIRCUIT_FAILURES": failures,
+            "CITY_SCRAPERS_CIRCUIT_COOLDOWN": cooldown,
+            "CITY_SCRAPERS_CIRCUIT_DIR": circuit_dir,
+        }
+    )
+    crawler.stats = MemoryStatsCollector(crawler)
+    crawler.engine.downloader.slots = {}
+    return HostCircuitBreakerMiddleware.from_crawler(crawler)
+
+
+def fail(middleware, url=DOWN_URL, times=1):
+    for _ in range(times):
+        request = Request(url)
+        middleware.process_request(request, spider)
+        middleware.process_exception(request, TimeoutError(), spider)
+
+
+def test_not_configured():
+    with pytest.raises(NotConfigured):
+        make_middleware(failures=0)
+
+
+def test_host_circuit_half_open():
+    circuit = HostCircuit(2, 60)
+    circuit.failure()
+    assert circuit.failure()
+    assert circuit.is_open
+    assert not circuit.allow()
+    circuit.opened_at -= 60
+    assert circuit.allow()
+    assert not circuit.allow()
+    assert not circuit.failure()
+    circuit.opened_at -= 60
+    assert circuit.allow()
+    circuit.success()
+    assert not circuit.is_open
+    assert circuit.allow()
+
+
+def test_opens_after_failures():
+    middleware = make_middleware()
+    fail(middleware, times=2)
+    middleware.process_response(
+        Request(DOWN_URL), Response(DOWN_URL, status=503), spider
+    )
+    middleware.crawler.engine.close_spider.assert_called_once_with(
+        spider, "upstream_unavailable"
+    )
+    with pytest.raises(HostUnavailable):
+        middleware.process_request(Request(DOWN_URL), spider)
+    assert middleware.process_request(Request(UP_URL), spider) is None
+    stats = middleware.crawler.stats
+    assert stats.get_value("circuit_breaker/opened") == 1
+    assert stats.get_value("circuit_breaker/rejected") == 1
+    assert middleware.crawler.engine.close_spider.call_count == 1
+
+
+def test_success_resets_failures():
+    middleware = make_middleware()
+    fail(middleware, times=2)
+    middleware.process_response(Request(DOWN_URL), Response(DOWN_URL), spider)
+    fail(middleware, times=2)
+    assert not circuits["www2.illinois.gov"].is_open
+    middleware.process_exception(Request(DOWN_URL), ValueError(), spider)
+    assert not circuits["www2.illinois.gov"].is_open
+    assert middleware.process_request(Request("data:,hello"), spider) is None
+
+
+def test_shared_across_spiders():
+    first, second = make_middleware(), make_middleware()
+    fail(first, times=3)
+    with pytest.raises(HostUnavailable):
+        second.process_request(Request(DOWN_URL), spider)
+    second.crawler.engine.close_spider.assert_called_once_with(
+        spider, "upstream_unavailable"
+    )
+
+
+def test_fails_queued_requests():
+    middleware = make_middleware()
+    slot = MagicMock()
+    slot.queue = deque([(Request(DOWN_URL), Deferred()), (Request(UP_URL), Deferred())])
+    middleware.crawler.engine.downloader.slots = {"www2.illinois.gov": slot}
+    (_, down_deferred), (up_request, up_deferred) = slot.queue
+    errors = []
+    down_deferred.addErrback(errors.append)
+    fail(middleware, times=3)
+    assert [error.type for error in errors] == [HostUnavailable]
+    assert list(slot.queue) == [(up_request, up_deferred)]
+    assert not up_deferred.called
+
+
+def test_secondary_host_fails_without_closing():
+    middleware = make_middleware()
+    fail(middleware, url=WEBEX_URL, times=3)
+    with pytest.raises(HostUnavailable):
+        middleware.process_request(Request(WEBEX_URL), spider)
+    assert middleware.process_request(Request(DOWN_URL), spider) is None
+    middleware.crawler.engine.close_spider.assert_not_called()
+    assert middleware.crawler.stats.get_value("circuit_breaker/rejected") == 1
+
+
+def test_shared_across_processes(tmp_path):
+    circuit_dir = join(str(tmp_path), "circuits")
+    fail(make_middleware(circuit_dir=circuit_dir), times=3)
+    assert os.listdir(circuit_dir) == ["www2.illinois.gov.json"]
+
+    # A spider in a new process rejects requests without waiting on failures
+    circuits.clear()
+    middleware = make_middleware(circuit_dir=circuit_dir)
+    with pytest.raises(HostUnavailable):
+        middleware.process_request(Request(DOWN_URL), spider)
+    middleware.crawler.engine.close_spider.assert_called_once_with(
+        spider, "upstream_unavailable"
+    )
+
+    # Once the cooldown has passed, a successful probe removes the saved circuit
+    circuits.clear()
+    middleware = make_middleware(cooldown=0, circuit_dir=circuit_dir)
+    assert middleware.process_request(Request(DOWN_URL), spider) is None
+    middleware.process_response(Request(DOWN_URL), Response(DOWN_URL), spider)
+    assert os.listdir(circuit_dir) == []
+    circuits.clear()
+    assert (
+        not make_middleware(circuit_dir=circuit_dir)
+        .get_circuit(Request(DOWN_URL))
+        .is_open
+    )
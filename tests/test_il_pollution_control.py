@@ -1,36 +1,37 @@
-from datetime import datetime
+from datetime import date, datetime
 from os.path import dirname, join
+from unittest.mock import MagicMock
 
 import pytest
 from city_scrapers_core.constants import BOARD, CANCELLED, PASSED, TENTATIVE
 from city_scrapers_core.utils import file_response
 from freezegun import freeze_time
+from scrapy import Request
 
+from city_scrapers.items import MeetingLinks
+from city_scrapers.middleware import MeetingLinkJoinMiddleware
 from city_scrapers.spiders.il_pollution_control import IlPollutionControlSpider
 
 test_response = file_response(
     join(dirname(__file__), "files", "il_pollution_control.json"),
     url="https://pcb.illinois.gov/ClerksOffice/GetCalendarEvents",
 )
-spider = IlPollutionControlSpider()
+test_minutes_response = file_response(
+    join(dirname(__file__), "files", "il_pollution_control_minutes.html"),
+    url="https://pcb.illinois.gov/documents/dsweb/View/Collection-1101",
+)
+test_agenda_response = file_response(
+    join(dirname(__file__), "files", "il_pollution_control_agenda.pdf"),
+    url="https://pcb.illinois.gov/documents/dsweb/Get/Document-53692/",
+)
 
 freezer = freeze_time("2019-10-03")
 freezer.start()
 
+spider = IlPollutionControlSpider()
 parsed_items = [item for item in spider._parse_json(test_response)]
-spider.minutes_map = {
-    datetime(
-        2019, 1, 17
-    ).date(): "https://pcb.illinois.gov/documents/dsweb/Get/Document-99687/1-17-2019 draft2.pdf"  # noqa
-}
-spider.agenda_map = {
-    datetime(
-        2019, 10, 3
-    ).date(): "https://pcb.illinois.gov/documents/dsweb/Get/Document-53692/"
-}
-
-for item in parsed_items:
-    item["links"] = spider._parse_links(item)
+parsed_minutes = [item for item in spider._parse_minutes(test_minutes_response)]
+parsed_agenda = [item for item in spider._parse_agenda(test_agenda_response)]
 
 freezer.stop()
 
@@ -77,12 +78,51 @@ def test_source(item):
     assert item["source"] == "https://pcb.illinois.gov/ClerksOffice/Calendar"
 
 
-def test_links():
-    minutes_url = "https://pcb.illinois.gov/documents/dsweb/Get/Document-99687/1-17-2019 draft2.pdf"  # noqa
-    assert parsed_items[2]["links"][0]["href"] == minutes_url
+def test_parse_minutes():
+    minutes_url = "https://pcb.illinois.gov/documents/dsweb/Get/Document-99687/1-17-2019%20draft2.pdf"  # noqa
+    assert parsed_minutes[0].url == (
+        "https://pcb.illinois.gov/documents/dsweb/View/Collection-1102"
+    )
+    assert parsed_minutes[1:] == [
+        MeetingLinks(
+            start=date(2019, 1, 17), links=[{"href": minutes_url, "title": "Minutes"}]
+        ),
+        MeetingLinks(
+            start=date(2019, 2, 28),
+            links=[
+                {
+                    "href": "https://pcb.illinois.gov/documents/dsweb/Get/Document-99915/2-28-2019.pdf",  # noqa
+                    "title": "Minutes",
+                }
+            ],
+        ),
+    ]
+
+
+def test_parse_agenda():
+    assert parsed_agenda == [
+        MeetingLinks(
+            start=date(2019, 10, 3),
+            links=[
+                {
+                    "href": "https://pcb.illinois.gov/documents/dsweb/Get/Document-53692/",  # noqa
+                    "title": "Agenda",
+                }
+            ],
+        )
+    ]
 
-    agenda_url = "https://pcb.illinois.gov/documents/dsweb/Get/Document-53692/"
-    assert parsed_items[14]["links"][0]["href"] == agenda_url
+
+def test_links():
+    assert parsed_items[2]["links"] == []
+
+    middleware = MeetingLinkJoinMiddleware(MagicMock())
+    output = parsed_minutes[1:] + [parsed_items[2], parsed_items[14]] + parsed_agenda
+    response = test_response.replace(request=Request(test_response.url))
+    assert list(middleware.process_spider_output(response, output, spider)) == []
+    joined_items = list(middleware.flush(None))
+    assert joined_items[0]["links"] == parsed_minutes[1]["links"]
+    assert joined_items[1]["links"] == parsed_agenda[0]["links"]
 
 
 @pytest.mark.parametrize("item", parsed_items)
@@ -0,0 +1,86 @@
+import builtins
+import json
+from os.path import dirname, join
+
+import pytest
+from scrapy.http import TextResponse
+from scrapy.settings import Settings
+
+from city_scrapers.jsonstream import iter_json_items, iter_json_outputs
+from city_scrapers.spiders.chi_police import ChiPoliceSpider
+
+with open(join(dirname(__file__), "files", "chi_police.json"), "rb") as f:
+    police_body = f.read()
+
+
+def make_response(body):
+    return TextResponse(url="https://example.com", body=body, encoding="utf-8")
+
+
+@pytest.fixture
+def no_ijson(monkeypatch):
+    real_import = builtins.__import__
+
+    def mock_import(name, *args, **kwargs):
+        if name == "ijson":
+            raise ImportError
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", mock_import)
+
+
+@pytest.mark.parametrize(
+    "body,prefix,expected",
+    [
+        (b"[]", "item", []),
+        (b' [ 1 , {"a": [1, 2.5]}, "b" ] ', "item", [1, {"a": [1, 2.5]}, "b"]),
+        (b'{"data": {"events": [{"id": 1}]}}', "data.events.item", [{"id": 1}]),
+    ],
+)
+def test_iter_json_items(no_ijson, body, prefix, expected):
+    assert list(iter_json_items(make_response(body), prefix)) == expected
+
+
+def test_iter_json_items_lazy(no_ijson):
+    items = iter_json_items(make_response(b'[{"id": 1}, {"id": 2}, invalid'))
+    assert next(items) == {"id": 1}
+    assert next(items) == {"id": 2}
+    with pytest.raises(ValueError):
+        next(items)
+
+
+@pytest.mark.parametrize("body", [b"<html></html>", b"[1 2]", b"[1,"])
+def test_iter_json_items_invalid(no_ijson, body):
+    with pytest.raises(ValueError):
+        list(iter_json_items(make_response(body)))
+
+
+def test_iter_json_items_fixture(no_ijson):
+    response = make_response(police_body)
+    assert list(iter_json_items(response)) == json.loads(response.text)
+
+
+def test_iter_json_items_ijson():
+    pytest.importorskip("ijson")
+    response = make_response(police_body)
+    assert list(iter_json_items(response)) == json.loads(response.text)
+    with pytest.raises(ValueError):
+        list(iter_json_items(make_response(b"<html></html>")))
+
+
+def test_iter_json_outputs(no_ijson):
+    response = make_response(b"[1, 2, 3]")
+    outputs = iter_json_outputs(response, lambda item: [item] * item)
+    assert list(outputs) == [1, 2, 2, 3, 3, 3]
+
+
+def test_iter_json_outputs_truncated(caplog):
+    spider = ChiPoliceSpider()
+    spider.settings = Settings(values={"CITY_SCRAPERS_ARCHIVE": True})
+    assert len(list(spider.parse(make_response(police_body)))) > 0
+    truncated = make_response(police_body[: len(police_body) // 2])
+    outputs = []
+    with pytest.raises(ValueError):
+        outputs.extend(spider.parse(truncated))
+    assert outputs == []
+    assert "Invalid JSON" in caplog.text
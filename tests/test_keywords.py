@@ -0,0 +1,54 @@
+import re
+from datetime import datetime
+
+from city_scrapers_core.constants import (
+    ADVISORY_COMMITTEE,
+    BOARD,
+    CANCELLED,
+    COMMITTEE,
+    NOT_CLASSIFIED,
+    PASSED,
+    TENTATIVE,
+)
+from freezegun import freeze_time
+
+from city_scrapers.keywords import KeywordMatcher, get_status
+
+MATCHER = KeywordMatcher(
+    [
+        (re.compile(r"a(c|dvisory) (committee|council)"), ADVISORY_COMMITTEE),
+        (("board", "directors"), BOARD),
+        ("committee", COMMITTEE),
+    ],
+    default=NOT_CLASSIFIED,
+)
+
+
+def test_match_order():
+    assert MATCHER.match("Citizens Advisory Committee") == ADVISORY_COMMITTEE
+    assert MATCHER.match("Board Finance Committee") == BOARD
+    assert MATCHER.match("Finance COMMITTEE") == COMMITTEE
+    assert MATCHER.match("Meeting of the Directors") == BOARD
+    assert MATCHER.match("Public Hearing") == NOT_CLASSIFIED
+    assert MATCHER.match("") == NOT_CLASSIFIED
+
+
+def test_match_multiple_texts():
+    assert MATCHER.match("Regular Meeting", "", "Finance committee") == COMMITTEE
+    assert MATCHER.match("Committee", "Advisory Council") == ADVISORY_COMMITTEE
+
+
+def test_match_case_sensitive():
+    matcher = KeywordMatcher([("Committee", COMMITTEE)], ignore_case=False)
+    assert matcher.match("Finance Committee") == COMMITTEE
+    assert matcher.match("committee reports") is None
+
+
+@freeze_time("2020-01-02")
+def test_get_status():
+    upcoming = {"title": "Board", "description": "", "start": datetime(2020, 2, 1)}
+    assert get_status(upcoming) == TENTATIVE
+    assert get_status({**upcoming, "start": datetime(2019, 12, 1)}) == PASSED
+    assert get_status({**upcoming, "title": "Board (Rescheduled)"}) == CANCELLED
+    assert get_status(upcoming, text="This meeting is CANCELLED") == CANCELLED
+    assert get_status({"title": "Board", "start": datetime(2020, 2, 1)}) == TENTATIVE
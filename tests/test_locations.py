@@ -0,0 +1,60 @@
+import pytest
+
+from city_scrapers.locations import (
+    canonical_address,
+    chicago_address,
+    find_venue,
+    get_location,
+    normalize_location,
+    validate_venue,
+)
+
+
+def test_canonical_address():
+    assert canonical_address("  1448 W. Morse Ave. ,\n Chicago, IL  ") == (
+        "1448 W. Morse Ave., Chicago, IL"
+    )
+    assert canonical_address("1 N State St,, Chicago, IL 60602 ,") == (
+        "1 N State St, Chicago, IL 60602"
+    )
+
+
+def test_chicago_address():
+    assert chicago_address("\n1623 W. Howard St. ") == "1623 W. Howard St. Chicago, IL"
+    assert chicago_address("") == "Chicago, IL"
+
+
+def test_find_venue():
+    assert find_venue("LOCATION: 740 N. Sedgwick St, 4th Floor") == "cchr"
+    assert find_venue("Held at the POLSKY CENTER for Innovation") == "polsky_center"
+    assert find_venue("Virtual meeting") == "virtual"
+    assert find_venue("1311 S. Maybrook Dr Maywood, IL") == "cook_county_911"
+    assert find_venue("Polsky Center", ["cchr"]) is None
+    assert find_venue("7400 N Sedgwick St") is None
+
+
+def test_validate_venue():
+    validate_venue("Meetings will be held on Zoom", "cchr", "zoom")
+    with pytest.raises(ValueError):
+        validate_venue("Meetings will be held at City Hall", "cchr", "zoom")
+
+
+def test_normalize_location():
+    assert normalize_location(
+        {"name": "", "address": "\nVirtual meeting Chicago, IL"}
+    ) == {
+        "name": "Virtual",
+        "address": "",
+    }
+    assert normalize_location(
+        {"name": "Harold Washington Library", "address": "400 S. State St. Chicago, IL"}
+    ) == get_location("harold_washington_library")
+    assert normalize_location(
+        {"name": "Rogers Park  Office ", "address": "1448 W. Morse Ave. Chicago, IL"}
+    ) == {"name": "Rogers Park Office", "address": "1448 W. Morse Ave. Chicago, IL"}
+
+
+def test_get_location_copy():
+    location = get_location("virtual")
+    location["name"] = "Changed"
+    assert get_location("virtual")["name"] == "Virtual"
@@ -0,0 +1,155 @@
+from datetime import date, datetime
+from unittest.mock import MagicMock
+
+import pytest
+from city_scrapers_core.constants import BOARD
+from city_scrapers_core.items import Meeting
+from city_scrapers_core.spiders import CityScrapersSpider
+from scrapy import Request
+from scrapy.exceptions import DontCloseSpider
+from scrapy.http import HtmlResponse, Response
+from scrapy.settings import Settings
+from scrapy.utils.conf import build_component_list
+from scrapy.utils.misc import load_object
+
+from city_scrapers.items import MeetingLinks
+from city_scrapers.middleware import MeetingLinkJoinMiddleware
+
+
+class JoinSpider(CityScrapersSpider):
+    name = "join"
+    agency = "Join Agency"
+    join_links = True
+
+
+spider = JoinSpider()
+response = HtmlResponse(
+    url="https://example.com", body=b"", request=Request("https://example.com")
+)
+agenda = {"href": "https://example.com/agenda.pdf", "title": "Agenda"}
+minutes = {"href": "https://example.com/minutes.pdf", "title": "Minutes"}
+
+
+def make_meeting(start):
+    return Meeting(
+        title="Board",
+        description="",
+        classification=BOARD,
+        start=start,
+        end=None,
+        all_day=False,
+        time_notes="",
+        location={"name": "", "address": ""},
+        links=[],
+        source="https://example.com",
+    )
+
+
+def process(middleware, output):
+    return list(middleware.process_spider_output(response, iter(output), spider))
+
+
+def flush(middleware, spider):
+    """Run the callback of the request scheduled when the spider was idle through the
+    middleware
+    """
+    request, _ = middleware.crawler.engine.crawl.call_args[0]
+    assert request.dont_filter
+    flush_response = Response(request.url, request=request)
+    return middleware.process_spider_output(
+        flush_response, request.callback(flush_response), spider
+    )
+
+
+@pytest.fixture
+def middleware():
+    return MeetingLinkJoinMiddleware(MagicMock())
+
+
+def test_links_before_meeting(middleware):
+    assert (
+        process(middleware, [MeetingLinks(start=date(2020, 1, 2), links=[agenda])])
+        == []
+    )
+    meeting = make_meeting(datetime(2020, 1, 2, 10))
+    assert process(middleware, [meeting]) == []
+    joined = process(
+        middleware,
+        [MeetingLinks(start=date(2020, 1, 2), links=[minutes, agenda], final=True)],
+    )
+    assert joined == [{**meeting, "links": [agenda, minutes]}]
+
+
+def test_meeting_after_final_links(middleware):
+    process(middleware, [MeetingLinks(start=date(2020, 1, 2), links=[], final=True)])
+    meeting = make_meeting(datetime(2020, 1, 2, 10))
+    assert process(middleware, [meeting]) == [meeting]
+
+
+def test_passes_other_output(middleware):
+    request = Request("https://example.com/other")
+    assert process(middleware, [request, {"other": 1}]) == [request, {"other": 1}]
+
+
+def test_flushes_on_idle(middleware):
+    meeting = make_meeting(datetime(2020, 1, 2, 10))
+    process(
+        middleware, [meeting, MeetingLinks(start=datetime(2020, 1, 2), links=[agenda])]
+    )
+    with pytest.raises(DontCloseSpider):
+        middleware.spider_idle(spider)
+    flushed = list(flush(middleware, spider))
+    assert isinstance(flushed[0], Meeting)
+    assert flushed == [{**meeting, "links": [agenda]}]
+    middleware.spider_idle(spider)
+    assert middleware.crawler.engine.crawl.call_count == 1
+
+
+def test_ignores_spiders_without_join(middleware):
+    other_spider = CityScrapersSpider(name="other")
+    meeting = make_meeting(datetime(2020, 1, 2, 10))
+    assert list(
+        middleware.process_spider_output(response, iter([meeting]), other_spider)
+    ) == [meeting]
+
+
+def test_archive_middleware_order():
+    settings = Settings()
+    settings.setmodule("city_scrapers.settings.archive")
+    crawler = MagicMock()
+    crawler.settings = settings
+    middlewares = [
+        load_object(path).from_crawler(crawler)
+        for path in build_component_list(settings.getwithbase("SPIDER_MIDDLEWARES"))
+        if path.startswith("city_scrapers.")
+    ]
+
+    def process_chain(response, result):
+        # Spider output passes through middlewares with the highest order first
+        for middleware in reversed(middlewares):
+            result = middleware.process_spider_output(response, result, spider)
+        return list(result)
+
+    output = [
+        make_meeting(datetime(2020, 1, 2, 10)),
+        MeetingLinks(start=date(2020, 1, 2), links=[agenda]),
+    ]
+    assert [output.url for output in process_chain(response, iter(output))] == [
+        "https://web.archive.org/save/https://example.com"
+    ]
+
+    join_middleware = next(
+        middleware
+        for middleware in middlewares
+        if isinstance(middleware, MeetingLinkJoinMiddleware)
+    )
+    with pytest.raises(DontCloseSpider):
+        join_middleware.spider_idle(spider)
+    request, _ = crawler.engine.crawl.call_args[0]
+    flush_response = Response(request.url, request=request)
+    flushed = process_chain(flush_response, request.callback(flush_response))
+    assert [output["links"] for output in flushed if isinstance(output, Meeting)] == [
+        [agenda]
+    ]
+    archived = [output.url for output in flushed if isinstance(output, Request)]
+    assert archived == ["https://web.archive.org/save/{}".format(agenda["href"])]
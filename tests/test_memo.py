@@ -0,0 +1,80 @@
+import gc
+import weakref
+
+import pytest
+from scrapy.http import HtmlResponse
+
+from city_scrapers.memo import response_cached
+
+
+class Parser:
+    def __init__(self):
+        self.calls = 0
+
+    @response_cached
+    def parse_title(self, response, selector="h1::text"):
+        self.calls += 1
+        return response.css(selector).extract_first()
+
+    @response_cached
+    def parse_items(self, response, selector="h2"):
+        return response.css(selector)
+
+
+def make_response(title):
+    return HtmlResponse(
+        url="https://example.com",
+        body="<h1>{}</h1><h2>Subtitle</h2>".format(title).encode(),
+    )
+
+
+def test_cached_per_response():
+    parser = Parser()
+    response = make_response("Title")
+    assert parser.parse_title(response) == "Title"
+    assert parser.parse_title(response) == "Title"
+    assert parser.calls == 1
+    assert parser.parse_title(make_response("Other")) == "Other"
+    assert parser.calls == 2
+
+
+def test_cached_per_args():
+    parser = Parser()
+    response = make_response("Title")
+    assert parser.parse_title(response, "h2::text") == "Subtitle"
+    assert parser.parse_title(response) == "Title"
+    assert parser.parse_title(response, "h2::text") == "Subtitle"
+    assert parser.calls == 2
+
+
+def test_cached_per_kwargs():
+    parser = Parser()
+    response = make_response("Title")
+    assert parser.parse_title(response, selector="h2::text") == "Subtitle"
+    assert parser.parse_title(response, selector="h2::text") == "Subtitle"
+    assert parser.parse_title(response) == "Title"
+    assert parser.calls == 2
+
+
+def test_rejects_page_values():
+    with pytest.raises(TypeError):
+        Parser().parse_items(make_response("Title"))
+
+
+def test_cached_per_instance():
+    response = make_response("Title")
+    parser, other_parser = Parser(), Parser()
+    parser.parse_title(response)
+    other_parser.parse_title(response)
+    assert parser.calls == 1
+    assert other_parser.calls == 1
+
+
+def test_released_with_response():
+    parser = Parser()
+    response = make_response("Title")
+    parser.parse_title(response)
+    response_ref = weakref.ref(response)
+    del response
+    gc.collect()
+    assert response_ref() is None
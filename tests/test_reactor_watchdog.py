@@ -0,0 +1,89 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from scrapy.exceptions import NotConfigured
+from scrapy.settings import Settings
+from scrapy.statscollectors import MemoryStatsCollector
+
+from city_scrapers.extensions import ReactorWatchdogExtension
+
+
+class BlockingSpider:
+    name = "blocking"
+
+    def __init__(self, ext):
+        self.ext = ext
+
+    def parse(self, response):
+        return self._parse_detail(response)
+
+    def _parse_detail(self, response):
+        self.ext.last_tick -= self.ext.threshold * 2
+        if response == "wait":
+            # Stay in the method until the watchdog thread captures the stack
+            for _ in range(100):
+                if self.ext.blocked is not None:
+                    return
+                time.sleep(0.01)
+        else:
+            self.ext.check()
+
+
+@pytest.fixture(autouse=True)
+def clear_running():
+    yield
+    ReactorWatchdogExtension.running.clear()
+
+
+def make_ext(threshold=0.05):
+    crawler = MagicMock()
+    crawler.settings = Settings({"CITY_SCRAPERS_WATCHDOG_THRESHOLD": threshold})
+    crawler.stats = MemoryStatsCollector(crawler)
+    return ReactorWatchdogExtension.from_crawler(crawler)
+
+
+def test_not_configured():
+    with pytest.raises(NotConfigured):
+        make_ext(threshold=0)
+
+
+def test_block_attributed_to_spider_method():
+    ext = make_ext()
+    spider = BlockingSpider(ext)
+    ext.start(spider)
+    spider.parse(None)
+    ext.tick()
+    stats = ext.crawler.stats.get_stats()
+    assert stats["watchdog/blocked_count"] == 1
+    assert stats["watchdog/blocked_count/BlockingSpider._parse_detail"] == 1
+    assert stats["watchdog/max_blocked_seconds"] >= ext.threshold
+    ext.tick()
+    assert ext.crawler.stats.get_value("watchdog/blocked_count") == 1
+
+
+def test_block_detected_from_thread():
+    ext = make_ext()
+    spider = BlockingSpider(ext)
+    ext.start(spider)
+    thread = threading.Thread(target=ext.watch)
+    thread.start()
+    spider.parse("wait")
+    ext.tick()
+    ext.stopped.set()
+    thread.join()
+    stats = ext.crawler.stats.get_stats()
+    assert stats["watchdog/blocked_count/BlockingSpider._parse_detail"] == 1
+
+
+def test_unattributed_block_recorded_once():
+    first, second = make_ext(), make_ext()
+    first.start(BlockingSpider(first))
+    second.start(BlockingSpider(second))
+    for ext in (first, second):
+        ext.record(0.1, None, [])
+    assert first.crawler.stats.get_value("watchdog/blocked_count") == 1
+    assert second.crawler.stats.get_value("watchdog/blocked_count") is None
+    second.record(0.1, "BlockingSpider.parse", [])
+    assert second.crawler.stats.get_value("watchdog/blocked_count") == 1
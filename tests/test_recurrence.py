@@ -0,0 +1,66 @@
+from datetime import date, datetime, time
+
+import pytest
+from dateutil.rrule import FR, MO, MONTHLY, TH, TU, WE, WEEKLY
+
+from city_scrapers.recurrence import Recurrence, parse_recurrence
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        (
+            "3rd Thursday of the month at 6 p.m.",
+            Recurrence(MONTHLY, [TH(+3)], time(18)),
+        ),
+        (
+            "When: 2nd Tuesday of the month 5:30 p.m. Where: 5101 W. Harrison St.",
+            Recurrence(MONTHLY, [TU(+2)], time(17, 30)),
+        ),
+        (
+            "First and Third Tuesdays, 6:30pm",
+            Recurrence(MONTHLY, [TU(+1), TU(+3)], time(18, 30)),
+        ),
+        ("last Friday", Recurrence(MONTHLY, [FR(-1)])),
+        (
+            "2nd Monday of January, April, July, and October 6 p.m.",
+            Recurrence(MONTHLY, [MO(+2)], time(18), months=[1, 4, 7, 10]),
+        ),
+        ("every Monday at 10am", Recurrence(WEEKLY, [MO], time(10))),
+        ("Meets on Wednesdays", Recurrence(WEEKLY, [WE])),
+        ("Meetings are scheduled as needed", None),
+    ],
+)
+def test_parse_recurrence(text, expected):
+    assert parse_recurrence(text) == expected
+
+
+def test_between():
+    recurrence = parse_recurrence("3rd Thursday of the month at 6 p.m.")
+    assert list(recurrence.between(date(2020, 1, 1), date(2020, 3, 31))) == [
+        datetime(2020, 1, 16, 18),
+        datetime(2020, 2, 20, 18),
+        datetime(2020, 3, 19, 18),
+    ]
+
+
+def test_between_skips_missing_weeks():
+    recurrence = parse_recurrence("5th Friday at 9am")
+    assert list(recurrence.between(date(2020, 1, 1), date(2020, 6, 30))) == [
+        datetime(2020, 1, 31, 9),
+        datetime(2020, 5, 29, 9),
+    ]
+
+
+def test_between_inclusive():
+    recurrence = parse_recurrence("last Friday at 9am")
+    assert list(
+        recurrence.between(datetime(2020, 1, 31, 9), datetime(2020, 2, 28, 9))
+    ) == [datetime(2020, 1, 31, 9), datetime(2020, 2, 28, 9)]
+
+
+def test_between_lazy():
+    recurrence = parse_recurrence("every Monday")
+    occurrences = recurrence.between(date(2020, 1, 1), date(9999, 1, 1))
+    assert next(occurrences) == datetime(2020, 1, 6)
+    assert next(occurrences) == datetime(2020, 1, 13)
@@ -0,0 +1,97 @@
+from unittest.mock import MagicMock
+
+import pytest
+from city_scrapers_core.spiders import CityScrapersSpider
+from scrapy import Request
+from scrapy.exceptions import DontCloseSpider
+from scrapy.http import HtmlResponse
+
+from city_scrapers.middleware import RequestPhaseMiddleware
+
+
+class PhasedSpider(CityScrapersSpider):
+    name = "phased"
+    phases = {"calendar": ["agendas", "minutes"]}
+
+
+spider = PhasedSpider()
+
+
+def response_for(request):
+    return HtmlResponse(url=request.url, request=request, body=b"")
+
+
+def start(middleware, requests):
+    return list(middleware.process_start_requests(iter(requests), spider))
+
+
+def parse(middleware, request, output=()):
+    return list(
+        middleware.process_spider_output(response_for(request), iter(output), spider)
+    )
+
+
+@pytest.fixture
+def middleware():
+    return RequestPhaseMiddleware(MagicMock())
+
+
+def test_holds_dependent_phase(middleware):
+    agenda_req = Request("https://example.com/agendas", meta={"phase": "agendas"})
+    minutes_req = Request("https://example.com/minutes", meta={"phase": "minutes"})
+    calendar_req = Request("https://example.com/calendar", meta={"phase": "calendar"})
+    assert start(middleware, [agenda_req, minutes_req, calendar_req]) == [
+        agenda_req,
+        minutes_req,
+    ]
+    parse(middleware, agenda_req)
+    middleware.crawler.engine.crawl.assert_not_called()
+    parse(middleware, minutes_req)
+    middleware.crawler.engine.crawl.assert_called_once_with(calendar_req, spider)
+
+
+def test_waits_for_child_requests(middleware):
+    agenda_req = Request("https://example.com/agendas", meta={"phase": "agendas"})
+    calendar_req = Request("https://example.com/calendar", meta={"phase": "calendar"})
+    start(middleware, [agenda_req, calendar_req])
+    detail_req = Request("https://example.com/agendas/1")
+    assert parse(middleware, agenda_req, [detail_req, {"item": 1}]) == [
+        detail_req,
+        {"item": 1},
+    ]
+    assert detail_req.meta["phase"] == "agendas"
+    middleware.crawler.engine.crawl.assert_not_called()
+    parse(middleware, detail_req)
+    middleware.crawler.engine.crawl.assert_called_once_with(calendar_req, spider)
+
+
+def test_holds_requests_yielded_from_other_phases(middleware):
+    agenda_req = Request("https://example.com/agendas", meta={"phase": "agendas"})
+    start(middleware, [agenda_req])
+    calendar_req = Request("https://example.com/calendar", meta={"phase": "calendar"})
+    assert parse(middleware, agenda_req, [calendar_req]) == []
+    middleware.crawler.engine.crawl.assert_called_once_with(calendar_req, spider)
+
+
+def test_releases_on_error(middleware):
+    agenda_req = Request("https://example.com/agendas", meta={"phase": "agendas"})
+    calendar_req = Request("https://example.com/calendar", meta={"phase": "calendar"})
+    start(middleware, [agenda_req, calendar_req])
+    middleware.process_spider_exception(response_for(agenda_req), ValueError(), spider)
+    middleware.crawler.engine.crawl.assert_called_once_with(calendar_req, spider)
+
+
+def test_releases_on_idle(middleware):
+    agenda_req = Request("https://example.com/agendas", meta={"phase": "agendas"})
+    calendar_req = Request("https://example.com/calendar", meta={"phase": "calendar"})
+    start(middleware, [agenda_req, calendar_req])
+    with pytest.raises(DontCloseSpider):
+        middleware.spider_idle(spider)
+    middleware.crawler.engine.crawl.assert_called_once_with(calendar_req, spider)
+    middleware.spider_idle(spider)
+
+
+def test_ignores_spiders_without_phases(middleware):
+    other_spider = CityScrapersSpider(name="other")
+    req = Request("https://example.com", meta={"phase": "calendar"})
+    assert list(middleware.process_start_requests(iter([req]), other_spider)) == [req]
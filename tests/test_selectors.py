@@ -0,0 +1,325 @@
+from os.path import dirname, join
+from unittest.mock import MagicMock
+
+import pytest
+from city_scrapers_core.utils import file_response
+from freezegun import freeze_time
+from parsel import Selector
+from scrapy import Request
+from scrapy.http import HtmlResponse, TextResponse
+from scrapy.settings import Settings
+from scrapy.statscollectors import MemoryStatsCollector
+
+from city_scrapers.selectors import (
+    LexborSelector,
+    ParserBackendMiddleware,
+    extract_region,
+    lexbor_available,
+)
+from city_scrapers.spiders.chi_housing_authority import ChiHousingAuthoritySpider
+from city_scrapers.spiders.chi_library import ChiLibrarySpider
+from city_scrapers.spiders.chi_lsc_advisory import ChiLscAdvisorySpider
+from city_scrapers.spiders.chi_school_community_action_council import (
+    ChiSchoolCommunityActionCouncilSpider,
+)
+from city_scrapers.spiders.chi_schools import ChiSchoolsSpider
+from city_scrapers.spiders.chi_ssa_61 import ChiSsa61Spider
+from city_scrapers.spiders.il_sex_offender_management import (
+    IlSexOffenderManagementSpider,
+)
+
+requires_lexbor = pytest.mark.skipif(
+    not lexbor_available(), reason="selectolax is not installed"
+)
+
+HTML = """
+<html><body>
+<div id="main" class="content">
+  <p>First &amp; <b>bold</b> text<!-- comment --></p>
+  <p>Second <a href="/doc.pdf" hidden>Agenda</a></p>
+  <ul><li>One</li><li>Two</li></ul>
+</div>
+<script>var x = 1;</script></body></html>"""
+
+
+def make_response(name, url, backend):
+    response = file_response(join(dirname(__file__), "files", name), url=url)
+    if backend == "lexbor":
+        response._cached_selector = LexborSelector(text=response.text)
+    return response
+
+
+@requires_lexbor
+@pytest.mark.parametrize(
+    "query",
+    [
+        "p::text",
+        "p *::text",
+        "#main *::text",
+        "*::text",
+        "::text",
+        "p > *::text",
+        "a::attr(href)",
+        "::attr(hidden)",
+        ".content li::text",
+    ],
+)
+def test_css_parity(query):
+    assert LexborSelector(text=HTML).css(query).getall() == (
+        Selector(text=HTML).css(query).getall()
+    )
+
+
+@requires_lexbor
+def test_selector_list_parity():
+    lexbor_items = LexborSelector(text=HTML).css("#main").css("p")
+    parsel_items = Selector(text=HTML).css("#main").css("p")
+    assert lexbor_items[1:].css("::text").getall() == (
+        parsel_items[1:].css("::text").getall()
+    )
+    assert lexbor_items[0].css("b::text").get() == parsel_items[0].css("b::text").get()
+    assert lexbor_items.css("a").attrib == parsel_items.css("a").attrib
+    assert lexbor_items.css("::text").re(r"(\w+) &") == (
+        parsel_items.css("::text").re(r"(\w+) &")
+    )
+    assert lexbor_items.css("i::text").get() is None
+    assert lexbor_items.css("i::text").get("") == ""
+
+
+@requires_lexbor
+@pytest.mark.parametrize("query", ["text()", ".//a/@href", "./b/text()", "string()"])
+def test_element_xpath_parity(query):
+    lexbor_items = LexborSelector(text=HTML).css("#main p")
+    parsel_items = Selector(text=HTML).css("#main p")
+    assert lexbor_items.xpath(query).getall() == parsel_items.xpath(query).getall()
+    assert lexbor_items[0].xpath(query).getall() == (
+        parsel_items[0].xpath(query).getall()
+    )
+
+
+def parse_housing_authority(backend):
+    spider = ChiHousingAuthoritySpider()
+    spider.settings = Settings(values={"CITY_SCRAPERS_ARCHIVE": False})
+    upcoming = spider._parse_upcoming(
+        make_response(
+            "chi_housing_authority.html",
+            "http://www.thecha.org/about/board-meetings-agendas-and-resolutions/board-information-and-meetings",  # noqa
+            backend,
+        )
+    )
+    upcoming = spider._parse_notice(
+        make_response(
+            "chi_housing_authority_notice.html",
+            "http://www.thecha.org/about/board-meetings-agendas-and-resolutions/board-meeting-notices",  # noqa
+            backend,
+        ),
+        upcoming,
+    )
+    minutes_response = make_response(
+        "chi_housing_authority_minutes.html",
+        "http://www.thecha.org/doing-business/contracting-opportunities/view-all/Board%20Meeting",  # noqa
+        backend,
+    )
+    return list(spider._parse_combined_meetings(minutes_response, upcoming))
+
+
+def parse_spider(spider_cls, name, url):
+    def parse(backend):
+        return list(spider_cls().parse(make_response(name, url, backend)))
+
+    return parse
+
+
+@requires_lexbor
+@pytest.mark.parametrize(
+    "date,parse",
+    [
+        ("2018-12-14", parse_housing_authority),
+        (
+            "2019-10-04",
+            parse_spider(
+                ChiSsa61Spider,
+                "chi_ssa_61.html",
+                "http://www.downtownhydeparkchicago.com/about/",
+            ),
+        ),
+        (
+            "2020-08-06",
+            parse_spider(
+                ChiLscAdvisorySpider,
+                "chi_lsc_advisory.html",
+                "https://cps.edu/lscrelations/Pages/LSCAB.aspx",
+            ),
+        ),
+        (
+            "2020-08-06",
+            parse_spider(
+                ChiSchoolCommunityActionCouncilSpider,
+                "chi_school_community_action_council.html",
+                "https://www.cps.edu/services-and-supports/parent-engagement/community-action-councils-cacs/",  # noqa
+            ),
+        ),
+    ],
+)
+def test_spider_parity(date, parse):
+    with freeze_time(date):
+        parsel_items = parse("parsel")
+        lexbor_items = parse("lexbor")
+    assert len(parsel_items) > 0
+    assert lexbor_items == parsel_items
+
+
+def test_middleware_not_opted_in():
+    response = HtmlResponse("https://example.com", body=HTML.encode())
+    spider = MagicMock(spec=[])
+    ParserBackendMiddleware().process_response(None, response, spider)
+    assert isinstance(response.selector, Selector)
+
+
+@requires_lexbor
+def test_middleware():
+    middleware = ParserBackendMiddleware()
+    spider = MagicMock(html_parser="lexbor")
+    response = HtmlResponse("https://example.com", body=HTML.encode())
+    middleware.process_response(None, response, spider)
+    assert isinstance(response.selector, LexborSelector)
+    assert response.css("li::text").getall() == ["One", "Two"]
+
+    text_response = TextResponse("https://example.com", body=b"{}")
+    middleware.process_response(None, text_response, spider)
+    assert text_response._cached_selector is None
+
+
+def test_middleware_unavailable(caplog):
+    middleware = ParserBackendMiddleware()
+    middleware.backends = {"lexbor": (LexborSelector, lambda: False)}
+    spider = MagicMock(html_parser="lexbor")
+    for _ in range(2):
+        response = HtmlResponse("https://example.com", body=HTML.encode())
+        middleware.process_response(None, response, spider)
+        assert isinstance(response.selector, Selector)
+    assert len(caplog.records) == 1
+
+
+def test_extract_region():
+    text = (
+        '<html><head><script>var x = "<div>";</script></head><body>'
+        '<div class="nav"><div class="content-box">Nav</div></div>'
+        '<div class="box content"><div><p>One</p></div><input id="map" value="A">'
+        '<img src="a.png"/></div><div class="content">Two</div>'
+        '<section id="other"><div class="content">Nested</div></section>'
+        "</body></html>"
+    )
+    region = extract_region(text, ".content, #map, section#other")
+    assert region == (
+        '<html><body><div class="box content"><div><p>One</p></div>'
+        '<input id="map" value="A"><img src="a.png"/></div>'
+        '<div class="content">Two</div>'
+        '<section id="other"><div class="content">Nested</div></section>'
+        "</body></html>"
+    )
+    assert extract_region(text, "#missing") is None
+    assert extract_region("<div class='content'><div></div>", ".content") is None
+    with pytest.raises(ValueError):
+        extract_region(text, "div > p")
+
+
+def region_response(name, url, region):
+    response = file_response(join(dirname(__file__), "files", name), url=url)
+    if region:
+        response._cached_selector = Selector(text=extract_region(response.text, region))
+    return response
+
+
+def parse_library(region):
+    session = MagicMock()
+    session.get.return_value.status_code = 200
+    spider = ChiLibrarySpider(session=session)
+    url = "https://www.chipublib.org/board-of-directors/board-meeting-schedule/"
+    return list(
+        spider.parse(region_response("chi_library.html", url, region and "#content"))
+    )
+
+
+def parse_schools(region):
+    spider = ChiSchoolsSpider()
+    spider.meeting_dates = []
+    region = region and spider.html_region["_parse_detail"]
+    detail_response = region_response(
+        "chi_schools.html", "https://www.cpsboe.org/meetings/details/279", region
+    )
+    calendar_response = region_response(
+        "chi_schools_cal.html",
+        "https://www.cpsboe.org/meetings/planning-calendar",
+        region,
+    )
+    return list(spider._parse_detail(detail_response)) + list(
+        spider._parse_calendar(calendar_response)
+    )
+
+
+def parse_sex_offender_management(region):
+    spider = IlSexOffenderManagementSpider()
+    response = region_response(
+        "il_sex_offender_management.html",
+        "https://www2.illinois.gov/idoc/Pages/SexOffenderManagementBoard.aspx",
+        region and spider.html_region["parse"],
+    )
+    return [
+        (request.url, request.callback.__name__) for request in spider.parse(response)
+    ]
+
+
+def parse_ssa_61(region):
+    return list(
+        ChiSsa61Spider().parse(
+            region_response(
+                "chi_ssa_61.html",
+                "http://www.downtownhydeparkchicago.com/about/",
+                region and ChiSsa61Spider.html_region,
+            )
+        )
+    )
+
+
+@pytest.mark.parametrize(
+    "date,parse",
+    [
+        ("2018-12-20", parse_library),
+        ("2019-10-23", parse_schools),
+        ("2020-12-12", parse_sex_offender_management),
+        ("2019-10-04", parse_ssa_61),
+    ],
+)
+def test_region_parity(date, parse):
+    with freeze_time(date):
+        page_items = parse(False)
+        region_items = parse(True)
+    assert len(page_items) > 0
+    assert region_items == page_items
+
+
+def test_middleware_region():
+    stats = MemoryStatsCollector(MagicMock())
+    middleware = ParserBackendMiddleware(stats=stats)
+    spider = MagicMock(spec=["parse", "_parse_detail"])
+    spider.html_region = {"_parse_detail": "#main"}
+    spider.parse.__name__ = "parse"
+    spider._parse_detail.__name__ = "_parse_detail"
+    for callback, script_count in [
+        (None, 1),
+        (spider.parse, 1),
+        (spider._parse_detail, 0),
+    ]:
+        response = HtmlResponse("https://example.com", body=HTML.encode())
+        request = Request("https://example.com", callback=callback)
+        middleware.process_response(request, response, spider)
+        assert len(response.css("script")) == script_count
+    assert response.text == HTML
+
+    spider.html_region = "#missing"
+    response = HtmlResponse("https://example.com", body=HTML.encode())
+    middleware.process_response(None, response, spider)
+    assert len(response.css("script")) == 1
+    assert stats.get_value("html_region/parsed") == 1
+    assert stats.get_value("html_region/missed") == 1
@@ -0,0 +1,91 @@
+import os
+from os.path import join
+
+import pytest
+from city_scrapers_core.spiders import CityScrapersSpider
+from scrapy.exceptions import UsageError
+from scrapy.settings import Settings
+
+from city_scrapers.changes import ChangeFeed
+from city_scrapers.commands.syncstate import Command as SyncStateCommand
+from city_scrapers.state import (
+    LocalStateBackend,
+    download_state,
+    get_state_backend,
+    upload_state,
+)
+from city_scrapers.warehouse import MeetingWarehouse
+
+
+class StateSpider(CityScrapersSpider):
+    name = "state"
+    agency = "State Agency"
+
+
+def make_settings(tmp_path, name="crawl"):
+    return Settings(
+        {
+            "CITY_SCRAPERS_STATE_BACKEND": "city_scrapers.state.LocalStateBackend",
+            "CITY_SCRAPERS_STATE_DIR": join(str(tmp_path), "state"),
+            "CITY_SCRAPERS_WAREHOUSE_PATH": join(str(tmp_path), name, "warehouse.db"),
+        }
+    )
+
+
+def test_sync_warehouse(tmp_path):
+    settings = make_settings(tmp_path)
+    backend = get_state_backend(settings)
+    assert isinstance(backend, LocalStateBackend)
+    assert download_state(backend, settings) == []
+    assert upload_state(backend, settings) == []
+
+    warehouse = MeetingWarehouse(settings["CITY_SCRAPERS_WAREHOUSE_PATH"])
+    run_id = warehouse.start_run(StateSpider.name)
+    warehouse.finish_run(run_id, "finished")
+    # Uploaded while open, so the run is only in the write-ahead log
+    assert upload_state(backend, settings) == ["warehouse.db"]
+    warehouse.close()
+
+    next_settings = make_settings(tmp_path, name="next")
+    assert download_state(backend, next_settings) == ["warehouse.db"]
+    warehouse = MeetingWarehouse(next_settings["CITY_SCRAPERS_WAREHOUSE_PATH"])
+    assert warehouse.previous_run(StateSpider.name, run_id + 1) == run_id
+    warehouse.close()
+
+
+def test_sync_changes(tmp_path):
+    settings = make_settings(tmp_path)
+    settings.set("CITY_SCRAPERS_CHANGES_DIR", join(str(tmp_path), "crawl", "changes"))
+    backend = get_state_backend(settings)
+    assert upload_state(backend, settings) == []
+    ChangeFeed(join(settings["CITY_SCRAPERS_CHANGES_DIR"], "state.jsonl")).append(
+        [{"seq": 1}]
+    )
+    assert upload_state(backend, settings) == ["changes/state.jsonl"]
+
+    next_settings = make_settings(tmp_path, name="next")
+    next_settings.set(
+        "CITY_SCRAPERS_CHANGES_DIR", join(str(tmp_path), "next", "changes")
+    )
+    assert download_state(backend, next_settings) == ["changes/state.jsonl"]
+    feed = ChangeFeed(join(next_settings["CITY_SCRAPERS_CHANGES_DIR"], "state.jsonl"))
+    assert [change["seq"] for change in feed.read()] == [1]
+
+
+def test_syncstate_command(tmp_path, capsys):
+    command = SyncStateCommand()
+    command.settings = make_settings(tmp_path)
+    with pytest.raises(UsageError):
+        command.run(["sync"], None)
+    os.makedirs(join(str(tmp_path), "crawl"))
+    MeetingWarehouse(command.settings["CITY_SCRAPERS_WAREHOUSE_PATH"]).close()
+    command.run(["upload"], None)
+    assert "Uploaded 1 state files" in capsys.readouterr().out
+    command.settings = make_settings(tmp_path, name="next")
+    command.run(["download"], None)
+    assert "Downloaded 1 state files" in capsys.readouterr().out
+    assert os.path.exists(join(str(tmp_path), "next", "warehouse.db"))
+
+    command.settings = Settings()
+    with pytest.raises(UsageError):
+        command.run(["download"], None)
@@ -0,0 +1,233 @@
+from datetime import datetime
+from os.path import join
+from unittest.mock import MagicMock, patch
+
+import pytest
+from city_scrapers_core.constants import BOARD, CANCELLED, TENTATIVE
+from city_scrapers_core.items import Meeting
+from city_scrapers_core.spiders import CityScrapersSpider
+from freezegun import freeze_time
+from scrapy.exceptions import NotConfigured
+from scrapy.settings import Settings
+
+from city_scrapers.pipelines import WarehouseDiffPipeline, WarehousePipeline
+from city_scrapers.warehouse import CREATED, UNCHANGED, UPDATED, MeetingWarehouse
+
+
+class WarehouseSpider(CityScrapersSpider):
+    name = "warehouse"
+    agency = "Warehouse Agency"
+
+
+class OtherSpider(CityScrapersSpider):
+    name = "other"
+    agency = "Other Agency"
+
+
+spider = WarehouseSpider()
+
+
+def make_meeting(day, status=TENTATIVE, title="Board", spider=spider):
+    meeting = Meeting(
+        title=title,
+        description="",
+        classification=BOARD,
+        start=datetime(2020, 1, day, 10),
+        end=None,
+        all_day=False,
+        time_notes="",
+        location={"name": "", "address": ""},
+        links=[],
+        source="https://example.com",
+    )
+    meeting["status"] = status
+    meeting["id"] = spider._get_id(meeting)
+    return meeting
+
+
+@pytest.fixture
+def warehouse(tmp_path):
+    warehouse = MeetingWarehouse(join(str(tmp_path), "warehouse.db"))
+    yield warehouse
+    warehouse.close()
+
+
+def test_upsert(warehouse):
+    run_1 = warehouse.start_run(spider.name)
+    meeting = make_meeting(2)
+    assert warehouse.upsert(run_1, spider, meeting) == CREATED
+    warehouse.finish_run(run_1, "finished")
+
+    run_2 = warehouse.start_run(spider.name)
+    assert warehouse.upsert(run_2, spider, meeting) == UNCHANGED
+    meeting["status"] = CANCELLED
+    assert warehouse.upsert(run_2, spider, meeting) == UPDATED
+    assert warehouse.get(meeting["id"]) == meeting
+    assert warehouse.get("missing") is None
+
+
+def test_versions(warehouse):
+    run_1 = warehouse.start_run(spider.name)
+    warehouse.upsert(run_1, spider, make_meeting(2))
+    warehouse.finish_run(run_1, "finished")
+    run_2 = warehouse.start_run(spider.name)
+    warehouse.upsert(run_2, spider, make_meeting(2))
+    warehouse.finish_run(run_2, "finished")
+    run_3 = warehouse.start_run(spider.name)
+    cancelled = make_meeting(2, status=CANCELLED)
+    warehouse.upsert(run_3, spider, cancelled)
+
+    assert warehouse.previous_run(spider.name, run_3) == run_2
+    assert warehouse.previous_run(spider.name, run_1) is None
+    assert warehouse.get_version(cancelled["id"], run_2)["status"] == TENTATIVE
+    assert warehouse.get_version(cancelled["id"], run_3)["status"] == CANCELLED
+    assert warehouse.get_version(cancelled["id"], run_1 - 1) is None
+
+
+def test_meetings(warehouse):
+    other = OtherSpider()
+    run_id = warehouse.start_run(spider.name)
+    for day in [3, 1, 2]:
+        warehouse.upsert(run_id, spider, make_meeting(day))
+    warehouse.upsert(run_id, other, make_meeting(2, title="Other", spider=other))
+
+    assert [m["start"].day for m in warehouse.meetings(spider_name="warehouse")] == [
+        1,
+        2,
+        3,
+    ]
+    assert [
+        m["title"]
+        for m in warehouse.meetings(
+            start=datetime(2020, 1, 2), end=datetime(2020, 1, 3)
+        )
+    ] == ["Other", "Board"]
+    assert [m["title"] for m in warehouse.meetings(agency="Other Agency")] == ["Other"]
+
+
+def test_missing(warehouse):
+    run_1 = warehouse.start_run(spider.name)
+    warehouse.upsert(run_1, spider, make_meeting(1))
+    warehouse.upsert(run_1, spider, make_meeting(2))
+    warehouse.finish_run(run_1, "finished")
+    run_2 = warehouse.start_run(spider.name)
+    warehouse.upsert(run_2, spider, make_meeting(2))
+
+    assert [m["start"].day for m in warehouse.missing(spider.name, run_2)] == [1]
+
+
+def test_preserves_added_values(warehouse):
+    meeting = make_meeting(2)
+    meeting._values["_id"] = "ocd-event/1"
+    warehouse.upsert(warehouse.start_run(spider.name), spider, meeting)
+    assert warehouse.get(meeting["id"])._values["_id"] == "ocd-event/1"
+
+
+def test_pipeline_not_configured():
+    crawler = MagicMock()
+    crawler.settings = Settings()
+    with pytest.raises(NotConfigured):
+        WarehousePipeline.from_crawler(crawler)
+
+
+def test_pipeline(tmp_path):
+    path = join(str(tmp_path), "warehouse.db")
+    crawler = MagicMock()
+    crawler.settings = Settings({"CITY_SCRAPERS_WAREHOUSE_PATH": path})
+    pipeline = WarehousePipeline.from_crawler(crawler)
+    pipeline.open_spider(spider)
+    meeting = make_meeting(2)
+    assert pipeline.process_item(meeting, spider) is meeting
+    assert pipeline.process_item({"other": "item"}, spider) == {"other": "item"}
+    pipeline.spider_closed(spider, "finished")
+    crawler.stats.inc_value.assert_called_once_with("warehouse/created", spider=spider)
+
+    warehouse = MeetingWarehouse(path)
+    run = warehouse.conn.execute("SELECT spider, reason FROM runs").fetchone()
+    assert tuple(run) == ("warehouse", "finished")
+    assert warehouse.get(meeting["id"]) == meeting
+    warehouse.close()
+
+
+def make_crawler(path, **settings):
+    crawler = MagicMock()
+    crawler.settings = Settings(
+        {
+            "CITY_SCRAPERS_WAREHOUSE_PATH": path,
+            "ITEM_PIPELINES": {
+                "city_scrapers.pipelines.WarehouseDiffPipeline": 300,
+                "city_scrapers.pipelines.WarehousePipeline": 450,
+                "city_scrapers_core.pipelines.OpenCivicDataPipeline": 500,
+            },
+            **settings,
+        }
+    )
+    crawler.spider = spider
+    return crawler
+
+
+def test_pipeline_assigns_ocd_ids(tmp_path):
+    path = join(str(tmp_path), "warehouse.db")
+    pipeline = WarehousePipeline.from_crawler(make_crawler(path))
+    pipeline.open_spider(spider)
+    meeting = make_meeting(2)
+    pipeline.process_item(meeting, spider)
+    ocd_id = meeting.get("_id")
+    assert ocd_id.startswith("ocd-event/")
+    assert pipeline.warehouse.get(meeting["id"])._values["_id"] == ocd_id
+    pipeline.spider_closed(spider, "finished")
+
+    pipeline.open_spider(spider)
+    meeting = make_meeting(2)
+    pipeline.process_item(meeting, spider)
+    assert meeting.get("_id") == ocd_id
+    pipeline.spider_closed(spider, "finished")
+
+
+@freeze_time("2020-01-03")
+def test_diff_pipeline(tmp_path):
+    path = join(str(tmp_path), "warehouse.db")
+    warehouse_pipeline = WarehousePipeline.from_crawler(make_crawler(path))
+    warehouse_pipeline.open_spider(spider)
+    for day in (2, 4):
+        meeting = make_meeting(day)
+        meeting["end"] = meeting["start"]
+        warehouse_pipeline.process_item(meeting, spider)
+    warehouse_pipeline.spider_closed(spider, "finished")
+    warehouse = MeetingWarehouse(path)
+    ocd_ids = {
+        meeting["id"]: meeting.get("_id")
+        for meeting in warehouse.meetings(spider_name=spider.name)
+    }
+    warehouse.close()
+
+    crawler = make_crawler(path)
+    pipeline = WarehouseDiffPipeline.from_crawler(crawler)
+    assert spider._previous_map == ocd_ids
+    meeting = make_meeting(2)
+    assert pipeline.process_item(meeting, spider).get("_id") == ocd_ids[meeting["id"]]
+    previous = {result["_id"]: result for result in spider._previous_results}
+    upcoming_id = ocd_ids[make_meeting(4)["id"]]
+    assert pipeline.process_item(previous[upcoming_id], spider)["status"] == CANCELLED
+
+
+def test_diff_pipeline_fallback(tmp_path):
+    crawler = make_crawler(
+        join(str(tmp_path), "warehouse.db"),
+        CITY_SCRAPERS_DIFF_FALLBACK="city_scrapers_core.pipelines.AzureDiffPipeline",
+    )
+    previous = {"_id": "ocd-event/1", "extras": {"cityscrapers/id": "warehouse/1"}}
+    with patch(
+        "city_scrapers_core.pipelines.AzureDiffPipeline.__init__", return_value=None
+    ), patch(
+        "city_scrapers_core.pipelines.AzureDiffPipeline.load_previous_results",
+        return_value=[previous],
+    ):
+        WarehouseDiffPipeline.from_crawler(crawler)
+    assert spider._previous_map == {"warehouse/1": "ocd-event/1"}
+
+
+def test_diff_pipeline_not_configured():
+    crawler = make_crawler(None)
+    with pytest.raises(NotConfigured):
+        WarehouseDiffPipeline.from_crawler(crawler)